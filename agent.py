@@ -1,63 +1,120 @@
-from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
-
-from tools.get_account_info import get_account_info
-from tools.get_account_payments import get_account_payments
-from tools.get_account_operations import get_account_operations
-from tools.get_account_transactions import get_account_transactions
-from tools.get_account_effects import get_account_effects
-from tools.get_account_offers import get_account_offers
-from tools.get_account_trades import get_account_trades
-from tools.get_asset_info import get_asset_info
-from tools.search_assets import search_assets
-from tools.get_transaction_info import get_transaction_info
-from tools.get_ledger_info import get_ledger_info
-from tools.get_network_stats import get_network_stats
-from config.agent_config import AGENT_CONFIG
-from config.model_config import MODEL_CONFIG
+import asyncio
+import threading
+
+from config.agent_config import AGENT_CONFIG, get_memory_config
+from config.model_config import build_model
+from router.answer_cache import lookup_answer
+from router.fast_path import FastPathRouter
+from router.prefetch import aprefetching
+from telemetry.spans import span
+from tools.registry import load_tool_hooks, load_tools
 
 from dotenv import load_dotenv
 
 load_dotenv()
 
-db = SqliteDb(db_file="/tmp/onchain_researcher.db")
-
-agent = Agent(
-    model=MODEL_CONFIG["model"],
-    name=AGENT_CONFIG["name"],
-    description="An AI assistant that helps users interact with the Stellar blockchain using natural language.",
-    role=AGENT_CONFIG["role"],
-    db=db,
-    tools=[
-        # Account queries
-        get_account_info,
-        get_account_transactions,
-        get_account_payments,
-        get_account_operations,
-        get_account_effects,
-        get_account_offers,
-        get_account_trades,
-        # Asset queries
-        get_asset_info,
-        search_assets,
-        # Transaction queries
-        get_transaction_info,
-        # Ledger and network
-        get_ledger_info,
-        get_network_stats,
-    ],
-    instructions=AGENT_CONFIG["instructions"],
-    # Memory configuration (choose ONE):
-    # Option 1: Automatic memory (agent decides what to remember)
-    enable_agentic_memory=True,
-    # Option 2: Manual memory (you control with enable_user_memories)
-    # enable_user_memories=True,
-    # Add conversation history to context
-    add_history_to_context=True,
-    markdown=True,
-    # Optional: Limit tool calls to prevent loops
-    tool_call_limit=15,
-)
+_agent = None
+_agent_lock = threading.Lock()
+
+
+def build_agent(model=None, db=None, memory_mode=None):
+    """
+    Build the CLI agent. agno, the model provider's SDK, the tool modules and
+    stellar_sdk are imported here rather than at start-up.
+    """
+    from agno.agent import Agent
+    from conversation.memory import memory_options
+    from conversation.window import with_history_window
+    from storage.chat_db import get_chat_db
+    from tools.parallel import with_parallel_tool_calls
+
+    agent = Agent(
+        # Independent tool calls of one model response run concurrently
+        model=with_parallel_tool_calls(model or build_model()),
+        name=AGENT_CONFIG["name"],
+        description="An AI assistant that helps users interact with the Stellar blockchain using natural language.",
+        role=AGENT_CONFIG["role"],
+        # Sessions and memories: WAL-mode SQLite, optionally sharded (CHAT_DB_SHARDS)
+        db=db or get_chat_db(),
+        # Async tool variants: the CLI runs the agent with arun, so Horizon I/O is awaited
+        # on a single event loop that shares one aiohttp session
+        tools=load_tools(asynchronous=True),
+        # Large tool results are summarized to a token budget before reaching the model;
+        # each call (before compaction) is recorded as a telemetry span
+        tool_hooks=load_tool_hooks(asynchronous=True),
+        instructions=AGENT_CONFIG["instructions"],
+        # User memories (MEMORY_MODE): "background" extracts them after the answer has streamed,
+        # on a worker thread; "agentic" lets the model save them mid-answer; "off"
+        **memory_options(memory_mode),
+        # Add conversation history to context: the last turns verbatim, older ones summarized,
+        # within a token ceiling (HISTORY_* / CONTEXT_MAX_TOKENS)
+        add_history_to_context=True,
+        markdown=True,
+        # Optional: Limit tool calls to prevent loops
+        tool_call_limit=15,
+    )
+    return with_history_window(agent)
+
+
+def get_agent():
+    """Return the process-wide CLI agent, building it on first use"""
+    global _agent
+    if _agent is None:
+        with _agent_lock:
+            if _agent is None:
+                _agent = build_agent()
+    return _agent
+
+
+def print_fast_answer(answer: str) -> None:
+    from rich.console import Console
+    from rich.markdown import Markdown
+
+    Console().print(Markdown(answer))
+
+
+async def chat():
+    """Interactive CLI loop running on one event loop"""
+    router = FastPathRouter()
+    try:
+        while True:
+            user_input = await asyncio.to_thread(input, "You: ")
+            if user_input.strip().lower() in ("/quit", "/q"):
+                print("👋 Até logo!")
+                break
+            if not user_input.strip():
+                continue
+            with span("turn", "cli"):
+                # A self-contained question answered before, with no ledger closed since, is answered again as is
+                cached = lookup_answer(user_input)
+                if cached.answer is not None:
+                    print_fast_answer(cached.answer)
+                    router.remember(user_input, cached.answer)
+                    continue
+                # Plain lookups (balance, transaction, ledger, network stats) skip the LLM
+                answer = await router.aanswer(user_input)
+                if answer is not None:
+                    print_fast_answer(answer)
+                    cached.store(answer)
+                    continue
+                # Warm the caches for addresses / hashes in the question while the model thinks
+                async with aprefetching(user_input):
+                    # Usually already built by the warm-up thread while the user was typing
+                    agent = await asyncio.to_thread(get_agent)
+                    await agent.aprint_response(user_input, stream=True, **router.llm_context())
+                if cached.storable:
+                    # agno's aget_last_run_output expects an async database
+                    cached.store_run(await asyncio.to_thread(agent.get_last_run_output))
+    except (EOFError, KeyboardInterrupt):
+        print("\n👋 Encerrando...")
+    finally:
+        from conversation.memory import flush_memories
+        from horizon.async_client import close_async_server
+
+        # Memories of the last turns are still being extracted in the background
+        await asyncio.to_thread(flush_memories, get_memory_config()["flush_timeout"])
+        await close_async_server()
+
 
 if __name__ == "__main__":
     print("🌟 Stellar Blockchain Assistant iniciado!")
@@ -70,15 +127,10 @@ if __name__ == "__main__":
     print('  - "Me dê detalhes do ledger mais recente"')
     print('  - "Quais são as estatísticas da rede agora?"')
     print("\nDigite /quit ou /q para sair.\n")
-    
+
+    # Build the agent in the background while the user types the first question
+    threading.Thread(target=get_agent, name="agent-warmup", daemon=True).start()
     try:
-        while True:
-            user_input = input("You: ")
-            if user_input.strip().lower() in ("/quit", "/q"):
-                print("👋 Até logo!")
-                break
-            if not user_input.strip():
-                continue
-            agent.print_response(user_input, stream=True)
-    except (EOFError, KeyboardInterrupt):
+        asyncio.run(chat())
+    except KeyboardInterrupt:
         print("\n👋 Encerrando...")
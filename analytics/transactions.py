@@ -0,0 +1,169 @@
+from typing import Iterable, List
+
+import numpy as np
+
+# Percentiles reported for fee-like columns
+PERCENTILES = (50, 75, 90, 95, 99)
+
+
+def _fee_of(record: dict) -> int:
+    return int(record.get("fee_charged", record.get("fee", 0)) or 0)
+
+
+def _id_of(record: dict) -> str:
+    return record.get("hash") or record.get("transaction_hash") or record.get("id") or ""
+
+
+class TransactionFrame:
+    """
+    Column-oriented view of a list of transactions.
+
+    Every field lives in its own NumPy array so statistics run as vectorized
+    operations instead of Python loops over dicts. Source accounts are stored
+    as integer codes into ``sources`` for cheap grouping with ``bincount``.
+    """
+
+    __slots__ = ("ids", "fee", "operation_count", "successful", "created_at", "sources", "source_codes")
+
+    def __init__(self, records: Iterable[dict]):
+        records = list(records)
+        n = len(records)
+        self.ids = np.array([_id_of(r) for r in records], dtype=object)
+        self.fee = np.fromiter((_fee_of(r) for r in records), dtype=np.int64, count=n)
+        self.operation_count = np.fromiter(
+            (int(r.get("operation_count") or 0) for r in records), dtype=np.int32, count=n
+        )
+        # Records without the flag (e.g. fetch_transactions output) count as successful
+        self.successful = np.fromiter(
+            (r.get("successful") is not False for r in records), dtype=bool, count=n
+        )
+        self.created_at = np.array(
+            [(r.get("created_at") or "NaT").rstrip("Z") for r in records], dtype="datetime64[s]"
+        )
+        self.sources, self.source_codes = np.unique(
+            np.array([r.get("source_account") or "" for r in records], dtype=object), return_inverse=True
+        )
+
+    def __len__(self) -> int:
+        return len(self.fee)
+
+
+def _distribution(values: np.ndarray) -> dict:
+    is_int = np.issubdtype(values.dtype, np.integer) or bool((values == np.round(values)).all())
+    extreme = (lambda v: int(v)) if is_int else (lambda v: round(float(v), 2))
+    stats = {
+        "min": extreme(values.min()),
+        "mean": round(float(values.mean()), 2),
+        "std": round(float(values.std()), 2),
+        "max": extreme(values.max()),
+    }
+    for p, v in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+        stats[f"p{p}"] = round(float(v), 2)
+    return stats
+
+
+def _zscores(values: np.ndarray) -> np.ndarray:
+    std = values.std()
+    if std == 0:
+        return np.zeros(len(values))
+    return (values - values.mean()) / std
+
+
+def _iqr_outliers(values: np.ndarray, factor: float) -> np.ndarray:
+    q1, q3 = np.percentile(values, (25, 75))
+    spread = q3 - q1
+    return (values < q1 - factor * spread) | (values > q3 + factor * spread)
+
+
+def analyze_frame(
+    frame: TransactionFrame,
+    z_threshold: float = 3.0,
+    iqr_factor: float = 1.5,
+    top_sources: int = 10,
+    max_anomalies: int = 20,
+) -> dict:
+    """
+    Summary statistics and anomaly flags for a set of transactions.
+
+    Anomalies are transactions whose fee or operation count has a z-score above
+    ``z_threshold``, or whose fee falls outside ``iqr_factor`` times the
+    interquartile range. The most extreme ``max_anomalies`` are listed.
+    """
+    n = len(frame)
+    if n == 0:
+        return {"count": 0}
+
+    fee = frame.fee.astype(np.float64)
+    ops = frame.operation_count
+    fee_per_op = fee / np.maximum(ops, 1)
+
+    op_values, op_counts = np.unique(ops, return_counts=True)
+
+    # Per-source grouping via integer codes
+    codes = frame.source_codes
+    groups = len(frame.sources)
+    source_count = np.bincount(codes, minlength=groups)
+    source_fee = np.bincount(codes, weights=fee, minlength=groups)
+    source_ok = np.bincount(codes, weights=frame.successful, minlength=groups)
+    order = np.argsort(-source_count, kind="stable")[:top_sources]
+
+    fee_z = _zscores(fee)
+    ops_z = _zscores(ops.astype(np.float64))
+    fee_iqr = _iqr_outliers(fee, iqr_factor)
+    flagged = (np.abs(fee_z) > z_threshold) | (np.abs(ops_z) > z_threshold) | fee_iqr
+    flagged_idx = np.flatnonzero(flagged)
+    severity = np.maximum(np.abs(fee_z), np.abs(ops_z))[flagged_idx]
+    worst = flagged_idx[np.argsort(-severity, kind="stable")[:max_anomalies]]
+
+    anomalies: List[dict] = []
+    for i in worst:
+        reasons = []
+        if abs(fee_z[i]) > z_threshold:
+            reasons.append("fee_zscore")
+        if fee_iqr[i]:
+            reasons.append("fee_iqr")
+        if abs(ops_z[i]) > z_threshold:
+            reasons.append("operation_count_zscore")
+        anomalies.append({
+            "id": frame.ids[i],
+            "source_account": frame.sources[codes[i]],
+            "fee_charged": int(frame.fee[i]),
+            "operation_count": int(ops[i]),
+            "successful": bool(frame.successful[i]),
+            "fee_zscore": round(float(fee_z[i]), 2),
+            "operation_count_zscore": round(float(ops_z[i]), 2),
+            "reasons": reasons,
+        })
+
+    times = frame.created_at[~np.isnat(frame.created_at)]
+    return {
+        "count": n,
+        "first_at": str(times.min()) + "Z" if len(times) else None,
+        "last_at": str(times.max()) + "Z" if len(times) else None,
+        "success_rate": round(float(frame.successful.mean()), 4),
+        "failed": int(n - frame.successful.sum()),
+        "fee_charged": {**_distribution(fee), "total": int(frame.fee.sum())},
+        "fee_per_operation": _distribution(fee_per_op),
+        "operation_count": {
+            **_distribution(ops),
+            "distribution": {int(v): int(c) for v, c in zip(op_values, op_counts)},
+        },
+        "distinct_sources": groups,
+        "top_sources": [
+            {
+                "source_account": frame.sources[g],
+                "transactions": int(source_count[g]),
+                "total_fee": int(source_fee[g]),
+                "avg_fee": round(float(source_fee[g] / source_count[g]), 2),
+                "success_rate": round(float(source_ok[g] / source_count[g]), 4),
+            }
+            for g in order
+        ],
+        "anomaly_count": int(flagged.sum()),
+        "anomalies": anomalies,
+    }
+
+
+def analyze_transactions_records(records: Iterable[dict], **options) -> dict:
+    """Convenience wrapper: build a frame from transaction dicts and analyze it"""
+    return analyze_frame(TransactionFrame(records), **options)
@@ -1,23 +1,15 @@
 import streamlit as st
 import os
-from agno.agent import Agent
-from agno.db.sqlite import SqliteDb
-from agno.models.openai import OpenAIChat
-from agno.models.google import Gemini
-
-from tools.get_account_info import get_account_info
-from tools.get_account_payments import get_account_payments
-from tools.get_account_operations import get_account_operations
-from tools.get_account_transactions import get_account_transactions
-from tools.get_account_effects import get_account_effects
-from tools.get_account_offers import get_account_offers
-from tools.get_account_trades import get_account_trades
-from tools.get_asset_info import get_asset_info
-from tools.search_assets import search_assets
-from tools.get_transaction_info import get_transaction_info
-from tools.get_ledger_info import get_ledger_info
-from tools.get_network_stats import get_network_stats
-from config.agent_config import AGENT_CONFIG
+import hashlib
+
+from router.answer_cache import lookup_answer
+from router.fast_path import FastPathRouter
+from router.prefetch import prefetching
+from telemetry.spans import span
+from tools.registry import load_tool_hooks, load_tools, preload_tools
+from config.agent_config import AGENT_CONFIG, get_memory_config
+from conversation.memory import MEMORY_MODES
+from config.model_config import build_model
 
 from dotenv import load_dotenv
 
@@ -29,52 +21,91 @@ st.set_page_config(
     layout="wide",
 )
 
-def get_model_instance(provider: str, model_name: str, api_key: str):
-    """Create a model instance based on provider and API key"""
+def _key_hash(api_key: str) -> str:
+    return hashlib.sha256(api_key.encode()).hexdigest()
+
+@st.cache_resource(show_spinner=False)
+def _preload_tools():
+    """Once per process: import agno, the tools and stellar_sdk in the background while the page renders"""
+    return preload_tools()
+
+@st.cache_resource(show_spinner=False, max_entries=32)
+def _shared_model(provider: str, model_name: str, key_hash: str, _api_key: str):
+    """
+    One model client per (provider, model, API key hash) for the whole process.
+
+    The key itself is excluded from the cache key (leading underscore); its
+    hash tells different keys apart. OpenAIChat builds a new OpenAI client on
+    every call, so it gets a shared httpx client to keep its connections warm.
+    Only the selected provider's SDK is imported.
+    """
     if provider == "OpenAI":
-        return OpenAIChat(model_name, api_key=api_key)
-    elif provider == "Google":
-        return Gemini(model_name, api_key=api_key)
-    else:
-        raise ValueError(f"Provider {provider} não suportado")
-
-def get_agent(model_instance):
-    """Initialize the agent instance"""
-    db = SqliteDb(db_file="/tmp/onchain_researcher.db")
+        from openai import DefaultHttpxClient
+
+        return build_model(provider, model_name, api_key=_api_key, http_client=DefaultHttpxClient())
+    return build_model(provider, model_name, api_key=_api_key)
+
+def get_model_instance(provider: str, model_name: str, api_key: str):
+    """Return the shared model instance for this provider, model and API key"""
+    return _shared_model(provider, model_name, _key_hash(api_key), api_key)
+
+@st.cache_resource(show_spinner=False)
+def get_db():
+    """Chat database shared by every session (one SQLAlchemy engine per file per process)"""
+    from storage.chat_db import get_chat_db
+
+    return get_chat_db()
+
+def get_agent(model_instance, db=None, memory_mode=None):
+    """Initialize the agent instance (agno and the tool modules are imported on first call)"""
+    from agno.agent import Agent
+    from conversation.memory import memory_options
+    from conversation.window import with_history_window
+    from tools.parallel import with_parallel_tool_calls
+
+    db = db or get_db()
     
     agent = Agent(
-        model=model_instance,
+        # Independent tool calls of one model response run concurrently on a bounded thread pool
+        model=with_parallel_tool_calls(model_instance),
         name=AGENT_CONFIG["name"],
         description="An AI assistant that helps users interact with the Stellar blockchain using natural language.",
         role=AGENT_CONFIG["role"],
         db=db,
-        tools=[
-            # Account queries
-            get_account_info,
-            get_account_transactions,
-            get_account_payments,
-            get_account_operations,
-            get_account_effects,
-            get_account_offers,
-            get_account_trades,
-            # Asset queries
-            get_asset_info,
-            search_assets,
-            # Transaction queries
-            get_transaction_info,
-            # Ledger and network
-            get_ledger_info,
-            get_network_stats,
-        ],
+        tools=load_tools(),
+        # Large tool results are summarized to a token budget before reaching the model;
+        # each call (before compaction) is recorded as a telemetry span
+        tool_hooks=load_tool_hooks(),
         instructions=AGENT_CONFIG["instructions"],
-        enable_agentic_memory=True,
+        # User memories: extracted after the answer by a background worker, by the model
+        # mid-answer, or not at all (MEMORY_MODE / sidebar)
+        **memory_options(memory_mode),
         add_history_to_context=True,
         markdown=True,
         tool_call_limit=15,
     )
+    # Last turns verbatim, older ones folded into a rolling summary, within a token ceiling
+    return with_history_window(agent)
+
+def get_session_agent(provider: str, model_name: str, api_key: str, memory_mode: str):
+    """
+    Agent for this browser session, built on its first message and rebuilt
+    only when the provider, model, API key or memory mode changes. A rebuilt
+    agent keeps the session id, so the conversation history carries over.
+    """
+    config = (provider, model_name, _key_hash(api_key), memory_mode)
+    agent = st.session_state.get("agent")
+    if agent is None or st.session_state.get("agent_config") != config:
+        previous = agent
+        agent = get_agent(get_model_instance(provider, model_name, api_key), memory_mode=memory_mode)
+        if previous is not None:
+            agent.session_id = previous.session_id
+        st.session_state.agent = agent
+        st.session_state.agent_config = config
     return agent
 
 def main():
+    _preload_tools()
     st.title("🌟 Stellar Blockchain Assistant")
     st.markdown("Faça perguntas sobre a blockchain Stellar em linguagem natural.")
     
@@ -131,6 +162,18 @@ def main():
             placeholder=f"sk-..."
         )
         
+        memory_mode = st.selectbox(
+            "Memória do usuário",
+            options=list(MEMORY_MODES),
+            index=MEMORY_MODES.index(get_memory_config()["mode"]),
+            format_func=lambda mode: {
+                "background": "Em segundo plano (após a resposta)",
+                "agentic": "Pelo modelo (durante a resposta)",
+                "off": "Desativada",
+            }[mode],
+            help="Em segundo plano, as memórias são extraídas depois que a resposta termina, sem atrasá-la"
+        )
+        
         st.divider()
         
         st.header("📚 Exemplos de perguntas")
@@ -145,6 +188,9 @@ def main():
         
         if st.button("🗑️ Limpar conversa", use_container_width=True):
             st.session_state.messages = []
+            # Next message starts a new agent session
+            st.session_state.pop("agent", None)
+            st.session_state.pop("router", None)
             st.rerun()
     
     # Check if API key is provided
@@ -181,21 +227,37 @@ def main():
         # Get agent response with streaming
         with st.chat_message("assistant"):
             try:
-                # Create model instance with user's API key
-                model_instance = get_model_instance(provider, model_name, api_key)
-                
-                # Get or create agent
-                agent = get_agent(model_instance)
+                router = st.session_state.setdefault("router", FastPathRouter())
                 
                 # Create placeholder for streaming
                 message_placeholder = st.empty()
                 full_response = ""
                 
-                # Stream the response
-                for chunk in agent.run(prompt, stream=True):
-                    if hasattr(chunk, 'content') and chunk.content:
-                        full_response += chunk.content
-                        message_placeholder.markdown(full_response + "▌")
+                # Stream the response, timed as one telemetry "turn" span
+                with span("turn", "streamlit") as turn:
+                    # A self-contained question any session asked before, with no ledger closed since,
+                    # gets the same answer without tools or LLM
+                    cached = lookup_answer(prompt)
+                    if cached.answer is not None:
+                        full_response = cached.answer
+                        router.remember(prompt, full_response)
+                    else:
+                        # Plain lookups (balance, transaction, ledger, network stats) skip the LLM
+                        full_response = router.answer(prompt) or ""
+                        cached.store(full_response)
+                    # Otherwise reuse this session's agent (and the shared model client and database),
+                    # warming the caches for addresses / hashes in the question while the model thinks
+                    if not full_response:
+                        with prefetching(prompt):
+                            agent = get_session_agent(provider, model_name, api_key, memory_mode)
+                            for chunk in agent.run(prompt, stream=True, **router.llm_context()):
+                                if turn.run_id is None and getattr(chunk, 'run_id', None):
+                                    turn.run_id = chunk.run_id
+                                if hasattr(chunk, 'content') and chunk.content:
+                                    full_response += chunk.content
+                                    message_placeholder.markdown(full_response + "▌")
+                        if cached.storable:
+                            cached.store_run(agent.get_last_run_output())
                 
                 # Display final response without cursor
                 message_placeholder.markdown(full_response)
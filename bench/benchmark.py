@@ -0,0 +1,218 @@
+import argparse
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import tracemalloc
+from time import perf_counter
+from typing import Callable, List, Optional
+
+import numpy as np
+
+from bench.fake_horizon import FakeHorizon
+from bench.fixtures import FixtureSet, synthetic
+
+# (tool module, sync tool name, async tool name)
+TOOLS = [
+    ("get_account_info", "get_account_info", "aget_account_info"),
+    ("get_account_transactions", "get_account_transactions", "aget_account_transactions"),
+    ("get_account_operations", "get_account_operations", "aget_account_operations"),
+    ("get_account_payments", "get_account_payments", "aget_account_payments"),
+    ("get_account_effects", "get_account_effects", "aget_account_effects"),
+    ("get_account_offers", "get_account_offers", "aget_account_offers"),
+    ("get_account_trades", "get_account_trades", "aget_account_trades"),
+    ("get_account_overview", "get_account_overview", "aget_account_overview"),
+    ("get_accounts_batch", "get_accounts_batch", "aget_accounts_batch"),
+    ("count_account_records", "count_account_records", "acount_account_records"),
+    ("get_account_history", "get_account_history", "aget_account_history"),
+    ("get_asset_info", "get_asset_info", "aget_asset_info"),
+    ("search_assets", "search_assets", "asearch_assets"),
+    ("get_transaction_info", "get_transaction_info", "aget_transaction_info"),
+    ("get_ledger_info", "get_ledger_info", "aget_ledger_info"),
+    ("get_network_stats", "get_network_stats", "aget_network_stats"),
+    ("fetch_transactions", "fetch_transactions", None),
+    ("analyze_transactions", "analyze_transactions", None),
+]
+
+# Relative slowdown / growth that counts as a regression against a baseline
+DEFAULT_TOLERANCE = 0.2
+
+
+def _cases(fixtures: FixtureSet) -> dict:
+    """Arguments for every benchmarked tool, picked from the fixture set"""
+    accounts = list(fixtures.accounts)
+    account = max(accounts, key=lambda a: len(fixtures.records(a, "transactions")))
+    first_tx = fixtures.records(account, "transactions")[0]
+    asset = fixtures.assets[0]
+    return {
+        "get_account_info": {"account_id": account},
+        "get_account_transactions": {"account_id": account, "limit": 200},
+        "get_account_operations": {"account_id": account, "limit": 200},
+        "get_account_payments": {"account_id": account, "limit": 200},
+        "get_account_effects": {"account_id": account, "limit": 200},
+        "get_account_offers": {"account_id": account},
+        "get_account_trades": {"account_id": account, "limit": 200},
+        "get_account_overview": {"account_id": account},
+        "get_accounts_batch": {"account_ids": accounts},
+        "count_account_records": {"account_id": account, "record_type": "payments", "group_by": "type"},
+        "get_account_history": {"account_id": account, "record_type": "payments", "limit": 50},
+        "get_asset_info": {"asset_code": asset["asset_code"]},
+        "search_assets": {"asset_code": asset["asset_code"]},
+        "get_transaction_info": {"transaction_hash": first_tx["hash"]},
+        "get_ledger_info": {"ledger_sequence": first_tx["ledger"]},
+        "get_network_stats": {},
+        "fetch_transactions": {"limit": 50},
+        "analyze_transactions": {"account_id": account},
+    }
+
+
+def _reset_local_state() -> None:
+    """Drop cached and stored Horizon data so every call starts cold"""
+    from horizon.cache import get_response_cache
+    from horizon.history import get_history_index
+    from horizon.store import get_immutable_store
+
+    for layer in (get_response_cache(), get_immutable_store(), get_history_index()):
+        if layer is not None:
+            layer.clear()
+
+
+def _percentiles(latencies: List[float]) -> dict:
+    p50, p95, p99 = np.percentile(np.array(latencies) * 1000, (50, 95, 99))
+    return {"p50_ms": round(float(p50), 2), "p95_ms": round(float(p95), 2), "p99_ms": round(float(p99), 2)}
+
+
+def benchmark_tool(horizon: FakeHorizon, call: Callable[[], object], iterations: int, cold: bool) -> dict:
+    """Latency percentiles, Horizon traffic, result size and peak memory of one tool"""
+    from tools.compaction import estimate_tokens
+
+    latencies, requests, transferred, errors = [], 0, 0, 0
+    result = None
+    for _ in range(iterations):
+        if cold:
+            _reset_local_state()
+        horizon.reset_stats()
+        start = perf_counter()
+        result = call()
+        latencies.append(perf_counter() - start)
+        traffic = horizon.stats()
+        requests += traffic["requests"]
+        transferred += traffic["bytes"]
+        if isinstance(result, dict) and "error" in result:
+            errors += 1
+
+    if cold:
+        _reset_local_state()
+    tracemalloc.start()
+    call()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {
+        **_percentiles(latencies),
+        "mean_ms": round(float(np.mean(latencies)) * 1000, 2),
+        "requests_per_call": round(requests / iterations, 2),
+        "kb_per_call": round(transferred / iterations / 1024, 1),
+        "peak_memory_kb": round(peak / 1024, 1),
+        "result_tokens": estimate_tokens(result),
+        "errors": errors,
+    }
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regressions of ``results`` against a previous run's JSON report"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if previous is None:
+            continue
+        for metric in ("p95_ms", "requests_per_call", "kb_per_call", "peak_memory_kb"):
+            before, after = previous.get(metric), current.get(metric)
+            if before and after > before * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {before} -> {after} (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def _print_report(results: dict) -> None:
+    header = f"{'tool':<26}{'p50 ms':>9}{'p95 ms':>9}{'p99 ms':>9}{'req/call':>10}{'KB/call':>10}{'peak KB':>10}{'tokens':>8}{'err':>5}"
+    print(header)
+    print("-" * len(header))
+    for name, r in results.items():
+        print(
+            f"{name:<26}{r['p50_ms']:>9}{r['p95_ms']:>9}{r['p99_ms']:>9}{r['requests_per_call']:>10}"
+            f"{r['kb_per_call']:>10}{r['peak_memory_kb']:>10}{r['result_tokens']:>8}{r['errors']:>5}"
+        )
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Benchmark every tool against a local fake Horizon")
+    parser.add_argument("--iterations", type=int, default=20)
+    parser.add_argument("--latency-ms", type=float, default=30, help="Simulated Horizon latency per request")
+    parser.add_argument("--jitter-ms", type=float, default=10, help="Extra random latency per request")
+    parser.add_argument("--fixtures", help="JSON fixtures recorded with bench.record_fixtures (default: synthetic)")
+    parser.add_argument("--tools", help="Comma-separated tool names to run (default: all)")
+    parser.add_argument("--async", dest="use_async", action="store_true", help="Benchmark the async tool variants")
+    parser.add_argument("--warm", action="store_true", help="Keep caches, stores and indexes between calls")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    fixtures = FixtureSet.load(args.fixtures) if args.fixtures else synthetic()
+    horizon = FakeHorizon(fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    workdir = tempfile.mkdtemp(prefix="stellar-bench-")
+    # Must be set before the Horizon layer builds its singletons
+    os.environ.update({
+        "STELLAR_HORIZON_URL": horizon.start(),
+        "STELLAR_IMMUTABLE_STORE_PATH": os.path.join(workdir, "store.db"),
+        "STELLAR_HISTORY_INDEX_PATH": os.path.join(workdir, "history.db"),
+        "TELEMETRY_DB_PATH": os.path.join(workdir, "traces.db"),
+        "STELLAR_LEDGER_INGESTER_ENABLED": "false",
+    })
+
+    import importlib
+
+    cases = _cases(fixtures)
+    selected = set(args.tools.split(",")) if args.tools else None
+    loop = asyncio.new_event_loop() if args.use_async else None
+    results = {}
+    try:
+        for module_name, sync_name, async_name in TOOLS:
+            if selected and sync_name not in selected:
+                continue
+            module = importlib.import_module(f"tools.{module_name}")
+            kwargs = cases[sync_name]
+            if args.use_async and async_name:
+                entrypoint = getattr(module, async_name).entrypoint
+                call = lambda entrypoint=entrypoint: loop.run_until_complete(entrypoint(**kwargs))
+            else:
+                entrypoint = getattr(module, sync_name).entrypoint
+                call = lambda entrypoint=entrypoint: entrypoint(**kwargs)
+            results[sync_name] = benchmark_tool(horizon, call, args.iterations, cold=not args.warm)
+    finally:
+        if loop is not None:
+            from horizon.async_client import close_async_server
+
+            loop.run_until_complete(close_async_server())
+            loop.close()
+        horizon.stop()
+
+    _print_report(results)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
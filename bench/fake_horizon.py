@@ -0,0 +1,329 @@
+import argparse
+import json
+import math
+import random
+import re
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from bench.fixtures import ACCOUNT_COLLECTIONS, BASE_LEDGER, FixtureSet, synthetic
+
+DEFAULT_LIMIT = 10
+MAX_LIMIT = 200
+
+_ACCOUNT = re.compile(r"^/accounts/([^/]+)$")
+_ACCOUNT_COLLECTION = re.compile(r"^/accounts/([^/]+)/(%s)$" % "|".join(ACCOUNT_COLLECTIONS))
+_TRANSACTION = re.compile(r"^/transactions/([0-9a-fA-F]{64})$")
+_OPERATION = re.compile(r"^/operations/(\d+)$")
+_LEDGER = re.compile(r"^/ledgers/(\d+)$")
+
+
+def _token_key(token: str) -> tuple:
+    """Sort key for paging tokens: TOIDs ("123"), effect/trade ids ("123-1") or asset tokens"""
+    parts = token.split("-")
+    if all(part.isdigit() for part in parts):
+        return (0, *map(int, parts))
+    return (1, token)
+
+
+class _NotFound(Exception):
+    pass
+
+
+class FakeHorizon:
+    """
+    Local stand-in for Horizon that replays a FixtureSet.
+
+    Serves the endpoints the tools use with Horizon's paging semantics
+    (``cursor``/``limit``/``order``, 200-record page cap, ``_links.next``) and
+    the ``Latest-Ledger`` header. Every response is delayed by ``latency_ms``
+    plus up to ``jitter_ms`` of random jitter, and request/byte counters are
+    kept so benchmarks can report requests per tool call.
+
+    With ``rate_limit`` it enforces Horizon's per-IP limit (a bucket of
+    ``rate_limit`` requests refilled over ``rate_limit_period`` seconds),
+    sending ``X-Ratelimit-*`` headers and 429s with ``Retry-After``;
+    ``error_rate`` answers that fraction of requests with a 503. With
+    ``ledger_close_s`` the ``Latest-Ledger`` header advances by one ledger
+    every that many seconds, as if the network kept closing ledgers (the
+    fixtures themselves stay as recorded).
+    """
+
+    def __init__(
+        self,
+        fixtures: Optional[FixtureSet] = None,
+        latency_ms: float = 0,
+        jitter_ms: float = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        rate_limit: int = 0,
+        rate_limit_period: float = 3600,
+        error_rate: float = 0,
+        ledger_close_s: float = 0,
+    ):
+        self.fixtures = fixtures or synthetic()
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.rate_limit = rate_limit
+        self.rate_limit_period = rate_limit_period
+        self.error_rate = error_rate
+        self.ledger_close_s = ledger_close_s
+        self._created_at = time.monotonic()
+        self._lock = threading.Lock()
+        self._tokens = float(rate_limit)
+        self._refilled_at = time.monotonic()
+        self._requests = 0
+        self._rejected = {429: 0, 503: 0}
+        self._bytes = 0
+        self._paths: Counter = Counter()
+        self._server = ThreadingHTTPServer((host, port), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> str:
+        self._thread = threading.Thread(target=self._server.serve_forever, name="fake-horizon", daemon=True)
+        self._thread.start()
+        return self.url
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def latest_ledger(self) -> int:
+        """Ledger reported in the Latest-Ledger header"""
+        if self.ledger_close_s <= 0:
+            return self.fixtures.head_ledger
+        return self.fixtures.head_ledger + int((time.monotonic() - self._created_at) / self.ledger_close_s)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "requests": self._requests,
+                "bytes": self._bytes,
+                "rate_limited": self._rejected[429],
+                "injected_errors": self._rejected[503],
+                "paths": dict(self._paths),
+            }
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._requests = 0
+            self._rejected = {429: 0, 503: 0}
+            self._bytes = 0
+            self._paths.clear()
+
+    def _admit(self) -> tuple:
+        """(status to reject with or None, rate-limit headers) for one request"""
+        if random.random() < self.error_rate:
+            with self._lock:
+                self._rejected[503] += 1
+            return 503, {}
+        if not self.rate_limit:
+            return None, {}
+        refill_per_second = self.rate_limit / self.rate_limit_period
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._refilled_at) * refill_per_second)
+            self._refilled_at = now
+            admitted = self._tokens >= 1
+            if admitted:
+                self._tokens -= 1
+            else:
+                self._rejected[429] += 1
+            headers = {
+                "X-Ratelimit-Limit": str(self.rate_limit),
+                "X-Ratelimit-Remaining": str(math.floor(self._tokens)),
+                "X-Ratelimit-Reset": str(math.ceil((self.rate_limit - self._tokens) / refill_per_second)),
+            }
+            if not admitted:
+                headers["Retry-After"] = str(math.ceil((1 - self._tokens) / refill_per_second))
+        return (None if admitted else 429), headers
+
+    def _record(self, path: str, size: int) -> None:
+        # Group by endpoint shape rather than by id
+        endpoint = re.sub(r"/(G[A-Z2-7]{55}|[0-9a-fA-F]{64}|\d+)(?=/|$)", "/{id}", path)
+        with self._lock:
+            self._requests += 1
+            self._bytes += size
+            self._paths[endpoint] += 1
+
+    def _page(self, path: str, query: dict, records: List[dict], key=None) -> dict:
+        key = key or (lambda record: _token_key(record["paging_token"]))
+        limit = min(int(query.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+        desc = query.get("order") == "desc"
+        cursor = query.get("cursor")
+        ordered = sorted(records, key=key, reverse=desc)
+        if cursor and cursor != "now":
+            bound = _token_key(cursor)
+            ordered = [r for r in ordered if (key(r) < bound if desc else key(r) > bound)]
+        elif cursor == "now":
+            ordered = []
+        page = ordered[:limit]
+        next_query = {**query, "cursor": page[-1]["paging_token"] if page else cursor or ""}
+        return {
+            "_links": {
+                "self": {"href": f"{self.url}{path}?{urlencode(query)}"},
+                "next": {"href": f"{self.url}{path}?{urlencode(next_query)}"},
+            },
+            "_embedded": {"records": page},
+        }
+
+    def _ledgers_page(self, path: str, query: dict) -> dict:
+        # Ledgers are synthesized on demand, only the requested window is built
+        fixtures = self.fixtures
+        limit = min(int(query.get("limit", DEFAULT_LIMIT)), MAX_LIMIT)
+        desc = query.get("order") == "desc"
+        cursor = query.get("cursor")
+        if desc:
+            start = (int(cursor) >> 32) - 1 if cursor else fixtures.head_ledger
+            sequences = range(start, max(start - limit, BASE_LEDGER - 1), -1)
+        else:
+            start = (int(cursor) >> 32) + 1 if cursor and cursor != "now" else BASE_LEDGER
+            sequences = range(start, min(start + limit, fixtures.head_ledger + 1))
+        records = [fixtures.ledger(sequence) for sequence in sequences]
+        next_query = {**query, "cursor": records[-1]["paging_token"] if records else cursor or ""}
+        return {
+            "_links": {
+                "self": {"href": f"{self.url}{path}?{urlencode(query)}"},
+                "next": {"href": f"{self.url}{path}?{urlencode(next_query)}"},
+            },
+            "_embedded": {"records": records},
+        }
+
+    def route(self, path: str, query: dict) -> dict:
+        fixtures = self.fixtures
+        if path == "/fee_stats":
+            return fixtures.fee_stats
+        if path == "/ledgers":
+            return self._ledgers_page(path, query)
+        if path == "/transactions":
+            return self._page(path, query, fixtures.all_transactions)
+        if path == "/assets":
+            assets = [
+                asset for asset in fixtures.assets
+                if asset["asset_code"] == query.get("asset_code", asset["asset_code"])
+                and asset["asset_issuer"] == query.get("asset_issuer", asset["asset_issuer"])
+            ]
+            return self._page(path, query, assets)
+        if match := _ACCOUNT.match(path):
+            if match.group(1) not in fixtures.accounts:
+                raise _NotFound
+            return fixtures.accounts[match.group(1)]
+        if match := _ACCOUNT_COLLECTION.match(path):
+            account_id, collection = match.groups()
+            if account_id not in fixtures.accounts:
+                raise _NotFound
+            return self._page(path, query, fixtures.records(account_id, collection))
+        if match := _TRANSACTION.match(path):
+            if match.group(1).lower() not in fixtures.transactions:
+                raise _NotFound
+            return fixtures.transactions[match.group(1).lower()]
+        if match := _OPERATION.match(path):
+            if match.group(1) not in fixtures.operations:
+                raise _NotFound
+            return fixtures.operations[match.group(1)]
+        if match := _LEDGER.match(path):
+            ledger = fixtures.ledger(int(match.group(1)))
+            if ledger is None:
+                raise _NotFound
+            return ledger
+        raise _NotFound
+
+    def _handler(self):
+        horizon = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes; avoid Nagle + delayed-ACK stalls
+            disable_nagle_algorithm = True
+
+            def log_message(self, *args):
+                pass
+
+            def do_GET(self):
+                self._extra_headers = {}
+                delay = horizon.latency_ms + random.uniform(0, horizon.jitter_ms)
+                if delay:
+                    time.sleep(delay / 1000)
+                url = urlparse(self.path)
+                query = {key: values[-1] for key, values in parse_qs(url.query).items()}
+                path = url.path.rstrip("/") or "/"
+                if "text/event-stream" in self.headers.get("Accept", ""):
+                    # Streaming is not replayed; the ledger ingester falls back to polling tools
+                    return self._send(501, {"title": "Streaming not supported by the fake Horizon", "status": 501})
+                rejected, self._extra_headers = horizon._admit()
+                if rejected == 429:
+                    return self._send(429, {
+                        "type": "https://stellar.org/horizon-errors/rate_limit_exceeded",
+                        "title": "Rate Limit Exceeded",
+                        "status": 429,
+                    })
+                if rejected == 503:
+                    return self._send(503, {"title": "Service Unavailable", "status": 503})
+                try:
+                    self._send(200, horizon.route(path, query))
+                except _NotFound:
+                    self._send(404, {
+                        "type": "https://stellar.org/horizon-errors/not_found",
+                        "title": "Resource Missing",
+                        "status": 404,
+                        "detail": "The resource at the url requested was not found.",
+                    })
+                except (KeyError, ValueError) as e:
+                    self._send(400, {"title": "Bad Request", "status": 400, "detail": str(e)})
+                horizon._record(path, self._sent)
+
+            def _send(self, status: int, body: dict):
+                payload = json.dumps(body).encode()
+                self._sent = len(payload)
+                self.send_response(status)
+                self.send_header("Content-Type", "application/hal+json; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.send_header("Latest-Ledger", str(horizon.latest_ledger()))
+                for name, value in self._extra_headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(payload)
+
+        return Handler
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run a local fake Horizon that replays fixtures")
+    parser.add_argument("--port", type=int, default=8000)
+    parser.add_argument("--latency-ms", type=float, default=0)
+    parser.add_argument("--jitter-ms", type=float, default=0)
+    parser.add_argument("--fixtures", help="JSON fixtures recorded with bench.record_fixtures (default: synthetic)")
+    parser.add_argument("--rate-limit", type=int, default=0, help="Requests allowed per --rate-limit-period (0: no limit)")
+    parser.add_argument("--rate-limit-period", type=float, default=3600)
+    parser.add_argument("--error-rate", type=float, default=0, help="Fraction of requests answered with a 503")
+    parser.add_argument("--ledger-close-s", type=float, default=0,
+                        help="Advance the Latest-Ledger header every N seconds (0: stay at the fixtures' head ledger)")
+    args = parser.parse_args()
+
+    fixtures = FixtureSet.load(args.fixtures) if args.fixtures else synthetic()
+    horizon = FakeHorizon(
+        fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms, port=args.port,
+        rate_limit=args.rate_limit, rate_limit_period=args.rate_limit_period, error_rate=args.error_rate,
+        ledger_close_s=args.ledger_close_s,
+    )
+    print(f"Fake Horizon at {horizon.url} ({len(fixtures.accounts)} accounts)")
+    for account_id in fixtures.accounts:
+        print(f"  {account_id}")
+    try:
+        horizon._server.serve_forever()
+    except KeyboardInterrupt:
+        horizon.stop()
+
+
+if __name__ == "__main__":
+    main()
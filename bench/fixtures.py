@@ -0,0 +1,306 @@
+import json
+import random
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from stellar_sdk import Keypair
+
+# Account sub-collections served by the fake Horizon, in the order the tools use them
+ACCOUNT_COLLECTIONS = ("transactions", "operations", "payments", "effects", "trades", "offers")
+
+BASE_LEDGER = 50_000_000
+BASE_TIME = datetime(2025, 1, 1, tzinfo=timezone.utc)
+LEDGER_SECONDS = 5
+
+
+def toid(ledger: int, tx_index: int = 0, op_index: int = 0) -> int:
+    """Horizon's total order id: ledger, transaction and operation packed into one integer"""
+    return (ledger << 32) | (tx_index << 12) | op_index
+
+
+def ledger_time(ledger: int) -> str:
+    return (BASE_TIME + timedelta(seconds=(ledger - BASE_LEDGER) * LEDGER_SECONDS)).strftime("%Y-%m-%dT%H:%M:%SZ")
+
+
+class FixtureSet:
+    """
+    Horizon data replayed by the fake server.
+
+    Holds account objects, per-account record collections (ascending by
+    ``paging_token``), assets and fee stats. Fixtures are either generated
+    synthetically or recorded from a real Horizon with
+    ``python -m bench.record_fixtures`` and loaded from JSON.
+    """
+
+    def __init__(self, data: Optional[dict] = None):
+        data = data or {}
+        self.accounts: Dict[str, dict] = data.get("accounts", {})
+        # account_id -> collection -> records
+        self.collections: Dict[str, Dict[str, List[dict]]] = data.get("collections", {})
+        self.assets: List[dict] = data.get("assets", [])
+        self.ledgers: Dict[str, dict] = data.get("ledgers", {})
+        self.fee_stats: dict = data.get("fee_stats", {})
+        self.head_ledger: int = data.get("head_ledger", BASE_LEDGER)
+        self.reindex()
+
+    def reindex(self) -> None:
+        self.transactions = {}
+        self.operations = {}
+        for collections in self.collections.values():
+            for tx in collections.get("transactions", []):
+                self.transactions[tx["hash"]] = tx
+            for op in collections.get("operations", []):
+                self.operations[op["id"]] = op
+        self.all_transactions = sorted(self.transactions.values(), key=lambda tx: int(tx["paging_token"]))
+
+    def records(self, account_id: str, collection: str) -> List[dict]:
+        return self.collections.get(account_id, {}).get(collection, [])
+
+    def ledger(self, sequence: int) -> Optional[dict]:
+        """Recorded ledger, or a synthetic one for any sequence up to the head"""
+        if str(sequence) in self.ledgers:
+            return self.ledgers[str(sequence)]
+        if not BASE_LEDGER <= sequence <= self.head_ledger:
+            return None
+        rng = random.Random(sequence)
+        return {
+            "id": f"{sequence:064x}",
+            "paging_token": str(toid(sequence)),
+            "hash": f"{rng.getrandbits(256):064x}",
+            "sequence": sequence,
+            "successful_transaction_count": rng.randint(150, 400),
+            "failed_transaction_count": rng.randint(5, 60),
+            "operation_count": rng.randint(400, 1200),
+            "tx_set_operation_count": rng.randint(400, 1300),
+            "closed_at": ledger_time(sequence),
+            "total_coins": "105443902087.3472865",
+            "fee_pool": "4128000.1234567",
+            "base_fee_in_stroops": 100,
+            "base_reserve_in_stroops": 5000000,
+            "max_tx_set_size": 1000,
+            "protocol_version": 22,
+        }
+
+    def to_json(self) -> dict:
+        return {
+            "accounts": self.accounts,
+            "collections": self.collections,
+            "assets": self.assets,
+            "ledgers": self.ledgers,
+            "fee_stats": self.fee_stats,
+            "head_ledger": self.head_ledger,
+        }
+
+    def save(self, path: str) -> None:
+        with open(path, "w") as f:
+            json.dump(self.to_json(), f)
+
+    @classmethod
+    def load(cls, path: str) -> "FixtureSet":
+        with open(path) as f:
+            return cls(json.load(f))
+
+
+def _address(rng: random.Random) -> str:
+    return Keypair.from_raw_ed25519_seed(rng.getrandbits(256).to_bytes(32, "big")).public_key
+
+
+def _asset(code: Optional[str], issuer: Optional[str]) -> dict:
+    if code is None:
+        return {"asset_type": "native"}
+    kind = "credit_alphanum4" if len(code) <= 4 else "credit_alphanum12"
+    return {"asset_type": kind, "asset_code": code, "asset_issuer": issuer}
+
+
+def synthetic(num_accounts: int = 5, transactions_per_account: int = 600, seed: int = 7) -> FixtureSet:
+    """Deterministic fixture set shaped like mainnet responses"""
+    rng = random.Random(seed)
+    issuers = {code: _address(rng) for code in ("USDC", "AQUA", "yXLM", "BTCLN")}
+    accounts = [_address(rng) for _ in range(num_accounts)]
+    others = [_address(rng) for _ in range(50)]
+
+    fixtures = FixtureSet()
+    head = BASE_LEDGER
+    for account_id in accounts:
+        collections = {name: [] for name in ACCOUNT_COLLECTIONS}
+        ledger = BASE_LEDGER + rng.randint(1, 1000)
+        for tx_index in range(transactions_per_account):
+            ledger += rng.randint(1, 40)
+            created_at = ledger_time(ledger)
+            op_count = rng.choices((1, 2, 3, 10), weights=(70, 15, 10, 5))[0]
+            tx_hash = f"{rng.getrandbits(256):064x}"
+            successful = rng.random() > 0.04
+            fee = rng.choice((100, 100, 100, 200, 1000)) * op_count
+            tx_toid = toid(ledger, tx_index % 1000 + 1)
+            collections["transactions"].append({
+                "id": tx_hash,
+                "paging_token": str(tx_toid),
+                "successful": successful,
+                "hash": tx_hash,
+                "ledger": ledger,
+                "created_at": created_at,
+                "source_account": account_id,
+                "source_account_sequence": str(tx_toid),
+                "fee_account": account_id,
+                "fee_charged": str(fee),
+                "max_fee": str(fee * 2),
+                "operation_count": op_count,
+                "envelope_xdr": "AAAAAg" + "A" * 180,
+                "result_xdr": "AAAAAAAAAGQAAAAAAAAAAQAAAAAAAAABAAAAAAAAAAA=",
+                "memo_type": "text" if tx_index % 4 == 0 else "none",
+                **({"memo": f"invoice {tx_index}"} if tx_index % 4 == 0 else {}),
+                "signatures": ["c2lnbmF0dXJl" * 7],
+            })
+            for op_index in range(1, op_count + 1):
+                op_id = str(toid(ledger, tx_index % 1000 + 1, op_index))
+                kind = rng.choices(
+                    ("payment", "create_account", "change_trust", "manage_sell_offer", "path_payment_strict_send"),
+                    weights=(60, 5, 10, 15, 10),
+                )[0]
+                code = rng.choice((None, None, "USDC", "AQUA", "yXLM"))
+                counterparty = rng.choice(others)
+                incoming = rng.random() < 0.5
+                op = {
+                    "id": op_id,
+                    "paging_token": op_id,
+                    "transaction_successful": successful,
+                    "source_account": account_id,
+                    "type": kind,
+                    "type_i": 1,
+                    "created_at": created_at,
+                    "transaction_hash": tx_hash,
+                }
+                amount = f"{rng.uniform(0.5, 5000):.7f}"
+                if kind in ("payment", "path_payment_strict_send"):
+                    op.update(_asset(code, issuers.get(code)))
+                    op.update({
+                        "from": counterparty if incoming else account_id,
+                        "to": account_id if incoming else counterparty,
+                        "amount": amount,
+                    })
+                elif kind == "create_account":
+                    op.update({"funder": account_id, "account": counterparty, "starting_balance": "5.0000000"})
+                elif kind == "change_trust":
+                    code = code or "USDC"
+                    op.update({**_asset(code, issuers[code]), "trustor": account_id, "limit": "922337203685.4775807"})
+                collections["operations"].append(op)
+                if kind in ("payment", "path_payment_strict_send", "create_account"):
+                    collections["payments"].append(op)
+
+                effect = {
+                    "id": f"{op_id}-1",
+                    "paging_token": f"{op_id}-1",
+                    "account": account_id,
+                    "created_at": created_at,
+                }
+                if kind in ("payment", "path_payment_strict_send"):
+                    effect.update({
+                        "type": "account_credited" if incoming else "account_debited",
+                        **_asset(code, issuers.get(code)),
+                        "amount": amount,
+                    })
+                elif kind == "create_account":
+                    effect.update({**_asset(None, None), "type": "account_debited", "amount": "5.0000000"})
+                elif kind == "change_trust":
+                    effect.update({**_asset(code, issuers[code]), "type": "trustline_created", "limit": op["limit"]})
+                else:
+                    effect.update({"type": "offer_created"})
+                collections["effects"].append(effect)
+
+                if kind == "manage_sell_offer" and rng.random() < 0.6:
+                    counter_code = rng.choice(("USDC", "AQUA"))
+                    price_n, price_d = rng.randint(1, 2000), 10000
+                    collections["trades"].append({
+                        "id": f"{op_id}-0",
+                        "paging_token": f"{op_id}-0",
+                        "ledger_close_time": created_at,
+                        "trade_type": "orderbook",
+                        "base_account": account_id,
+                        "base_amount": amount,
+                        "base_asset_type": "native",
+                        "counter_account": counterparty,
+                        "counter_amount": f"{float(amount) * price_n / price_d:.7f}",
+                        **{f"counter_{key}": value for key, value in _asset(counter_code, issuers[counter_code]).items()},
+                        "base_is_seller": True,
+                        "price": {"n": str(price_n), "d": str(price_d)},
+                    })
+        head = max(head, ledger)
+
+        for offer_index in range(rng.randint(0, 8)):
+            code = rng.choice(("USDC", "AQUA"))
+            offer_id = str(1_500_000_000 + rng.getrandbits(24))
+            collections["offers"].append({
+                "id": offer_id,
+                "paging_token": offer_id,
+                "seller": account_id,
+                "selling": _asset(None, None),
+                "buying": _asset(code, issuers[code]),
+                "amount": f"{rng.uniform(10, 10000):.7f}",
+                "price_r": {"n": 1, "d": 10},
+                "price": "0.1000000",
+                "last_modified_ledger": ledger,
+                "last_modified_time": ledger_time(ledger),
+            })
+        collections["offers"].sort(key=lambda offer: int(offer["id"]))
+
+        trustlines = [
+            {
+                **_asset(code, issuers[code]),
+                "balance": f"{rng.uniform(0, 100000):.7f}",
+                "limit": "922337203685.4775807",
+                "buying_liabilities": "0.0000000",
+                "selling_liabilities": "0.0000000",
+                "is_authorized": True,
+            }
+            for code in rng.sample(sorted(issuers), rng.randint(0, 3))
+        ]
+        fixtures.accounts[account_id] = {
+            "id": account_id,
+            "account_id": account_id,
+            "sequence": str(toid(ledger)),
+            "subentry_count": len(trustlines) + len(collections["offers"]),
+            "home_domain": rng.choice(("", "example.com", "lobstr.co")),
+            "last_modified_ledger": ledger,
+            "thresholds": {"low_threshold": 0, "med_threshold": 0, "high_threshold": 0},
+            "flags": {"auth_required": False, "auth_revocable": False, "auth_immutable": False, "auth_clawback_enabled": False},
+            "balances": trustlines + [{
+                "asset_type": "native",
+                "balance": f"{rng.uniform(1, 50000):.7f}",
+                "buying_liabilities": "0.0000000",
+                "selling_liabilities": "0.0000000",
+            }],
+            "signers": [{"weight": 1, "key": account_id, "type": "ed25519_public_key"}],
+            "num_sponsoring": 0,
+            "num_sponsored": 0,
+            "paging_token": account_id,
+        }
+        fixtures.collections[account_id] = collections
+
+    for code, issuer in sorted(issuers.items()):
+        fixtures.assets.append({
+            **_asset(code, issuer),
+            "paging_token": f"{code}_{issuer}_{_asset(code, issuer)['asset_type']}",
+            "num_accounts": rng.randint(100, 500000),
+            "num_claimable_balances": rng.randint(0, 100),
+            "num_liquidity_pools": rng.randint(0, 50),
+            "amount": f"{rng.uniform(1e5, 1e9):.7f}",
+            "accounts": {"authorized": rng.randint(100, 500000), "authorized_to_maintain_liabilities": 0, "unauthorized": 0},
+            "flags": {"auth_required": False, "auth_revocable": False, "auth_immutable": False, "auth_clawback_enabled": False},
+        })
+
+    fixtures.head_ledger = head + 10
+    fixtures.fee_stats = {
+        "last_ledger": str(fixtures.head_ledger),
+        "last_ledger_base_fee": "100",
+        "ledger_capacity_usage": "0.42",
+        "fee_charged": {k: v for k, v in zip(
+            ("max", "min", "mode", "p10", "p20", "p30", "p40", "p50", "p60", "p70", "p80", "p90", "p95", "p99"),
+            ("5000", "100", "100", "100", "100", "100", "100", "100", "100", "100", "150", "200", "400", "1500"),
+        )},
+        "max_fee": {k: v for k, v in zip(
+            ("max", "min", "mode", "p10", "p20", "p30", "p40", "p50", "p60", "p70", "p80", "p90", "p95", "p99"),
+            ("100000", "100", "100", "100", "100", "200", "200", "300", "500", "1000", "1000", "2000", "5000", "10000"),
+        )},
+    }
+    fixtures.reindex()
+    return fixtures
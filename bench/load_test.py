@@ -0,0 +1,376 @@
+import argparse
+import asyncio
+import json
+import os
+import random
+import resource
+import sys
+import tempfile
+import threading
+import tracemalloc
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import List, Optional
+
+import numpy as np
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+
+from bench.fake_horizon import FakeHorizon
+from bench.fixtures import FixtureSet, synthetic
+from bench.stub_model import ScriptedModel
+from config.router_config import get_router_config
+from conversation.memory import MEMORY_MODES, flush_memories, get_memory_stats
+from router.answer_cache import get_answer_cache_stats, lookup_answer
+from router.fast_path import FastPathRouter
+from router.prefetch import aprefetching, get_prefetch_stats, prefetching
+from telemetry.spans import span
+
+
+def question_mix(fixtures: FixtureSet) -> List[tuple]:
+    """Questions users ask and the tool calls the stub model answers them with"""
+    accounts = list(fixtures.accounts)
+    account = accounts[0]
+    tx = fixtures.records(account, "transactions")[0]
+    return [
+        (f"Qual o saldo da conta {account}?", [("get_account_info", {"account_id": account})]),
+        (f"Mostre os últimos pagamentos da conta {account}", [("get_account_payments", {"account_id": account, "limit": 20})]),
+        (f"Quantas transações a conta {account} fez?", [("count_account_records", {"account_id": account})]),
+        (f"Me dê uma visão geral da conta {account}", [("get_account_overview", {"account_id": account})]),
+        (f"Compare as contas {', '.join(accounts)}", [("get_accounts_batch", {"account_ids": accounts})]),
+        (f"A conta {account} tem ofertas e trades?", [
+            ("get_account_offers", {"account_id": account}),
+            ("get_account_trades", {"account_id": account, "limit": 20}),
+        ]),
+        (f"Detalhes da transação {tx['hash']}", [("get_transaction_info", {"transaction_hash": tx["hash"]})]),
+        (f"Me dê detalhes do ledger {tx['ledger']}", [("get_ledger_info", {"ledger_sequence": tx["ledger"]})]),
+        ("Quais são as estatísticas da rede agora?", [("get_network_stats", {})]),
+    ]
+
+
+class SqliteMonitor:
+    """Times every SQL statement run through SQLAlchemy (the agent's session/memory storage)"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.durations: List[float] = []
+        self.lock_errors = 0
+        self.errors = 0
+
+    def install(self) -> None:
+        event.listen(Engine, "before_cursor_execute", self._before)
+        event.listen(Engine, "after_cursor_execute", self._after)
+        event.listen(Engine, "handle_error", self._error)
+
+    def uninstall(self) -> None:
+        event.remove(Engine, "before_cursor_execute", self._before)
+        event.remove(Engine, "after_cursor_execute", self._after)
+        event.remove(Engine, "handle_error", self._error)
+
+    def _before(self, conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("stub_query_start", []).append(perf_counter())
+
+    def _after(self, conn, cursor, statement, parameters, context, executemany):
+        elapsed = perf_counter() - conn.info["stub_query_start"].pop()
+        with self._lock:
+            self.durations.append(elapsed)
+
+    def _error(self, context):
+        with self._lock:
+            self.errors += 1
+            if "locked" in str(context.original_exception).lower():
+                self.lock_errors += 1
+
+    def report(self) -> dict:
+        with self._lock:
+            durations = np.array(self.durations) * 1000
+        if not len(durations):
+            return {"statements": 0}
+        p50, p95, p99 = np.percentile(durations, (50, 95, 99))
+        return {
+            "statements": len(durations),
+            "total_s": round(float(durations.sum()) / 1000, 3),
+            "p50_ms": round(float(p50), 2),
+            "p95_ms": round(float(p95), 2),
+            "p99_ms": round(float(p99), 2),
+            "max_ms": round(float(durations.max()), 2),
+            "errors": self.errors,
+            "lock_errors": self.lock_errors,
+        }
+
+
+class TurnLog:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: List[float] = []
+        self.first_chunk: List[float] = []
+        self.fast_path: List[float] = []
+        self.cached: List[float] = []
+        self.errors: List[str] = []
+
+    def add(self, latency: float, first_chunk: Optional[float], error: Optional[str], routed: bool = False,
+            cached: bool = False) -> None:
+        with self._lock:
+            self.latencies.append(latency)
+            if routed:
+                self.fast_path.append(latency)
+            if cached:
+                self.cached.append(latency)
+            if first_chunk is not None:
+                self.first_chunk.append(first_chunk)
+            if error:
+                self.errors.append(error)
+
+
+def _percentiles(values: List[float]) -> dict:
+    if not values:
+        return {}
+    p50, p95, p99 = np.percentile(np.array(values) * 1000, (50, 95, 99))
+    return {"p50_ms": round(float(p50), 1), "p95_ms": round(float(p95), 1), "p99_ms": round(float(p99), 1)}
+
+
+def _session_questions(mix: List[tuple], session: int, turns: int, seed: int) -> List[str]:
+    rng = random.Random(seed * 100_003 + session)
+    return [rng.choice(mix)[0] for _ in range(turns)]
+
+
+def chat_db(db_file: str, plain: bool = False):
+    """The chat database the apps open (CHAT_DB_* settings), or agno's default SqliteDb with ``plain``"""
+    if plain:
+        from agno.db.sqlite import SqliteDb
+
+        return SqliteDb(db_file=db_file)
+    from config.storage_config import get_storage_config
+    from storage.chat_db import build_chat_db
+
+    return build_chat_db({**get_storage_config(), "path": db_file})
+
+
+def run_streamlit_sessions(model: ScriptedModel, db_file: str, mix, sessions: int, turns: int, seed: int, log: TurnLog,
+                           cold_agent: bool = False, fast_path: bool = True, plain_db: bool = False,
+                           memory_mode: Optional[str] = None):
+    """
+    Sync sessions, each on its own thread, driving the agent the way
+    app_streamlit.py does: one shared database, one fast-path router and one
+    agent per session. With ``cold_agent`` the database and agent are rebuilt
+    on every turn.
+    """
+    import app_streamlit
+
+    # Keep the load test out of the real chat database
+    shared_db = chat_db(db_file, plain_db)
+
+    def session(index: int):
+        agent = None
+        router = FastPathRouter({**get_router_config(), "enabled": fast_path})
+        for question in _session_questions(mix, index, turns, seed):
+            start = perf_counter()
+            first_chunk, error, routed, answered_from_cache = None, None, False, False
+            try:
+                with span("turn", "load-test") as turn:
+                    cached = lookup_answer(question)
+                    if cached.answer is not None:
+                        router.remember(question, cached.answer)
+                        first_chunk, answered_from_cache = perf_counter() - start, True
+                        continue
+                    answer = router.answer(question)
+                    if answer is not None:
+                        cached.store(answer)
+                        first_chunk, routed = perf_counter() - start, True
+                        continue
+                    with prefetching(question):
+                        if agent is None or cold_agent:
+                            agent = app_streamlit.get_agent(
+                                model, chat_db(db_file, plain_db) if cold_agent else shared_db, memory_mode
+                            )
+                        for chunk in agent.run(question, stream=True, **router.llm_context()):
+                            if turn.run_id is None and getattr(chunk, "run_id", None):
+                                turn.run_id = chunk.run_id
+                            if first_chunk is None and isinstance(getattr(chunk, "content", None), str) and chunk.content:
+                                first_chunk = perf_counter() - start
+                    if cached.storable:
+                        cached.store_run(agent.get_last_run_output())
+            except Exception as e:
+                error = repr(e)
+            finally:
+                log.add(perf_counter() - start, first_chunk, error, routed, answered_from_cache)
+
+    with ThreadPoolExecutor(max_workers=sessions) as pool:
+        list(pool.map(session, range(sessions)))
+
+
+async def run_cli_sessions(model: ScriptedModel, db_file: str, mix, sessions: int, turns: int, seed: int, log: TurnLog,
+                           fast_path: bool = True, plain_db: bool = False, memory_mode: Optional[str] = None):
+    """Async sessions sharing one agent built by agent.py on one event loop, each with its own fast-path router"""
+    import agent as cli
+    from horizon.async_client import close_async_server
+
+    agent = cli.build_agent(model=model, db=chat_db(db_file, plain_db), memory_mode=memory_mode)
+
+    async def session(index: int):
+        router = FastPathRouter({**get_router_config(), "enabled": fast_path})
+        for question in _session_questions(mix, index, turns, seed):
+            start = perf_counter()
+            first_chunk, error, routed, answered_from_cache = None, None, False, False
+            try:
+                with span("turn", "load-test"):
+                    cached = lookup_answer(question)
+                    if cached.answer is not None:
+                        router.remember(question, cached.answer)
+                        first_chunk, answered_from_cache = perf_counter() - start, True
+                        continue
+                    answer = await router.aanswer(question)
+                    if answer is not None:
+                        cached.store(answer)
+                        first_chunk, routed = perf_counter() - start, True
+                        continue
+                    async with aprefetching(question):
+                        async for chunk in agent.arun(
+                            question, stream=True, session_id=f"load-{index}", user_id=f"user-{index}", **router.llm_context()
+                        ):
+                            if first_chunk is None and isinstance(getattr(chunk, "content", None), str) and chunk.content:
+                                first_chunk = perf_counter() - start
+                    if cached.storable:
+                        cached.store_run(await asyncio.to_thread(agent.get_last_run_output, f"load-{index}"))
+            except Exception as e:
+                error = repr(e)
+            finally:
+                log.add(perf_counter() - start, first_chunk, error, routed, answered_from_cache)
+
+    try:
+        await asyncio.gather(*(session(index) for index in range(sessions)))
+    finally:
+        await close_async_server()
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Simulate concurrent chat sessions with a stub LLM and a fake Horizon")
+    parser.add_argument("--mode", choices=("streamlit", "cli"), default="streamlit",
+                        help="streamlit: sync agent per thread (app_streamlit.py); cli: async agent (agent.py)")
+    parser.add_argument("--sessions", type=int, default=10)
+    parser.add_argument("--turns", type=int, default=5, help="Questions per session")
+    parser.add_argument("--llm-latency-ms", type=float, default=300, help="Simulated provider time per model call")
+    parser.add_argument("--horizon-latency-ms", type=float, default=30)
+    parser.add_argument("--horizon-jitter-ms", type=float, default=10)
+    parser.add_argument("--horizon-rate-limit", type=int, default=0,
+                        help="Fake Horizon requests per --horizon-rate-limit-period before 429s (0: no limit)")
+    parser.add_argument("--horizon-rate-limit-period", type=float, default=3600)
+    parser.add_argument("--horizon-error-rate", type=float, default=0, help="Fraction of fake Horizon requests failing with 503")
+    parser.add_argument("--fixtures", help="JSON fixtures recorded with bench.record_fixtures (default: synthetic)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--cold-agent", action="store_true",
+                        help="streamlit mode: rebuild the database and agent on every turn instead of once per session")
+    parser.add_argument("--no-fast-path", action="store_true", help="Send every question to the agent, as with FAST_PATH_ENABLED=false")
+    parser.add_argument("--no-prefetch", action="store_true", help="Don't warm the caches before the model runs (PREFETCH_ENABLED=false)")
+    parser.add_argument("--no-answer-cache", action="store_true",
+                        help="Don't reuse answers to repeated questions (ANSWER_CACHE_ENABLED=false)")
+    parser.add_argument("--ledger-close-s", type=float, default=5,
+                        help="Seconds between ledger closes reported by the fake Horizon, which invalidate cached answers")
+    parser.add_argument("--db-shards", type=int, default=1, help="Split the chat database over N files (CHAT_DB_SHARDS)")
+    parser.add_argument("--plain-db", action="store_true",
+                        help="Use agno's SqliteDb with default journaling instead of the tuned chat database")
+    parser.add_argument("--memory-mode", choices=MEMORY_MODES,
+                        help="How user memories are extracted (default: MEMORY_MODE)")
+    parser.add_argument("--trace-memory", action="store_true", help="Also report peak Python heap (slower)")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    args = parser.parse_args(argv)
+
+    fixtures = FixtureSet.load(args.fixtures) if args.fixtures else synthetic()
+    horizon = FakeHorizon(
+        fixtures, latency_ms=args.horizon_latency_ms, jitter_ms=args.horizon_jitter_ms,
+        rate_limit=args.horizon_rate_limit, rate_limit_period=args.horizon_rate_limit_period,
+        error_rate=args.horizon_error_rate, ledger_close_s=args.ledger_close_s,
+    )
+    workdir = tempfile.mkdtemp(prefix="stellar-load-")
+    os.environ.update({
+        "STELLAR_HORIZON_URL": horizon.start(),
+        "STELLAR_IMMUTABLE_STORE_PATH": os.path.join(workdir, "store.db"),
+        "STELLAR_HISTORY_INDEX_PATH": os.path.join(workdir, "history.db"),
+        "TELEMETRY_DB_PATH": os.path.join(workdir, "traces.db"),
+        "STELLAR_LEDGER_INGESTER_ENABLED": "false",
+        "CHAT_DB_SHARDS": str(args.db_shards),
+        "PREFETCH_ENABLED": "false" if args.no_prefetch else os.getenv("PREFETCH_ENABLED", "true"),
+        "ANSWER_CACHE_ENABLED": "false" if args.no_answer_cache else os.getenv("ANSWER_CACHE_ENABLED", "true"),
+    })
+
+    mix = question_mix(fixtures)
+    model = ScriptedModel(latency_ms=args.llm_latency_ms, script=dict(mix))
+    db_file = os.path.join(workdir, "agent.db")
+    log = TurnLog()
+    monitor = SqliteMonitor()
+    monitor.install()
+    if args.trace_memory:
+        tracemalloc.start()
+    rss_before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+
+    start = perf_counter()
+    try:
+        if args.mode == "streamlit":
+            run_streamlit_sessions(
+                model, db_file, mix, args.sessions, args.turns, args.seed, log, args.cold_agent, not args.no_fast_path,
+                args.plain_db, args.memory_mode,
+            )
+        else:
+            asyncio.run(run_cli_sessions(
+                model, db_file, mix, args.sessions, args.turns, args.seed, log, not args.no_fast_path, args.plain_db,
+                args.memory_mode,
+            ))
+    finally:
+        elapsed = perf_counter() - start
+        # Background memory extraction still queued after the last answer
+        flush_start = perf_counter()
+        flush_memories()
+        memory_flush = perf_counter() - flush_start
+        monitor.uninstall()
+        horizon.stop()
+
+    rss_after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    from horizon.client import get_cache_stats, get_scheduler_stats, get_single_flight_stats
+
+    report = {
+        "mode": args.mode,
+        "sessions": args.sessions,
+        "turns": len(log.latencies),
+        "elapsed_s": round(elapsed, 2),
+        "throughput_turns_per_s": round(len(log.latencies) / elapsed, 2),
+        "turn_latency": _percentiles(log.latencies),
+        "first_chunk_latency": _percentiles(log.first_chunk),
+        # Turns answered by the router without the LLM
+        "fast_path": {"turns": len(log.fast_path), "latency": _percentiles(log.fast_path)},
+        # Turns answered from the answer cache, and its hit rate over cacheable questions
+        "answer_cache": {"turns": len(log.cached), "latency": _percentiles(log.cached), **get_answer_cache_stats()},
+        "errors": len(log.errors),
+        "horizon": {key: value for key, value in horizon.stats().items() if key != "paths"},
+        "single_flight": get_single_flight_stats(),
+        "scheduler": get_scheduler_stats(),
+        "prefetch": get_prefetch_stats(),
+        "response_cache": get_cache_stats(),
+        "sqlite": monitor.report(),
+        "memory": {**get_memory_stats(), "flush_s": round(memory_flush, 2)},
+        # Estimated size of every model request (system message, history, question and tool results)
+        "prompt_tokens": {
+            "requests": len(model.prompt_tokens),
+            "p50": int(np.percentile(model.prompt_tokens, 50)) if model.prompt_tokens else 0,
+            "p95": int(np.percentile(model.prompt_tokens, 95)) if model.prompt_tokens else 0,
+            "max": max(model.prompt_tokens, default=0),
+        },
+        # Per-turn spans: python -m telemetry.report --db <traces_db>
+        "traces_db": os.environ["TELEMETRY_DB_PATH"],
+        # ru_maxrss is in KB on Linux
+        "peak_rss_growth_mb_per_session": round((rss_after - rss_before) / 1024 / args.sessions, 2),
+    }
+    if args.trace_memory:
+        report["peak_heap_mb_per_session"] = round(tracemalloc.get_traced_memory()[1] / 2**20 / args.sessions, 2)
+        tracemalloc.stop()
+
+    print(json.dumps(report, indent=2))
+    for error in sorted(set(log.errors))[:5]:
+        print(f"error: {error}", file=sys.stderr)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(report, f, indent=2)
+    return 1 if log.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,62 @@
+import argparse
+
+from bench.fixtures import ACCOUNT_COLLECTIONS, FixtureSet
+from horizon.client import get_server
+from horizon.pager import iter_records
+
+
+def record(account_ids: list, max_records: int) -> FixtureSet:
+    """Capture the responses the tools need for ``account_ids`` from the configured Horizon"""
+    server = get_server()
+    fixtures = FixtureSet()
+    asset_codes = set()
+
+    for account_id in account_ids:
+        account = server.accounts().account_id(account_id).call()
+        account.pop("_links", None)
+        fixtures.accounts[account_id] = account
+        asset_codes.update(
+            (balance["asset_code"], balance["asset_issuer"])
+            for balance in account["balances"]
+            if "asset_code" in balance
+        )
+        fixtures.collections[account_id] = {
+            collection: [
+                {key: value for key, value in record.items() if key != "_links"}
+                for record in iter_records(
+                    getattr(server, collection)().for_account(account_id), max_records=max_records, desc=False
+                )
+            ]
+            for collection in ACCOUNT_COLLECTIONS
+        }
+        print(f"{account_id}: " + ", ".join(
+            f"{len(records)} {collection}" for collection, records in fixtures.collections[account_id].items()
+        ))
+
+    for code, issuer in sorted(asset_codes):
+        for asset in server.assets().for_code(code).for_issuer(issuer).call()["_embedded"]["records"]:
+            asset.pop("_links", None)
+            fixtures.assets.append(asset)
+
+    latest = server.ledgers().order(desc=True).limit(1).call()["_embedded"]["records"][0]
+    latest.pop("_links", None)
+    fixtures.ledgers[str(latest["sequence"])] = latest
+    fixtures.head_ledger = latest["sequence"]
+    fixtures.fee_stats = server.fee_stats().call()
+    fixtures.reindex()
+    return fixtures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record Horizon responses as fixtures for the fake Horizon")
+    parser.add_argument("--account", action="append", required=True, help="Account to record (repeatable)")
+    parser.add_argument("--max-records", type=int, default=1000, help="Records kept per account collection")
+    parser.add_argument("--out", default="horizon_fixtures.json")
+    args = parser.parse_args()
+
+    record(args.account, args.max_records).save(args.out)
+    print(f"Saved fixtures to {args.out}")
+
+
+if __name__ == "__main__":
+    main()
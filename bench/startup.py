@@ -0,0 +1,138 @@
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+from time import perf_counter
+from typing import List, Optional
+
+import numpy as np
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Scenario -> code timed in a fresh interpreter
+SCENARIOS = {
+    # CLI banner and prompt are shown after this
+    "cli_import": "import agent",
+    # First answer can start: agent, tools, stellar_sdk and the default provider loaded
+    "cli_agent_ready": "import agent; agent.get_agent()",
+    "streamlit_import": "import app_streamlit",
+    "tools_loaded": "from tools.registry import load_tools; load_tools()",
+    "provider_openai": "from config.model_config import build_model; build_model('OpenAI', 'gpt-4o-mini')",
+    "provider_google": "from config.model_config import build_model; build_model('Google', 'gemini-2.5-flash')",
+}
+
+_CHILD = """
+import sys, time, json
+start = time.perf_counter()
+exec({code!r})
+print(json.dumps({{"ms": (time.perf_counter() - start) * 1000, "modules": len(sys.modules)}}))
+"""
+
+_IMPORT_TIME = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \| ( *)(\S+)")
+
+# Relative slowdown / growth that counts as a regression against a baseline
+DEFAULT_TOLERANCE = 0.25
+
+
+def _env() -> dict:
+    # Nothing may reach the network or the real databases while timing imports
+    return {**os.environ, "STELLAR_LEDGER_INGESTER_ENABLED": "false", "TELEMETRY_ENABLED": "false"}
+
+
+def run_scenario(code: str, runs: int) -> dict:
+    """Median in-process import time and process wall time over ``runs`` fresh interpreters"""
+    import_ms, process_ms, modules = [], [], 0
+    for _ in range(runs):
+        start = perf_counter()
+        completed = subprocess.run(
+            [sys.executable, "-c", _CHILD.format(code=code)],
+            cwd=ROOT, env=_env(), capture_output=True, text=True,
+        )
+        process_ms.append((perf_counter() - start) * 1000)
+        if completed.returncode != 0:
+            return {"error": completed.stderr.strip().splitlines()[-1] if completed.stderr.strip() else "failed"}
+        measured = json.loads(completed.stdout.strip().splitlines()[-1])
+        import_ms.append(measured["ms"])
+        modules = measured["modules"]
+    return {
+        "median_ms": round(float(np.median(import_ms)), 1),
+        "min_ms": round(min(import_ms), 1),
+        "process_ms": round(float(np.median(process_ms)), 1),
+        "modules": modules,
+    }
+
+
+def slowest_imports(code: str, top: int = 10) -> List[dict]:
+    """Top-level packages by cumulative import time (python -X importtime)"""
+    completed = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code], cwd=ROOT, env=_env(), capture_output=True, text=True,
+    )
+    packages = []
+    for line in completed.stderr.splitlines():
+        match = _IMPORT_TIME.match(line)
+        # Only imports done directly by the timed code (no indentation)
+        if match and not match.group(3):
+            packages.append({"module": match.group(4), "cumulative_ms": round(int(match.group(2)) / 1000, 1)})
+    return sorted(packages, key=lambda package: package["cumulative_ms"], reverse=True)[:top]
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> List[str]:
+    """Regressions of ``results`` against a previous run's JSON report"""
+    regressions = []
+    for name, current in results.items():
+        previous = baseline.get(name)
+        if not previous or "error" in current or "error" in previous:
+            continue
+        for metric in ("median_ms", "modules"):
+            before, after = previous.get(metric), current.get(metric)
+            if before and after > before * (1 + tolerance):
+                regressions.append(f"{name}: {metric} {before} -> {after} (+{(after / before - 1) * 100:.0f}%)")
+    return regressions
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Measure cold-start import time of the CLI and web app")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per scenario")
+    parser.add_argument("--scenarios", help=f"Comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--profile", help="Also list the slowest top-level imports of this scenario")
+    parser.add_argument("--json", help="Write the report to this JSON file")
+    parser.add_argument("--baseline", help="Previous JSON report to compare against")
+    parser.add_argument("--tolerance", type=float, default=DEFAULT_TOLERANCE)
+    args = parser.parse_args(argv)
+
+    selected = args.scenarios.split(",") if args.scenarios else list(SCENARIOS)
+    results = {name: run_scenario(SCENARIOS[name], args.runs) for name in selected}
+
+    header = f"{'scenario':<20}{'import ms':>11}{'min ms':>9}{'process ms':>12}{'modules':>9}"
+    print(header)
+    print("-" * len(header))
+    for name, result in results.items():
+        if "error" in result:
+            print(f"{name:<20}  error: {result['error']}")
+        else:
+            print(f"{name:<20}{result['median_ms']:>11}{result['min_ms']:>9}{result['process_ms']:>12}{result['modules']:>9}")
+
+    if args.profile:
+        print(f"\nSlowest imports ({args.profile}):")
+        for package in slowest_imports(SCENARIOS[args.profile]):
+            print(f"  {package['module']:<40}{package['cumulative_ms']:>9} ms")
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.tolerance)
+        if regressions:
+            print("\nRegressions:")
+            for regression in regressions:
+                print(f"  {regression}")
+            return 1
+        print("\nNo regressions against baseline")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
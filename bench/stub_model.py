@@ -0,0 +1,116 @@
+import asyncio
+import json
+import time
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Dict, Iterator, List, Optional
+
+from agno.models.base import Model
+from agno.models.message import Message
+from agno.models.response import ModelResponse
+
+# Words per streamed chunk of the scripted answer
+_CHUNK_WORDS = 8
+
+
+@dataclass
+class ScriptedModel(Model):
+    """
+    Deterministic stand-in for an LLM provider.
+
+    ``script`` maps a user question to the tool calls the model should make,
+    as ``[(tool_name, arguments), ...]``. On a new question the model emits
+    those calls in one turn; once tool results are in the conversation it
+    answers with a short text that mentions each result's size. Every call
+    sleeps ``latency_ms`` to stand in for provider time, and streamed answers
+    are split into chunks like a real provider would send them. Given agno's
+    memory tools, it saves a memory of each question: through
+    update_user_memory as an agent, through add_memory as a memory manager.
+    """
+
+    id: str = "scripted"
+    name: str = "ScriptedModel"
+    provider: str = "Stub"
+    latency_ms: float = 0
+    script: Dict[str, List[tuple]] = field(default_factory=dict)
+    # Estimated tokens of every request's messages
+    prompt_tokens: List[int] = field(default_factory=list)
+
+    @staticmethod
+    def _tool_names(tools: Optional[List[Any]]) -> set:
+        return {tool["function"]["name"] for tool in tools or [] if isinstance(tool, dict) and "function" in tool}
+
+    @staticmethod
+    def _tool_calls(calls: List[tuple]) -> List[dict]:
+        return [
+            {
+                "index": i,
+                "id": f"call_{i}_{name}",
+                "type": "function",
+                "function": {"name": name, "arguments": json.dumps(arguments)},
+            }
+            for i, (name, arguments) in enumerate(calls)
+        ]
+
+    def _respond(self, messages: List[Message], tools: Optional[List[Any]] = None) -> ModelResponse:
+        self.prompt_tokens.append(sum(
+            len(m.get_content_string()) + (len(json.dumps(m.tool_calls)) if m.tool_calls else 0) for m in messages
+        ) // 4)
+        last = messages[-1]
+        tool_names = self._tool_names(tools)
+        if "add_memory" in tool_names:
+            if last.role == "tool":
+                return ModelResponse(role="assistant", content="Memórias atualizadas.")
+            questions = [m.get_content_string() for m in messages if m.role == "user"]
+            return ModelResponse(role="assistant", tool_calls=self._tool_calls(
+                [("add_memory", {"memory": f"O usuário perguntou: {question[:120]}"}) for question in questions]
+            ))
+        if last.role == "tool":
+            results = [m for m in messages[messages.index(self._last_user(messages)):] if m.role == "tool"]
+            summary = ", ".join(f"{m.tool_name}: {len(m.get_content_string())} chars" for m in results)
+            return ModelResponse(role="assistant", content=f"Resumo dos dados consultados ({summary}).")
+
+        # The question comes first; routed fast-path answers may follow as "<additional context>"
+        question = self._last_user(messages).get_content_string().split("\n\n<additional context>")[0]
+        calls = self.script.get(question, [])
+        if "update_user_memory" in tool_names:
+            calls = [("update_user_memory", {"task": f"Lembrar que o usuário perguntou: {question[:120]}"})] + calls
+        if not calls:
+            return ModelResponse(role="assistant", content="Não tenho um roteiro para essa pergunta.")
+        return ModelResponse(role="assistant", tool_calls=self._tool_calls(calls))
+
+    @staticmethod
+    def _last_user(messages: List[Message]) -> Message:
+        return next(m for m in reversed(messages) if m.role == "user")
+
+    @staticmethod
+    def _chunks(response: ModelResponse) -> Iterator[ModelResponse]:
+        if response.content is None:
+            yield response
+            return
+        words = response.content.split(" ")
+        for i in range(0, len(words), _CHUNK_WORDS):
+            yield ModelResponse(role="assistant", content=" ".join(words[i:i + _CHUNK_WORDS]) + " ")
+
+    def invoke(self, messages: List[Message], tools: Optional[List[Any]] = None, **kwargs) -> ModelResponse:
+        time.sleep(self.latency_ms / 1000)
+        return self._respond(messages, tools)
+
+    async def ainvoke(self, messages: List[Message], tools: Optional[List[Any]] = None, **kwargs) -> ModelResponse:
+        await asyncio.sleep(self.latency_ms / 1000)
+        return self._respond(messages, tools)
+
+    def invoke_stream(self, messages: List[Message], tools: Optional[List[Any]] = None, **kwargs) -> Iterator[ModelResponse]:
+        time.sleep(self.latency_ms / 1000)
+        yield from self._chunks(self._respond(messages, tools))
+
+    async def ainvoke_stream(self, messages: List[Message], tools: Optional[List[Any]] = None,
+                             **kwargs) -> AsyncIterator[ModelResponse]:
+        await asyncio.sleep(self.latency_ms / 1000)
+        for chunk in self._chunks(self._respond(messages, tools)):
+            yield chunk
+
+    def _parse_provider_response(self, response: Any, **kwargs) -> ModelResponse:
+        return response
+
+    def _parse_provider_response_delta(self, response: Any) -> ModelResponse:
+        return response
@@ -1,3 +1,70 @@
+import os
+
+
+def get_compaction_config() -> dict:
+    """Read the tool-output compaction settings from the environment"""
+    return {
+        "enabled": os.getenv("TOOL_OUTPUT_COMPACTION_ENABLED", "true").lower() in ("1", "true", "yes"),
+        # Results estimated above this many tokens are summarized before reaching the model
+        "token_budget": int(os.getenv("TOOL_OUTPUT_TOKEN_BUDGET", "2000")),
+        # Full results kept in memory so they can be paged by handle
+        "max_results": int(os.getenv("TOOL_RESULT_STORE_MAX_RESULTS", "256")),
+    }
+
+
+def get_history_config() -> dict:
+    """Read how much earlier conversation is sent with each question"""
+    return {
+        "enabled": os.getenv("HISTORY_WINDOW_ENABLED", "true").lower() in ("1", "true", "yes"),
+        # Most recent turns sent verbatim (question, tool calls and answer); older turns are summarized
+        "verbatim_turns": int(os.getenv("HISTORY_VERBATIM_TURNS", "3")),
+        # Rolling summary of older turns; the oldest lines are forgotten beyond it
+        "summary_tokens": int(os.getenv("HISTORY_SUMMARY_TOKENS", "800")),
+        # Tool results in verbatim turns above this are replaced by a reference to the call
+        "tool_result_tokens": int(os.getenv("HISTORY_TOOL_RESULT_TOKENS", "300")),
+        # Estimated prompt size per request (system message, history and question) to stay under
+        "max_context_tokens": int(os.getenv("CONTEXT_MAX_TOKENS", "16000")),
+    }
+
+
+MEMORY_MODES = ("agentic", "background", "off")
+
+
+def get_memory_config() -> dict:
+    """Read how user memories are extracted from conversations"""
+    mode = os.getenv("MEMORY_MODE", "background").strip().lower()
+    return {
+        # agentic: the model decides mid-answer (an extra tool call and LLM request in the turn);
+        # background: extracted after the answer by a worker thread; off: no memories.
+        # Anything else falls back to background
+        "mode": mode if mode in MEMORY_MODES else "background",
+        # Finished turns sent to one extraction request
+        "batch_size": int(os.getenv("MEMORY_BATCH_SIZE", "8")),
+        # Seconds the worker waits for a batch to fill before extracting what it has
+        "max_wait": float(os.getenv("MEMORY_BATCH_WAIT", "2")),
+        # Memories of a user this similar (0-1, by words) to a newer one are merged into it
+        "similarity": float(os.getenv("MEMORY_DEDUP_SIMILARITY", "0.9")),
+        # Turns waiting beyond this are dropped (their memories are not extracted)
+        "max_queued": int(os.getenv("MEMORY_QUEUE_SIZE", "1000")),
+        # Users of one batch whose memories are extracted concurrently
+        "workers": int(os.getenv("MEMORY_WORKERS", "4")),
+        # Seconds to wait at exit for queued turns to be extracted
+        "flush_timeout": float(os.getenv("MEMORY_FLUSH_TIMEOUT", "30")),
+    }
+
+
+def get_tool_execution_config() -> dict:
+    """Read how the tool calls of one model response are run"""
+    return {
+        # Run the independent tool calls of one model response concurrently
+        "parallel": os.getenv("TOOL_PARALLEL_CALLS", "true").lower() in ("1", "true", "yes"),
+        # Worker threads per model response (sync runs; async runs gather every call)
+        "max_parallel": int(os.getenv("TOOL_MAX_PARALLEL_CALLS", "4")),
+        # A call still running after this many seconds is reported to the model as an error
+        "timeout": float(os.getenv("TOOL_CALL_TIMEOUT", "120")),
+    }
+
+
 AGENT_CONFIG = {
     "name": "Stellar Assistant",
     "role": "Blockchain Assistant",
@@ -15,6 +82,10 @@ ACCOUNT QUERIES:
 - get_account_effects: Get state changes (balance changes, trustlines, etc)
 - get_account_offers: Get active orders on the DEX
 - get_account_trades: Get completed trade history on the DEX
+- get_account_overview: Get info, offers, recent trades and recent payments of an account in one call (fetched concurrently - prefer it when you need several of these)
+- get_accounts_batch: Get balances and basic info for MANY accounts in one call (use it to compare wallets instead of calling get_account_info repeatedly)
+- count_account_records: Count ALL transactions/operations/payments/effects/trades of an account (full history, optional date range and grouping)
+- get_account_history: Search the full account history with filters (date range, counterparty, asset, operation type)
 
 ASSET QUERIES:
 - get_asset_info: Get info about a specific asset by code/issuer
@@ -27,9 +98,14 @@ NETWORK QUERIES:
 - get_ledger_info: Get information about a specific or latest ledger
 - get_network_stats: Get current network statistics, fees, and status
 
+LARGE RESULTS:
+- get_tool_result_page: Page through the full rows of a compacted result by its result_handle
+
 IMPORTANT TIPS:
-- When users ask "how many transactions", use get_account_transactions and count the results
-- You can retrieve up to 200 records per query (adjust the limit parameter)
+- When users ask "how many transactions" (or payments, operations, etc), use count_account_records - it walks the whole history instead of a single page
+- You can retrieve up to 1000 records per query with the list tools (adjust the limit parameter)
+- List results (transactions, operations, payments, effects, trades, offers, balances) come as tables: a "columns" header plus "rows" of values in the same order
+- Large results are compacted to a summary (counts, totals, top values and a few sample rows) with a "result_handle"; answer from the summary when possible and call get_tool_result_page only when specific rows are needed
 - Always present information clearly and in Portuguese when responding to Portuguese questions
 - Stellar account addresses start with 'G' and are 56 characters long
 - If an account doesn't exist or there's an error, explain it clearly
@@ -0,0 +1,91 @@
+import os
+
+
+def get_horizon_config() -> dict:
+    """Read the Horizon client settings from the environment (called lazily so .env is honoured)"""
+    return {
+        "url": os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org"),
+        # Keep-alive connections shared by every tool and every Streamlit session
+        "pool_size": int(os.getenv("HORIZON_POOL_SIZE", "20")),
+        "request_timeout": int(os.getenv("HORIZON_REQUEST_TIMEOUT", "20")),
+        # Retries of 429 / 5xx / connection errors, with jittered exponential backoff
+        "num_retries": int(os.getenv("HORIZON_NUM_RETRIES", "3")),
+        "backoff_factor": float(os.getenv("HORIZON_BACKOFF_FACTOR", "0.5")),
+        "max_backoff": float(os.getenv("HORIZON_MAX_BACKOFF", "30")),
+        # Local request rate ceiling (requests/s); 0 follows Horizon's X-Ratelimit-* headers only
+        "rate_limit_rps": float(os.getenv("HORIZON_RATE_LIMIT_RPS", "0")),
+        # Share of the rate-limit bucket kept for interactive requests (prefetch / background wait)
+        "background_reserve": float(os.getenv("HORIZON_BACKGROUND_RESERVE", "0.2")),
+        # Horizon requests a single tool may run at once when fanning out
+        "max_concurrency": int(os.getenv("HORIZON_MAX_CONCURRENCY", "8")),
+        # Concurrent identical GETs (any session, sync or async) share one upstream request
+        "single_flight": os.getenv("HORIZON_SINGLE_FLIGHT_ENABLED", "true").lower() in ("1", "true", "yes"),
+    }
+
+
+def get_cache_config() -> dict:
+    """Read the Horizon response cache settings from the environment"""
+    return {
+        "enabled": os.getenv("HORIZON_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+        "max_bytes": int(os.getenv("HORIZON_CACHE_MAX_BYTES", str(32 * 1024 * 1024))),
+        "default_ttl": float(os.getenv("HORIZON_CACHE_DEFAULT_TTL", "5")),
+    }
+
+
+def get_store_config() -> dict:
+    """Read the on-disk immutable object store settings from the environment"""
+    return {
+        "enabled": os.getenv("STELLAR_IMMUTABLE_STORE_ENABLED", "true").lower() in ("1", "true", "yes"),
+        "path": os.getenv("STELLAR_IMMUTABLE_STORE_PATH", "/tmp/stellar_immutable_store.db"),
+        "max_bytes": int(os.getenv("STELLAR_IMMUTABLE_STORE_MAX_BYTES", str(256 * 1024 * 1024))),
+        # A read updates an object's access time (for eviction) only when it is older than this
+        "touch_interval": float(os.getenv("STELLAR_IMMUTABLE_STORE_TOUCH_INTERVAL", "600")),
+    }
+
+
+def get_history_config() -> dict:
+    """Read the local account-history index settings from the environment"""
+    return {
+        "enabled": os.getenv("STELLAR_HISTORY_INDEX_ENABLED", "true").lower() in ("1", "true", "yes"),
+        "path": os.getenv("STELLAR_HISTORY_INDEX_PATH", "/tmp/stellar_account_history.db"),
+        # Pages (200 records each) downloaded per sync call; the rest is picked up on the next call
+        "max_pages_per_sync": int(os.getenv("STELLAR_HISTORY_MAX_PAGES_PER_SYNC", "50")),
+        # Least recently synced account histories are dropped beyond this size
+        "max_bytes": int(os.getenv("STELLAR_HISTORY_INDEX_MAX_BYTES", str(512 * 1024 * 1024))),
+    }
+
+
+def get_ingester_config() -> dict:
+    """Read the background ledger stream settings from the environment"""
+    return {
+        "enabled": os.getenv("STELLAR_LEDGER_INGESTER_ENABLED", "true").lower() in ("1", "true", "yes"),
+        # ~1 hour of ledgers at one close every ~5-6 s
+        "buffer_size": int(os.getenv("STELLAR_LEDGER_BUFFER_SIZE", "720")),
+        # Beyond this many seconds without a new ledger the tools fall back to Horizon
+        "max_staleness": float(os.getenv("STELLAR_LEDGER_MAX_STALENESS", "30")),
+        "trend_window": int(os.getenv("STELLAR_LEDGER_TREND_WINDOW", "60")),
+        # Fee stats are re-read on a ledger close at most this often (one request per close otherwise)
+        "fee_refresh_interval": float(os.getenv("STELLAR_LEDGER_FEE_REFRESH_INTERVAL", "60")),
+        # Older fee stats are re-fetched when a question asks for them (~3 ledger closes)
+        "fee_max_age": float(os.getenv("STELLAR_LEDGER_FEE_MAX_AGE", "15")),
+    }
+
+
+# Per-endpoint cache policy: (path regex, ttl in seconds, ledger_scoped).
+# Ledger-scoped entries are also dropped as soon as a newer ledger is seen
+# in a Horizon response. Patterns are matched against the end of the URL
+# path (so a Horizon URL with a path prefix still works); first match wins.
+CACHE_TTL_RULES = [
+    # Immutable resources
+    (r"/transactions/[0-9a-fA-F]{64}$", 24 * 3600, False),
+    (r"/ledgers/\d+$", 24 * 3600, False),
+    (r"/operations/\d+$", 24 * 3600, False),
+    # Change on every ledger close (~5 s)
+    (r"/fee_stats$", 5, True),
+    (r"/ledgers$", 5, True),
+    # Account state and history only change when a ledger closes
+    (r"/accounts/[^/]+$", 30, True),
+    (r"/accounts/[^/]+/\w+$", 30, True),
+    # Asset statistics drift slowly
+    (r"/assets$", 60, False),
+]
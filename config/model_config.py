@@ -1,7 +1,25 @@
-from agno.models.openai import OpenAIChat
-from agno.models.google import Gemini
+import importlib
+
+# Provider -> (module, model class). A provider's SDK (openai, google-genai) is
+# imported only when a model of that provider is built.
+MODEL_PROVIDERS = {
+    "OpenAI": ("agno.models.openai", "OpenAIChat"),
+    "Google": ("agno.models.google", "Gemini"),
+}
 
 MODEL_CONFIG = {
-    "model": OpenAIChat("gpt-4o-mini"),
-    # "model": Gemini("gemini-2.5-flash"),
+    "provider": "OpenAI",
+    "model_id": "gpt-4o-mini",
+    # "provider": "Google",
+    # "model_id": "gemini-2.5-flash",
 }
+
+
+def build_model(provider: str = None, model_id: str = None, **kwargs):
+    """Instantiate a model (default: MODEL_CONFIG), importing only its provider's SDK"""
+    provider = provider or MODEL_CONFIG["provider"]
+    if provider not in MODEL_PROVIDERS:
+        raise ValueError(f"Provider {provider} não suportado")
+    module_name, class_name = MODEL_PROVIDERS[provider]
+    model_class = getattr(importlib.import_module(module_name), class_name)
+    return model_class(model_id or MODEL_CONFIG["model_id"], **kwargs)
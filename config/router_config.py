@@ -0,0 +1,39 @@
+import os
+
+
+def get_router_config() -> dict:
+    """Read the fast-path router settings from the environment"""
+    return {
+        # Answer simple lookups (balance of G..., transaction <hash>, ledger N, network stats)
+        # with a direct tool call and a template, without the LLM
+        "enabled": os.getenv("FAST_PATH_ENABLED", "true").lower() in ("1", "true", "yes"),
+        # Longer questions usually ask for more than one lookup and go to the LLM
+        "max_words": int(os.getenv("FAST_PATH_MAX_WORDS", "12")),
+        # Routed exchanges the agent has not seen yet, passed along with the next LLM question
+        "context_turns": int(os.getenv("FAST_PATH_CONTEXT_TURNS", "3")),
+    }
+
+
+def get_prefetch_config() -> dict:
+    """Read the speculative prefetch settings from the environment"""
+    return {
+        # Warm the Horizon caches for addresses / hashes in a question while the model is thinking
+        "enabled": os.getenv("PREFETCH_ENABLED", "true").lower() in ("1", "true", "yes"),
+        # Addresses per question to prefetch for (each costs three lookups)
+        "max_accounts": int(os.getenv("PREFETCH_MAX_ACCOUNTS", "2")),
+        # Worker threads for the sync (Streamlit) prefetcher
+        "workers": int(os.getenv("PREFETCH_WORKERS", "4")),
+    }
+
+
+def get_answer_cache_config() -> dict:
+    """Read the settings of the cache of whole answers to repeated questions"""
+    return {
+        # Reuse the answer to a self-contained question asked again before a new ledger closes
+        "enabled": os.getenv("ANSWER_CACHE_ENABLED", "true").lower() in ("1", "true", "yes"),
+        "max_entries": int(os.getenv("ANSWER_CACHE_MAX_ENTRIES", "1024")),
+        # Upper bound on an answer's age, for when no newer ledger is being observed
+        "max_age": float(os.getenv("ANSWER_CACHE_MAX_AGE", "30")),
+        # Longer questions are rarely asked twice word for word
+        "max_words": int(os.getenv("ANSWER_CACHE_MAX_WORDS", "20")),
+    }
@@ -0,0 +1,19 @@
+import os
+
+
+def get_storage_config() -> dict:
+    """Read the chat database (agent sessions and memories) settings from the environment"""
+    return {
+        "path": os.getenv("CHAT_DB_PATH", "/tmp/onchain_researcher.db"),
+        # Split the database over this many files (<path stem>.shardN.db) so concurrent
+        # conversations don't queue behind one writer; 1 keeps a single file
+        "shards": int(os.getenv("CHAT_DB_SHARDS", "1")),
+        # Sessions not updated for this many days are deleted at startup; 0 (default) keeps them
+        "retention_days": float(os.getenv("CHAT_RETENTION_DAYS", "0")),
+        # Runs kept per session (the agent only reads the last few into its context); 0 (default) keeps all
+        "max_runs_per_session": int(os.getenv("CHAT_MAX_RUNS_PER_SESSION", "0")),
+        # How long a writer waits for another connection's write lock
+        "busy_timeout_ms": int(os.getenv("CHAT_DB_BUSY_TIMEOUT_MS", "5000")),
+        # Page cache per connection
+        "cache_size_mb": int(os.getenv("CHAT_DB_CACHE_MB", "16")),
+    }
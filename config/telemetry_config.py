@@ -0,0 +1,17 @@
+import os
+
+
+def get_telemetry_config() -> dict:
+    """Read the tracing / metrics settings from the environment"""
+    return {
+        "enabled": os.getenv("TELEMETRY_ENABLED", "true").lower() in ("1", "true", "yes"),
+        # SQLite trace table; empty disables it
+        "db_path": os.getenv("TELEMETRY_DB_PATH", "/tmp/stellar_traces.db"),
+        # Prometheus text exposition, rewritten every flush; empty disables it
+        "prometheus_file": os.getenv("TELEMETRY_PROMETHEUS_FILE", ""),
+        # Serve /metrics on this port; 0 disables it
+        "prometheus_port": int(os.getenv("TELEMETRY_PROMETHEUS_PORT", "0")),
+        "flush_interval": float(os.getenv("TELEMETRY_FLUSH_INTERVAL", "1.0")),
+        # Spans older than this are deleted from the trace table at startup
+        "retention_days": float(os.getenv("TELEMETRY_RETENTION_DAYS", "7")),
+    }
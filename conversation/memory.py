@@ -0,0 +1,254 @@
+import atexit
+import logging
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from difflib import SequenceMatcher
+from typing import Any, List, Optional
+
+from config.agent_config import MEMORY_MODES, get_memory_config
+from telemetry.spans import span
+
+logger = logging.getLogger(__name__)
+
+_worker: Optional["MemoryWorker"] = None
+_worker_lock = threading.Lock()
+_WORDS = re.compile(r"\w+")
+
+
+def _words(text: str) -> List[str]:
+    return _WORDS.findall(text.lower())
+
+
+def similarity(a: List[str], b: List[str]) -> float:
+    """How alike two texts' word lists are, from 0 to 1 (an address or amount counts as one word)"""
+    return 1.0 if a == b else SequenceMatcher(None, a, b, autojunk=False).ratio()
+
+
+@dataclass
+class FinishedTurn:
+    """A user's question whose answer is out, waiting for memory extraction"""
+
+    question: str
+    user_id: Optional[str]
+    agent_id: Optional[str]
+    model: Any
+    db: Any
+
+
+class MemoryWorker:
+    """
+    Extracts user memories from finished turns on a background thread, so
+    the answer never waits for the extra LLM request.
+
+    Turns are queued once their answer has streamed. The worker takes up to
+    ``batch_size`` of them (waiting at most ``max_wait`` seconds for a batch
+    to fill), groups them by user, model and database, skips questions
+    repeated within the group and extracts each group's memories with one
+    request, up to ``workers`` groups at a time. An identified user's
+    memories are then de-duplicated: one that reads at least ``similarity``
+    alike to a newer one is deleted. Beyond ``max_queued`` waiting turns
+    new ones are dropped rather than letting the queue grow. ``flush()`` waits for everything queued; it runs at
+    interpreter exit, bounded by ``flush_timeout``.
+    """
+
+    def __init__(self, batch_size: int = 8, max_wait: float = 2.0, similarity: float = 0.9, max_queued: int = 1000,
+                 workers: int = 4, flush_timeout: float = 30.0):
+        self.batch_size = max(batch_size, 1)
+        self.max_wait = max_wait
+        self.similarity = similarity
+        self.max_queued = max_queued
+        self.workers = max(workers, 1)
+        self.flush_timeout = flush_timeout
+        self._queue: deque = deque()
+        self._cond = threading.Condition()
+        # Turns queued or being extracted
+        self._pending = 0
+        self._flushing = 0
+        self._closed = False
+        self._thread: Optional[threading.Thread] = None
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._counters = {"queued": 0, "dropped": 0, "duplicates": 0, "batches": 0, "requests": 0, "merged": 0,
+                          "failed": 0}
+
+    def submit(self, turn: FinishedTurn) -> bool:
+        """Queue a finished turn; False when it was dropped (queue full or worker closed)"""
+        with self._cond:
+            if self._closed or len(self._queue) >= self.max_queued:
+                self._counters["dropped"] += 1
+                return False
+            self._queue.append(turn)
+            self._pending += 1
+            self._counters["queued"] += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._loop, name="memory-worker", daemon=True)
+                self._thread.start()
+                atexit.register(self.close)
+            self._cond.notify_all()
+        return True
+
+    def _next_batch(self) -> List[FinishedTurn]:
+        with self._cond:
+            while not self._queue and not self._closed:
+                self._cond.wait()
+            # A flush or close extracts what is queued without waiting for a full batch
+            deadline = time.monotonic() + self.max_wait
+            while len(self._queue) < self.batch_size and not (self._closed or self._flushing):
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+            return [self._queue.popleft() for _ in range(min(self.batch_size, len(self._queue)))]
+
+    def _loop(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if not batch:
+                return
+            try:
+                self._extract(batch)
+            finally:
+                with self._cond:
+                    self._pending -= len(batch)
+                    self._cond.notify_all()
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._cond:
+            self._counters[name] += amount
+
+    def _extract(self, batch: List[FinishedTurn]) -> None:
+        groups = defaultdict(list)
+        for turn in batch:
+            groups[(turn.user_id, id(turn.model), id(turn.db))].append(turn)
+        self._count("batches")
+        if len(groups) == 1 or self.workers == 1:
+            for turns in groups.values():
+                self._extract_group(turns)
+            return
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="memory-extract")
+        list(self._executor.map(self._extract_group, groups.values()))
+
+    def _extract_group(self, turns: List[FinishedTurn]) -> None:
+        """One extraction request for the questions of one user"""
+        from agno.memory import MemoryManager
+        from agno.models.message import Message
+
+        first = turns[0]
+        questions = list({" ".join(_words(turn.question)): turn.question for turn in turns}.values())
+        self._count("duplicates", len(turns) - len(questions))
+        try:
+            with span("memory", "extract", questions=len(questions)):
+                MemoryManager(model=first.model, db=first.db).create_user_memories(
+                    messages=[Message(role="user", content=question) for question in questions],
+                    user_id=first.user_id,
+                    agent_id=first.agent_id,
+                )
+                self._count("requests")
+                # Without a user id agno files every conversation's memories under "default";
+                # merging those would mix different people's memories
+                if first.user_id is not None:
+                    self._count("merged", self._merge_similar(first.db, first.user_id))
+        except Exception as e:
+            self._count("failed", len(turns))
+            logger.warning(f"Memory extraction failed for {len(turns)} turns: {e!r}")
+
+    def _merge_similar(self, db, user_id: str) -> int:
+        """Delete the user's memories that nearly repeat a newer one; returns how many"""
+        memories = db.get_user_memories(user_id=user_id, sort_by="updated_at", sort_order="desc") or []
+        kept: List[List[str]] = []
+        duplicates = []
+        for memory in memories:
+            words = _words(memory.memory or "")
+            if any(similarity(words, other) >= self.similarity for other in kept):
+                duplicates.append(memory.memory_id)
+            else:
+                kept.append(words)
+        if duplicates:
+            db.delete_user_memories(duplicates, user_id=user_id)
+        return len(duplicates)
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """Wait until every queued turn is extracted; False if ``timeout`` seconds passed first"""
+        deadline = None if timeout is None else time.monotonic() + timeout
+        with self._cond:
+            self._flushing += 1
+            self._cond.notify_all()
+            try:
+                while self._pending:
+                    remaining = None if deadline is None else deadline - time.monotonic()
+                    if remaining is not None and remaining <= 0:
+                        return False
+                    self._cond.wait(remaining)
+                return True
+            finally:
+                self._flushing -= 1
+
+    def close(self, timeout: Optional[float] = None) -> bool:
+        """Stop taking turns and wait (up to ``timeout``, default ``flush_timeout``) for the queued ones"""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        flushed = self.flush(self.flush_timeout if timeout is None else timeout)
+        if not flushed:
+            logger.warning(f"{self._pending} turns still waiting for memory extraction at shutdown")
+        return flushed
+
+    def stats(self) -> dict:
+        with self._cond:
+            return {**self._counters, "pending": self._pending}
+
+
+def get_memory_worker() -> MemoryWorker:
+    """Return the process-wide memory worker"""
+    global _worker
+    if _worker is None:
+        with _worker_lock:
+            if _worker is None:
+                config = get_memory_config()
+                _worker = MemoryWorker(
+                    batch_size=config["batch_size"],
+                    max_wait=config["max_wait"],
+                    similarity=config["similarity"],
+                    max_queued=config["max_queued"],
+                    workers=config["workers"],
+                    flush_timeout=config["flush_timeout"],
+                )
+    return _worker
+
+
+def get_memory_stats() -> dict:
+    return _worker.stats() if _worker is not None else {}
+
+
+def flush_memories(timeout: Optional[float] = None) -> bool:
+    """Wait for queued memory extraction, if any was started"""
+    return _worker.flush(timeout) if _worker is not None else True
+
+
+def queue_memory_extraction(run_output, agent, user_id: Optional[str] = None) -> None:
+    """agno post-hook: queue the turn's question for background memory extraction"""
+    if run_output.input is None or agent.db is None:
+        return
+    question = run_output.input.input_content_string()
+    if question.strip():
+        get_memory_worker().submit(FinishedTurn(question, user_id, agent.id, agent.model, agent.db))
+
+
+def memory_options(mode: Optional[str] = None) -> dict:
+    """
+    Agent arguments for a memory mode (default MEMORY_MODE). In background
+    mode the agent reads the user's memories into its context but leaves
+    extraction to the worker, fed by a post-hook after the answer.
+    """
+    mode = mode or get_memory_config()["mode"]
+    if mode not in MEMORY_MODES:
+        raise ValueError(f"Unknown memory mode {mode!r}; expected one of {', '.join(MEMORY_MODES)}")
+    if mode == "agentic":
+        return {"enable_agentic_memory": True}
+    if mode == "background":
+        return {"add_memories_to_context": True, "post_hooks": [queue_memory_extraction]}
+    return {}
@@ -0,0 +1,218 @@
+import json
+import re
+from copy import deepcopy
+from types import MethodType
+from typing import Any, List, Optional
+
+from agno.models.message import Message
+from agno.run.base import RunStatus
+
+from config.agent_config import get_history_config
+from telemetry.spans import current_span
+from tools.compaction import estimate_tokens
+
+_RESULT_HANDLE = re.compile(r"""result_handle['"]?\s*[:=]\s*['"]([0-9a-f]{12})""")
+_SKIPPED_STATUS = (RunStatus.paused, RunStatus.cancelled, RunStatus.error)
+# Context appended to a question (e.g. the router's routed answers) by agno's dependencies
+_ADDITIONAL_CONTEXT = "\n\n<additional context>"
+# Rolling summary state, kept in the session's session_data
+_STATE_KEY = "history_window"
+# Ids of folded turns remembered, enough to cover every run a session keeps
+_FOLDED_IDS_KEPT = 256
+
+QUESTION_CHARS = 200
+ANSWER_CHARS = 300
+ARGUMENT_CHARS = 64
+
+
+def message_tokens(message: Message) -> int:
+    tokens = estimate_tokens(message.content) if message.content is not None else 0
+    if message.tool_calls:
+        tokens += estimate_tokens(message.tool_calls)
+    return tokens
+
+
+def _text(content: Any) -> str:
+    return content if isinstance(content, str) else json.dumps(content, default=str)
+
+
+def _clip(text: str, limit: int) -> str:
+    text = " ".join(text.split())
+    return text if len(text) <= limit else text[:limit] + "…"
+
+
+def _own_messages(run) -> List[Message]:
+    """A turn's own messages, without the history and system prompt it was sent with"""
+    return [message for message in run.messages or [] if not message.from_history and message.role != "system"]
+
+
+def _call_text(call: dict) -> str:
+    function = call.get("function") or {}
+    try:
+        arguments = json.loads(function.get("arguments") or "{}")
+    except (TypeError, ValueError):
+        arguments = {}
+    if not isinstance(arguments, dict):
+        arguments = {}
+    return f"{function.get('name')}({', '.join(f'{key}={_clip(_text(value), ARGUMENT_CHARS)}' for key, value in arguments.items())})"
+
+
+def digest(run) -> str:
+    """One summary line for a turn: its question, the tools it called (with result handles) and the start of the answer"""
+    messages = _own_messages(run)
+    question = next((_text(message.content) for message in messages if message.role == "user"), "")
+    handles = {
+        message.tool_call_id: match.group(1)
+        for message in messages
+        if message.role == "tool" and message.content is not None and (match := _RESULT_HANDLE.search(_text(message.content)))
+    }
+    calls = [
+        _call_text(call) + (f" [result_handle {handles[call.get('id')]}]" if call.get("id") in handles else "")
+        for message in messages
+        for call in message.tool_calls or []
+    ]
+    answer = next(
+        (_text(message.content) for message in reversed(messages) if message.role == "assistant" and message.content), ""
+    )
+    parts = [f"Q: {_clip(question.split(_ADDITIONAL_CONTEXT)[0], QUESTION_CHARS)}"]
+    if calls:
+        parts.append("tools: " + "; ".join(calls))
+    if answer:
+        parts.append(f"A: {_clip(answer, ANSWER_CHARS)}")
+    return "- " + " | ".join(parts)
+
+
+class HistoryWindow:
+    """
+    Bounded conversation history for an agent, in place of agno's "last N
+    runs verbatim" (which also repeats an old copy of the system prompt).
+
+    The last ``verbatim_turns`` turns are sent as they happened, except that
+    tool results above ``tool_result_tokens`` are replaced by a reference:
+    the tool, its arguments and the result_handle when the result was
+    compacted, so the model can call it again or page the stored rows.
+    Older turns are folded into a rolling summary, one line per turn kept
+    in the session (so it outlives the runs the database prunes), and the
+    oldest lines are forgotten beyond ``summary_tokens``. If the request
+    still estimates above ``max_context_tokens``, the oldest verbatim turns
+    are summarized too, then the oldest summary lines dropped. The summary
+    is built without a model call, so long sessions cost no extra requests.
+    """
+
+    def __init__(self, verbatim_turns: int = 3, summary_tokens: int = 800, tool_result_tokens: int = 300,
+                 max_context_tokens: int = 16000):
+        self.verbatim_turns = verbatim_turns
+        self.summary_tokens = summary_tokens
+        self.tool_result_tokens = tool_result_tokens
+        self.max_context_tokens = max_context_tokens
+
+    @staticmethod
+    def _turns(session, current_run_id: Optional[str]) -> list:
+        return [
+            run for run in session.runs or []
+            if run.parent_run_id is None and run.status not in _SKIPPED_STATUS and run.run_id != current_run_id and run.messages
+        ]
+
+    def _fold(self, session, older_turns: list) -> dict:
+        """Add turns that left the verbatim window to the session's rolling summary"""
+        if session.session_data is None:
+            session.session_data = {}
+        state = session.session_data.setdefault(_STATE_KEY, {"lines": [], "folded": [], "forgotten": 0})
+        folded = set(state["folded"])
+        for run in older_turns:
+            if run.run_id not in folded:
+                state["lines"].append(digest(run))
+                state["folded"].append(run.run_id)
+        del state["folded"][:-_FOLDED_IDS_KEPT]
+        while state["lines"] and estimate_tokens(state["lines"]) > self.summary_tokens:
+            state["lines"].pop(0)
+            state["forgotten"] += 1
+        return state
+
+    def _history_message(self, message: Message) -> Message:
+        copy = deepcopy(message)
+        copy.from_history = True
+        if message.role == "tool" and message.content is not None:
+            tokens = message_tokens(message)
+            if tokens > self.tool_result_tokens:
+                reference = {"omitted_from_history": True, "tool": message.tool_name, "arguments": message.tool_args,
+                             "tokens": tokens}
+                match = _RESULT_HANDLE.search(_text(message.content))
+                if match:
+                    reference["result_handle"] = match.group(1)
+                reference["note"] = (
+                    "Shown in an earlier turn; call the tool again (or get_tool_result_page with the result_handle)"
+                    " if its data is needed"
+                )
+                copy.content = json.dumps(reference, default=str)
+        return copy
+
+    def apply(self, run_messages, session, current_run_id: Optional[str] = None) -> None:
+        """Add the window's history to ``run_messages`` (built without history), before the question"""
+        turns = self._turns(session, current_run_id)
+        verbatim = turns[max(len(turns) - self.verbatim_turns, 0):] if self.verbatim_turns > 0 else []
+        state = self._fold(session, turns[:len(turns) - len(verbatim)])
+        lines, forgotten = list(state["lines"]), state["forgotten"]
+        history = [[self._history_message(message) for message in _own_messages(run)] for run in verbatim]
+        history_tokens = [sum(message_tokens(message) for message in turn) for turn in history]
+        fixed_tokens = sum(message_tokens(message) for message in run_messages.messages)
+
+        def total() -> int:
+            return fixed_tokens + sum(history_tokens) + (estimate_tokens(lines) if lines else 0)
+
+        # Over the ceiling: summarize the oldest verbatim turns too, then forget the oldest summary lines
+        while history and total() > self.max_context_tokens:
+            lines.append(digest(verbatim[len(verbatim) - len(history)]))
+            history.pop(0)
+            history_tokens.pop(0)
+        while lines and total() > self.max_context_tokens:
+            lines.pop(0)
+            forgotten += 1
+
+        if lines:
+            header = "Summary of earlier turns in this conversation, oldest first"
+            if forgotten:
+                header += f" ({forgotten} earlier turns not shown)"
+            summary = f"<earlier_conversation>\n{header}:\n" + "\n".join(lines) + "\n</earlier_conversation>"
+            if run_messages.system_message is not None:
+                run_messages.system_message.content = f"{run_messages.system_message.content}\n\n{summary}"
+            else:
+                run_messages.messages.insert(0, Message(role="system", content=summary))
+        # History goes after the system and extra messages, right before the question
+        position = sum(1 for message in run_messages.messages if message.role == "system")
+        position += len(run_messages.extra_messages or [])
+        run_messages.messages[position:position] = [message for turn in history for message in turn]
+
+        turn_span = current_span()
+        if turn_span is not None:
+            turn_span.set(history_turns=len(history), summarized_turns=len(lines), context_tokens=total())
+
+
+def with_history_window(agent, window: Optional[HistoryWindow] = None):
+    """Make ``agent`` (in place) send its history through a HistoryWindow; returns it"""
+    config = get_history_config()
+    if not config["enabled"] or "_get_run_messages" in vars(agent):
+        return agent
+    window = window or HistoryWindow(
+        verbatim_turns=config["verbatim_turns"],
+        summary_tokens=config["summary_tokens"],
+        tool_result_tokens=config["tool_result_tokens"],
+        max_context_tokens=config["max_context_tokens"],
+    )
+    build, abuild = agent._get_run_messages, agent._aget_run_messages
+
+    def get_run_messages(self, *, run_response, session, add_history_to_context=None, **kwargs):
+        run_messages = build(run_response=run_response, session=session, add_history_to_context=False, **kwargs)
+        if add_history_to_context:
+            window.apply(run_messages, session, run_response.run_id)
+        return run_messages
+
+    async def aget_run_messages(self, *, run_response, session, add_history_to_context=None, **kwargs):
+        run_messages = await abuild(run_response=run_response, session=session, add_history_to_context=False, **kwargs)
+        if add_history_to_context:
+            window.apply(run_messages, session, run_response.run_id)
+        return run_messages
+
+    agent._get_run_messages = MethodType(get_run_messages, agent)
+    agent._aget_run_messages = MethodType(aget_run_messages, agent)
+    return agent
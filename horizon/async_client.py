@@ -0,0 +1,131 @@
+import asyncio
+import itertools
+import threading
+import time
+import weakref
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from stellar_sdk import ServerAsync
+from stellar_sdk.client.aiohttp_client import AiohttpClient
+from stellar_sdk.client.response import Response
+from stellar_sdk.exceptions import ConnectionError
+
+from config.horizon_config import get_horizon_config
+from horizon.cache import ResponseCache, cache_bypassed, get_response_cache, latest_ledger_of
+from horizon.client import RequestStats, annotate_request_span, annotate_scheduling, flight_key, status_and_headers
+from horizon.scheduler import RequestScheduler, get_scheduler
+from horizon.singleflight import SingleFlight, get_single_flight
+from telemetry.spans import endpoint_of, span
+
+# One ServerAsync (and so one aiohttp session) per event loop: aiohttp sessions
+# can't be shared across loops, but every coroutine on a loop reuses its pool.
+_servers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, ServerAsync]" = weakref.WeakKeyDictionary()
+_servers_lock = threading.Lock()
+
+
+class PooledAiohttpClient(AiohttpClient):
+    """
+    AiohttpClient backed by the same response cache, request coalescing,
+    request scheduler and counters as the sync client, so sync and async
+    tools share cached and in-flight Horizon responses and one rate limit.
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        flights: Optional[SingleFlight] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.cache = cache
+        self.flights = flights
+        self.scheduler = scheduler or RequestScheduler()
+        self.stats = RequestStats()
+
+    async def get(self, url: str, params: Optional[Dict[str, str]] = None) -> Response:
+        with span("horizon", endpoint_of(urlparse(url).path)) as request_span:
+            use_cache = self.cache is not None and not cache_bypassed()
+            if use_cache:
+                cached = self.cache.get(url, params)
+                if cached is not None:
+                    annotate_request_span(request_span, cached, "hit")
+                    return cached
+
+            if self.flights is not None:
+                response, shared = await self.flights.ado(flight_key(url, params), lambda: self._fetch_and_store(url, params, use_cache))
+            else:
+                response, shared = await self._fetch_and_store(url, params, use_cache), False
+            outcome = "miss" if use_cache else "bypass" if self.cache is not None else "off"
+            annotate_request_span(request_span, response, "coalesced" if shared else outcome)
+            return response
+
+    async def _fetch_and_store(self, url: str, params: Optional[Dict[str, str]], use_cache: bool) -> Response:
+        response = await self._fetch(url, params)
+        if self.cache is not None:
+            if use_cache and response.status_code == 200:
+                self.cache.put(url, params, response)
+            else:
+                self.cache.observe_ledger(latest_ledger_of(response))
+        return response
+
+    async def _fetch(self, url: str, params: Optional[Dict[str, str]] = None) -> Response:
+        queued = 0.0
+        for attempt in itertools.count():
+            queued += await self.scheduler.aacquire()
+            self.stats.started()
+            start = time.perf_counter()
+            response, error = None, None
+            try:
+                response = await super().get(url, params)
+            except ConnectionError as e:
+                error = e
+            finally:
+                self.stats.finished(response, time.perf_counter() - start)
+            delay = self.scheduler.backoff(attempt, *status_and_headers(response))
+            if delay is None:
+                annotate_scheduling(queued, attempt)
+                if error is not None:
+                    raise error
+                return response
+            await asyncio.sleep(delay)
+
+    def pool_stats(self) -> dict:
+        return {"pool_size": self.pool_size, **self.stats.snapshot()}
+
+
+def get_async_server() -> ServerAsync:
+    """Return the Horizon ServerAsync shared by every coroutine of the running event loop"""
+    loop = asyncio.get_running_loop()
+    server = _servers.get(loop)
+    if server is None:
+        with _servers_lock:
+            server = _servers.get(loop)
+            if server is None:
+                config = get_horizon_config()
+                client = PooledAiohttpClient(
+                    cache=get_response_cache(),
+                    flights=get_single_flight(),
+                    scheduler=get_scheduler(),
+                    pool_size=config["pool_size"],
+                    request_timeout=config["request_timeout"],
+                    backoff_factor=config["backoff_factor"],
+                )
+                server = ServerAsync(config["url"], client=client)
+                _servers[loop] = server
+    return server
+
+
+def get_async_pool_stats() -> dict:
+    """Usage counters of the async Horizon client of the running event loop"""
+    server = _servers.get(asyncio.get_running_loop())
+    return server._client.pool_stats() if server is not None else {}
+
+
+async def close_async_server() -> None:
+    """Close the aiohttp session of the running event loop"""
+    with _servers_lock:
+        server = _servers.pop(asyncio.get_running_loop(), None)
+    if server is not None:
+        await server.close()
@@ -0,0 +1,185 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional, Tuple
+from urllib.parse import urlparse
+
+from stellar_sdk.client.response import Response
+
+from config.horizon_config import CACHE_TTL_RULES, get_cache_config
+
+# Rough per-entry bookkeeping overhead added to the body size
+_ENTRY_OVERHEAD = 256
+
+_cache: Optional["ResponseCache"] = None
+_cache_lock = threading.Lock()
+
+# Set while running requests that should neither read nor fill the cache
+_bypass: ContextVar[bool] = ContextVar("horizon_cache_bypass", default=False)
+
+
+@contextmanager
+def bypass_cache():
+    """Run the enclosed Horizon requests without touching the response cache (e.g. deep pagination)"""
+    token = _bypass.set(True)
+    try:
+        yield
+    finally:
+        _bypass.reset(token)
+
+
+def cache_bypassed() -> bool:
+    return _bypass.get()
+
+
+def get_header(headers: dict, name: str) -> Optional[str]:
+    """Case-insensitive header lookup on the plain dict kept by stellar_sdk Responses"""
+    name = name.lower()
+    for key, value in headers.items():
+        if key.lower() == name:
+            return value
+    return None
+
+
+def latest_ledger_of(response: Response) -> Optional[int]:
+    """Ledger sequence Horizon reported as latest when serving the response"""
+    value = get_header(response.headers or {}, "Latest-Ledger")
+    try:
+        return int(value) if value is not None else None
+    except ValueError:
+        return None
+
+
+class _Entry:
+    __slots__ = ("response", "expires_at", "ledger", "ledger_scoped", "size")
+
+    def __init__(self, response: Response, expires_at: float, ledger: Optional[int], ledger_scoped: bool):
+        self.response = response
+        self.expires_at = expires_at
+        self.ledger = ledger
+        self.ledger_scoped = ledger_scoped
+        self.size = len(response.text) + _ENTRY_OVERHEAD
+
+
+class ResponseCache:
+    """
+    In-memory LRU cache of Horizon GET responses keyed by endpoint and params.
+
+    Each entry expires after the TTL of its endpoint rule. Ledger-scoped
+    entries additionally become stale once a newer ledger has been observed
+    (from the ``Latest-Ledger`` header of any response, or pushed in via
+    ``observe_ledger``). Total size is bounded by ``max_bytes``.
+    """
+
+    def __init__(self, max_bytes: int, default_ttl: float = 5, rules=CACHE_TTL_RULES):
+        self.max_bytes = max_bytes
+        self.default_ttl = default_ttl
+        self._rules = [(re.compile(pattern), ttl, ledger_scoped) for pattern, ttl, ledger_scoped in rules]
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._bytes = 0
+        self._latest_ledger: Optional[int] = None
+        self._stats = {"hits": 0, "misses": 0, "expired": 0, "evictions": 0, "stores": 0}
+
+    @staticmethod
+    def make_key(url: str, params: Optional[Dict[str, str]] = None) -> Tuple:
+        return (url, tuple(sorted((str(k), str(v)) for k, v in (params or {}).items())))
+
+    def policy_for(self, url: str) -> Tuple[float, bool]:
+        """(ttl, ledger_scoped) for the endpoint behind a URL"""
+        path = urlparse(url).path.rstrip("/")
+        for pattern, ttl, ledger_scoped in self._rules:
+            if pattern.search(path):
+                return ttl, ledger_scoped
+        return self.default_ttl, True
+
+    @property
+    def latest_ledger(self) -> Optional[int]:
+        return self._latest_ledger
+
+    def observe_ledger(self, sequence: Optional[int]) -> None:
+        """Record that a ledger closed; older ledger-scoped entries become stale"""
+        if sequence is None:
+            return
+        with self._lock:
+            if self._latest_ledger is None or sequence > self._latest_ledger:
+                self._latest_ledger = sequence
+
+    def get(self, url: str, params: Optional[Dict[str, str]] = None) -> Optional[Response]:
+        key = self.make_key(url, params)
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            stale_ledger = (
+                entry.ledger_scoped
+                and entry.ledger is not None
+                and self._latest_ledger is not None
+                and entry.ledger < self._latest_ledger
+            )
+            if now >= entry.expires_at or stale_ledger:
+                self._remove(key)
+                self._stats["expired"] += 1
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry.response
+
+    def put(self, url: str, params: Optional[Dict[str, str]], response: Response) -> None:
+        ttl, ledger_scoped = self.policy_for(url)
+        if ttl <= 0:
+            return
+        ledger = latest_ledger_of(response)
+        self.observe_ledger(ledger)
+        entry = _Entry(response, time.monotonic() + ttl, ledger or self._latest_ledger, ledger_scoped)
+        if entry.size > self.max_bytes:
+            return
+
+        key = self.make_key(url, params)
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            self._stats["stores"] += 1
+            while self._bytes > self.max_bytes and self._entries:
+                oldest = next(iter(self._entries))
+                self._remove(oldest)
+                self._stats["evictions"] += 1
+
+    def _remove(self, key: Tuple) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(entries=len(self._entries), bytes=self._bytes, max_bytes=self.max_bytes)
+            stats["latest_ledger"] = self._latest_ledger
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+def get_response_cache() -> Optional[ResponseCache]:
+    """Return the process-wide response cache, or None when caching is disabled"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = get_cache_config()
+                if not config["enabled"]:
+                    return None
+                _cache = ResponseCache(max_bytes=config["max_bytes"], default_ttl=config["default_ttl"])
+    return _cache
@@ -0,0 +1,247 @@
+import itertools
+import threading
+import time
+from typing import Dict, Optional
+from urllib.parse import urlparse
+
+from stellar_sdk import Server
+from stellar_sdk.client.requests_client import RequestsClient
+from stellar_sdk.client.response import Response
+from stellar_sdk.exceptions import ConnectionError
+
+from config.horizon_config import get_horizon_config
+from horizon.cache import ResponseCache, cache_bypassed, get_response_cache, latest_ledger_of
+from horizon.scheduler import RequestScheduler, get_scheduler
+from horizon.singleflight import SingleFlight, get_single_flight
+from telemetry.spans import Span, current_span, endpoint_of, span
+
+_server: Optional[Server] = None
+_server_lock = threading.Lock()
+
+
+class RequestStats:
+    """Thread-safe request counters shared by the sync and async Horizon clients"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._counters = {
+            "requests": 0,
+            "errors": 0,
+            "bytes_received": 0,
+            "peak_in_flight": 0,
+            "total_time": 0.0,
+        }
+
+    def started(self) -> None:
+        with self._lock:
+            self._in_flight += 1
+            self._counters["requests"] += 1
+            self._counters["peak_in_flight"] = max(self._counters["peak_in_flight"], self._in_flight)
+
+    def finished(self, response: Optional[Response], elapsed: float) -> None:
+        with self._lock:
+            self._in_flight -= 1
+            self._counters["total_time"] += elapsed
+            if response is None or response.status_code >= 400:
+                self._counters["errors"] += 1
+            if response is not None:
+                self._counters["bytes_received"] += len(response.text)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            in_flight = self._in_flight
+        requests_made = counters["requests"]
+        return {
+            "requests": requests_made,
+            "errors": counters["errors"],
+            "in_flight": in_flight,
+            "peak_in_flight": counters["peak_in_flight"],
+            "bytes_received": counters["bytes_received"],
+            "avg_latency_ms": round(counters["total_time"] / requests_made * 1000, 2) if requests_made else 0.0,
+        }
+
+
+def flight_key(url: str, params: Optional[Dict[str, str]]) -> tuple:
+    """Identity of a GET for request coalescing"""
+    return url, tuple(sorted((params or {}).items()))
+
+
+def annotate_request_span(request_span: Span, response: Response, cache: str) -> None:
+    """
+    Record status, size and cache outcome on a Horizon span: "hit", "miss",
+    "bypass", "off", or "coalesced" (shared another caller's in-flight request)
+    """
+    request_span.set(status=response.status_code, bytes=len(response.text), cache=cache)
+    if response.status_code >= 400:
+        request_span.error = f"HTTP {response.status_code}"
+
+
+def status_and_headers(response: Optional[Response]) -> tuple:
+    """(status, headers) of an attempt for RequestScheduler.backoff; (None, None) for a connection error"""
+    return (response.status_code, response.headers) if response is not None else (None, None)
+
+
+def annotate_scheduling(queued: float, retries: int) -> None:
+    """Record rate-limit queueing and retries on the current Horizon span"""
+    request_span = current_span()
+    if request_span is not None and (queued or retries):
+        request_span.set(queued_ms=round(queued * 1000, 1), retries=retries)
+
+
+class PooledRequestsClient(RequestsClient):
+    """
+    RequestsClient shared by the whole process.
+
+    The underlying requests.Session keeps keep-alive connections in an urllib3
+    pool (thread-safe for concurrent GETs), so tools running in different
+    Streamlit sessions reuse warm connections instead of opening a new
+    TLS session per call. Usage counters are kept for monitoring.
+
+    When a ResponseCache is given, successful GETs are served from it while
+    still fresh, and every response feeds its ``Latest-Ledger`` header to it.
+    With a SingleFlight, a cache miss identical to a request already in
+    flight (from any thread or event loop) waits for that request instead
+    of sending its own. Requests that do go out are admitted, and retried on
+    429 / 5xx, by the RequestScheduler (urllib3's own retries are turned off).
+    """
+
+    def __init__(
+        self,
+        cache: Optional[ResponseCache] = None,
+        flights: Optional[SingleFlight] = None,
+        scheduler: Optional[RequestScheduler] = None,
+        **kwargs,
+    ):
+        super().__init__(**{**kwargs, "num_retries": 0})
+        self.cache = cache
+        self.flights = flights
+        self.scheduler = scheduler or RequestScheduler()
+        self.stats = RequestStats()
+
+    def get(self, url: str, params: Optional[Dict[str, str]] = None) -> Response:
+        with span("horizon", endpoint_of(urlparse(url).path)) as request_span:
+            use_cache = self.cache is not None and not cache_bypassed()
+            if use_cache:
+                cached = self.cache.get(url, params)
+                if cached is not None:
+                    annotate_request_span(request_span, cached, "hit")
+                    return cached
+
+            if self.flights is not None:
+                response, shared = self.flights.do(flight_key(url, params), lambda: self._fetch_and_store(url, params, use_cache))
+            else:
+                response, shared = self._fetch_and_store(url, params, use_cache), False
+            outcome = "miss" if use_cache else "bypass" if self.cache is not None else "off"
+            annotate_request_span(request_span, response, "coalesced" if shared else outcome)
+            return response
+
+    def _fetch_and_store(self, url: str, params: Optional[Dict[str, str]], use_cache: bool) -> Response:
+        response = self._fetch(url, params)
+        if self.cache is not None:
+            if use_cache and response.status_code == 200:
+                self.cache.put(url, params, response)
+            else:
+                self.cache.observe_ledger(latest_ledger_of(response))
+        return response
+
+    def _fetch(self, url: str, params: Optional[Dict[str, str]] = None) -> Response:
+        queued = 0.0
+        for attempt in itertools.count():
+            queued += self.scheduler.acquire()
+            self.stats.started()
+            start = time.perf_counter()
+            response, error = None, None
+            try:
+                response = super().get(url, params)
+            except ConnectionError as e:
+                error = e
+            finally:
+                self.stats.finished(response, time.perf_counter() - start)
+            delay = self.scheduler.backoff(attempt, *status_and_headers(response))
+            if delay is None:
+                annotate_scheduling(queued, attempt)
+                if error is not None:
+                    raise error
+                return response
+            time.sleep(delay)
+
+    def pool_stats(self) -> dict:
+        """Snapshot of request counters and urllib3 connection pool usage"""
+        connections_opened = 0
+        idle_connections = 0
+        # The same adapter is mounted for http:// and https://
+        adapters = {id(adapter): adapter for adapter in self._session.adapters.values()}
+        for adapter in adapters.values():
+            pools = adapter.poolmanager.pools
+            for key in pools.keys():
+                pool = pools.get(key)
+                if pool is None:
+                    continue
+                connections_opened += pool.num_connections
+                if pool.pool is not None:
+                    # urllib3 pre-fills the queue with None placeholders
+                    idle_connections += sum(1 for conn in list(pool.pool.queue) if conn is not None)
+
+        stats = self.stats.snapshot()
+        requests_made = stats["requests"]
+        return {
+            "pool_size": self.pool_size,
+            **stats,
+            "connections_opened": connections_opened,
+            "idle_connections": idle_connections,
+            "connection_reuse_ratio": round(1 - connections_opened / requests_made, 3) if requests_made else 0.0,
+        }
+
+
+def get_server() -> Server:
+    """Return the process-wide Horizon server, creating it on first use"""
+    global _server
+    if _server is None:
+        with _server_lock:
+            if _server is None:
+                config = get_horizon_config()
+                client = PooledRequestsClient(
+                    cache=get_response_cache(),
+                    flights=get_single_flight(),
+                    scheduler=get_scheduler(),
+                    pool_size=config["pool_size"],
+                    request_timeout=config["request_timeout"],
+                    backoff_factor=config["backoff_factor"],
+                )
+                _server = Server(config["url"], client=client)
+    return _server
+
+
+def get_pool_stats() -> dict:
+    """Usage counters of the shared Horizon connection pool"""
+    if _server is None:
+        return {}
+    return _server._client.pool_stats()
+
+
+def get_cache_stats() -> dict:
+    """Hit/miss counters of the shared response cache"""
+    cache = get_response_cache()
+    return cache.stats() if cache is not None else {}
+
+
+def get_single_flight_stats() -> dict:
+    """Upstream calls vs. requests that shared another caller's in-flight call"""
+    flights = get_single_flight()
+    return flights.stats() if flights is not None else {}
+
+
+def get_scheduler_stats() -> dict:
+    """Rate-limit bucket, queue depth per priority and retry counters"""
+    return get_scheduler().stats()
+
+
+def close_server() -> None:
+    """Close the shared pool (the next get_server() call builds a fresh one)"""
+    global _server
+    with _server_lock:
+        if _server is not None:
+            _server.close()
+            _server = None
@@ -0,0 +1,52 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Awaitable, Callable, List, Optional, Sequence
+
+from config.horizon_config import get_horizon_config
+
+
+def _default_limit() -> int:
+    return get_horizon_config()["max_concurrency"]
+
+
+async def gather_limited(
+    *aws: Awaitable,
+    limit: Optional[int] = None,
+    return_exceptions: bool = True,
+) -> List[Any]:
+    """
+    Await many Horizon requests at once with at most ``limit`` in flight.
+
+    Results keep the order of the inputs; with ``return_exceptions`` a failed
+    request yields its exception instead of cancelling the others.
+    """
+    semaphore = asyncio.Semaphore(limit or _default_limit())
+
+    async def run(aw: Awaitable) -> Any:
+        async with semaphore:
+            return await aw
+
+    return await asyncio.gather(*(run(aw) for aw in aws), return_exceptions=return_exceptions)
+
+
+def run_limited(
+    funcs: Sequence[Callable[[], Any]],
+    limit: Optional[int] = None,
+    return_exceptions: bool = True,
+) -> List[Any]:
+    """Thread-pool counterpart of ``gather_limited`` for sync tools (order preserved)"""
+    if not funcs:
+        return []
+    results: List[Any] = []
+    with ThreadPoolExecutor(max_workers=min(limit or _default_limit(), len(funcs))) as pool:
+        # Each worker runs in a copy of the caller's context (cache bypass, priorities...)
+        futures = [pool.submit(contextvars.copy_context().run, func) for func in funcs]
+        for future in futures:
+            try:
+                results.append(future.result())
+            except Exception as e:
+                if not return_exceptions:
+                    raise
+                results.append(e)
+    return results
@@ -0,0 +1,461 @@
+import json
+import logging
+import re
+import sqlite3
+import threading
+import time
+from decimal import Decimal, InvalidOperation
+from typing import Any, Dict, List, Optional
+
+from config.horizon_config import get_history_config
+from horizon.client import get_server
+from horizon.pager import PAGE_SIZE, DateLike, iter_records, parse_time, record_ledger
+from horizon.scheduler import Priority, request_priority
+
+logger = logging.getLogger(__name__)
+
+RECORD_KINDS = ("transactions", "operations", "payments", "effects", "trades")
+
+_index: Optional["AccountHistoryIndex"] = None
+_index_lock = threading.Lock()
+
+_FIELD_RE = re.compile(r"^\w+$")
+
+# Fraction of max_bytes kept after an eviction pass, so we don't evict on every sync
+_EVICT_TARGET = 0.9
+
+# Fields that may hold the other side of an operation/payment, in order of preference
+_COUNTERPARTY_FIELDS = ("to", "from", "funder", "account", "into", "trustor", "trustee", "source_account")
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS records (
+    account_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    toid INTEGER NOT NULL,
+    idx INTEGER NOT NULL,
+    paging_token TEXT NOT NULL,
+    ledger INTEGER,
+    created_at TEXT,
+    type TEXT,
+    counterparty TEXT,
+    asset TEXT,
+    amount TEXT,
+    successful INTEGER,
+    body TEXT NOT NULL,
+    PRIMARY KEY (account_id, kind, toid, idx)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_records_ledger ON records (account_id, kind, ledger);
+CREATE INDEX IF NOT EXISTS idx_records_time ON records (account_id, kind, created_at);
+CREATE INDEX IF NOT EXISTS idx_records_type ON records (account_id, kind, type);
+CREATE INDEX IF NOT EXISTS idx_records_counterparty ON records (account_id, kind, counterparty);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    account_id TEXT NOT NULL,
+    kind TEXT NOT NULL,
+    cursor TEXT,
+    synced_at REAL,
+    complete INTEGER NOT NULL DEFAULT 0,
+    PRIMARY KEY (account_id, kind)
+);
+"""
+
+
+def _asset_of(record: Dict[str, Any], prefix: str = "") -> Optional[str]:
+    asset_type = record.get(f"{prefix}asset_type")
+    if asset_type is None:
+        return None
+    return "XLM" if asset_type == "native" else record.get(f"{prefix}asset_code")
+
+
+def _split_token(token: str):
+    toid, _, idx = str(token).partition("-")
+    return int(toid), int(idx or 0)
+
+
+def _listed(row: tuple) -> dict:
+    """A record as ``query`` lists it, from its indexed columns"""
+    return {
+        "paging_token": row[0],
+        "ledger": row[1],
+        "created_at": row[2],
+        "type": row[3],
+        "counterparty": row[4],
+        "asset": row[5],
+        "amount": row[6],
+        "successful": None if row[7] is None else bool(row[7]),
+        "transaction_hash": row[8],
+    }
+
+
+def _index_row(account_id: str, kind: str, record: Dict[str, Any]) -> tuple:
+    """Flatten a Horizon record into the indexed columns (the full record is kept as JSON)"""
+    counterparty = None
+    amount = record.get("amount")
+    asset = _asset_of(record)
+    record_type = record.get("type")
+
+    if kind == "transactions":
+        counterparty = record.get("source_account")
+        amount = record.get("fee_charged")
+    elif kind == "trades":
+        record_type = record.get("trade_type", "orderbook")
+        is_base = record.get("base_account") == account_id
+        counterparty = record.get("counter_account") if is_base else record.get("base_account")
+        amount = record.get("base_amount") if is_base else record.get("counter_amount")
+        asset = _asset_of(record, "base_" if is_base else "counter_")
+    elif kind in ("operations", "payments"):
+        for field in _COUNTERPARTY_FIELDS:
+            value = record.get(field)
+            if value and value != account_id:
+                counterparty = value
+                break
+        amount = amount or record.get("starting_balance")
+
+    toid, idx = _split_token(record["paging_token"])
+    successful = record.get("successful", record.get("transaction_successful"))
+    body = json.dumps({k: v for k, v in record.items() if k != "_links"}, separators=(",", ":"))
+    return (
+        account_id,
+        kind,
+        toid,
+        idx,
+        str(record["paging_token"]),
+        record_ledger(record),
+        record.get("created_at") or record.get("ledger_close_time"),
+        record_type,
+        counterparty,
+        asset,
+        amount,
+        None if successful is None else int(bool(successful)),
+        body,
+    )
+
+
+class AccountHistoryIndex:
+    """
+    Local SQLite copy of account histories (transactions, operations, payments,
+    effects and trades).
+
+    Each (account, kind) keeps a checkpoint with the last ``paging_token``
+    downloaded; ``sync`` walks Horizon oldest-first from that cursor, so later
+    calls only fetch records newer than what is already stored. Counts, ranges
+    and filters are then answered with indexed SQL instead of pagination.
+    Beyond ``max_bytes`` of records, the least recently synced histories are
+    dropped whole.
+    """
+
+    def __init__(self, path: str, max_pages_per_sync: int = 50, max_bytes: int = 512 * 1024 * 1024):
+        self.path = path
+        self.max_pages_per_sync = max_pages_per_sync
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._sync_locks: Dict[tuple, threading.Lock] = {}
+        self._backfilling: set = set()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._size = self._conn.execute("SELECT COALESCE(SUM(LENGTH(body)), 0) FROM records").fetchone()[0]
+
+    def _sync_lock(self, account_id: str, kind: str) -> threading.Lock:
+        with self._lock:
+            return self._sync_locks.setdefault((account_id, kind), threading.Lock())
+
+    def checkpoint(self, account_id: str, kind: str) -> Optional[dict]:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT cursor, synced_at, complete FROM checkpoints WHERE account_id = ? AND kind = ?",
+                (account_id, kind),
+            ).fetchone()
+        if row is None:
+            return None
+        return {"cursor": row[0], "synced_at": row[1], "complete": bool(row[2])}
+
+    def sync(self, account_id: str, kind: str, max_pages: Optional[int] = None) -> dict:
+        """
+        Download records newer than the checkpoint (at most ``max_pages`` pages).
+
+        Returns the number of new records and whether the index reached the
+        current head of the account history.
+        """
+        if kind not in RECORD_KINDS:
+            raise ValueError(f"Unknown record kind '{kind}'")
+        max_pages = max_pages or self.max_pages_per_sync
+
+        # Concurrent sessions asking about the same account wait for one download
+        with self._sync_lock(account_id, kind):
+            checkpoint = self.checkpoint(account_id, kind)
+            builder = getattr(get_server(), kind)().for_account(account_id)
+            if checkpoint and checkpoint["cursor"]:
+                builder = builder.cursor(checkpoint["cursor"])
+
+            budget = max_pages * PAGE_SIZE
+            batch: List[tuple] = []
+            fetched = new_records = 0
+            cursor = checkpoint["cursor"] if checkpoint else None
+            for record in iter_records(builder, max_records=budget, desc=False):
+                fetched += 1
+                batch.append(_index_row(account_id, kind, record))
+                cursor = str(record["paging_token"])
+                if len(batch) >= PAGE_SIZE:
+                    new_records += self._write(account_id, kind, batch, cursor, complete=False)
+                    batch = []
+            complete = fetched < budget
+            new_records += self._write(account_id, kind, batch, cursor, complete=complete)
+
+        return {"new_records": new_records, "complete": complete, "cursor": cursor}
+
+    def catch_up(self, account_id: str, kind: str) -> bool:
+        """
+        True once the index holds the whole history of (account, kind), after
+        downloading what is newer than the checkpoint. A history not fully
+        downloaded yet isn't waited for: a background sync continues it and
+        False comes back right away, so the caller can ask Horizon directly.
+        """
+        checkpoint = self.checkpoint(account_id, kind)
+        if checkpoint is not None and checkpoint["complete"] and self.sync(account_id, kind)["complete"]:
+            return True
+        self.backfill(account_id, kind)
+        return False
+
+    def backfill(self, account_id: str, kind: str) -> None:
+        """Run one ``sync`` of (account, kind) on a background thread, unless one is already running"""
+        key = (account_id, kind)
+        with self._lock:
+            if key in self._backfilling:
+                return
+            self._backfilling.add(key)
+
+        def run():
+            try:
+                with request_priority(Priority.BACKGROUND):
+                    self.sync(account_id, kind)
+            except Exception as e:
+                logger.warning(f"History backfill of {kind} for {account_id} failed: {e!r}")
+            finally:
+                with self._lock:
+                    self._backfilling.discard(key)
+
+        threading.Thread(target=run, name="history-backfill", daemon=True).start()
+
+    def _write(self, account_id: str, kind: str, rows: List[tuple], cursor: Optional[str], complete: bool) -> int:
+        with self._lock:
+            inserted = 0
+            for row in rows:
+                if self._conn.execute(
+                    "INSERT OR IGNORE INTO records VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)", row
+                ).rowcount:
+                    inserted += 1
+                    self._size += len(row[-1])
+            self._conn.execute(
+                "INSERT OR REPLACE INTO checkpoints (account_id, kind, cursor, synced_at, complete) VALUES (?, ?, ?, ?, ?)",
+                (account_id, kind, cursor, time.time(), int(complete)),
+            )
+            if self._size > self.max_bytes:
+                self._evict(account_id, kind)
+            self._conn.commit()
+        return inserted
+
+    def _evict(self, account_id: str, kind: str) -> None:
+        """
+        Drop whole histories, least recently synced first, until the index is
+        back under its target size. A history is never cut short (its
+        checkpoint would skip the deleted records), and the one being synced
+        is kept.
+        """
+        target = self.max_bytes * _EVICT_TARGET
+        victims = self._conn.execute(
+            "SELECT account_id, kind FROM checkpoints WHERE NOT (account_id = ? AND kind = ?) ORDER BY synced_at",
+            (account_id, kind),
+        ).fetchall()
+        for victim in victims:
+            if self._size <= target:
+                break
+            self._size -= self._conn.execute(
+                "SELECT COALESCE(SUM(LENGTH(body)), 0) FROM records WHERE account_id = ? AND kind = ?", victim
+            ).fetchone()[0]
+            self._conn.execute("DELETE FROM records WHERE account_id = ? AND kind = ?", victim)
+            self._conn.execute("DELETE FROM checkpoints WHERE account_id = ? AND kind = ?", victim)
+
+    @staticmethod
+    def _where(
+        account_id: str,
+        kind: str,
+        since: DateLike = None,
+        until: DateLike = None,
+        min_ledger: Optional[int] = None,
+        max_ledger: Optional[int] = None,
+        record_type: Optional[str] = None,
+        counterparty: Optional[str] = None,
+        asset: Optional[str] = None,
+    ):
+        clauses = ["account_id = ?", "kind = ?"]
+        params: List[Any] = [account_id, kind]
+        # Horizon timestamps are ISO-8601 UTC strings, so they compare lexicographically
+        if since:
+            clauses.append("created_at >= ?")
+            params.append(parse_time(since).strftime("%Y-%m-%dT%H:%M:%SZ"))
+        if until:
+            clauses.append("created_at <= ?")
+            params.append(parse_time(until).strftime("%Y-%m-%dT%H:%M:%SZ"))
+        if min_ledger is not None:
+            clauses.append("ledger >= ?")
+            params.append(min_ledger)
+        if max_ledger is not None:
+            clauses.append("ledger <= ?")
+            params.append(max_ledger)
+        if record_type:
+            clauses.append("type = ?")
+            params.append(record_type)
+        if counterparty:
+            clauses.append("counterparty = ?")
+            params.append(counterparty)
+        if asset:
+            clauses.append("asset = ?")
+            params.append(asset)
+        return " AND ".join(clauses), params
+
+    def summarize(
+        self,
+        account_id: str,
+        kind: str,
+        group_by: Optional[str] = None,
+        sum_field: Optional[str] = None,
+        top: int = 20,
+        **filters,
+    ) -> dict:
+        """Count, time/ledger span and optional grouping/sum of the matching records"""
+        where, params = self._where(account_id, kind, **filters)
+        with self._lock:
+            count, first_at, last_at, min_ledger, max_ledger = self._conn.execute(
+                f"SELECT COUNT(*), MIN(created_at), MAX(created_at), MIN(ledger), MAX(ledger) FROM records WHERE {where}",
+                params,
+            ).fetchone()
+            result = {
+                "count": count,
+                "first_at": first_at,
+                "last_at": last_at,
+                "min_ledger": min_ledger,
+                "max_ledger": max_ledger,
+            }
+            if group_by:
+                if not _FIELD_RE.match(group_by):
+                    raise ValueError(f"Invalid group_by field '{group_by}'")
+                rows = self._conn.execute(
+                    f"SELECT json_extract(body, ?) AS value, COUNT(*) AS n FROM records WHERE {where} "
+                    f"GROUP BY value ORDER BY n DESC",
+                    [f"$.{group_by}", *params],
+                ).fetchall()
+                result["group_by"] = group_by
+                result["groups"] = {str(value if value is not None else "N/A"): n for value, n in rows[:top]}
+                result["distinct_groups"] = len(rows)
+            if sum_field:
+                if not _FIELD_RE.match(sum_field):
+                    raise ValueError(f"Invalid sum_field '{sum_field}'")
+                values = self._conn.execute(
+                    f"SELECT json_extract(body, ?) AS value FROM records WHERE {where} AND value IS NOT NULL",
+                    [f"$.{sum_field}", *params],
+                ).fetchall()
+                # Amounts are decimal strings with 7 places; summing them as REAL would round
+                total = Decimal(0)
+                for (value,) in values:
+                    try:
+                        total += Decimal(str(value))
+                    except InvalidOperation:
+                        pass
+                result["sum_field"] = sum_field
+                result["sum"] = str(total)
+        return result
+
+    def query(
+        self,
+        account_id: str,
+        kind: str,
+        limit: int = 20,
+        offset: int = 0,
+        desc: bool = True,
+        raw: bool = False,
+        **filters,
+    ) -> List[dict]:
+        """Matching records, newest first by default (indexed columns only unless ``raw``)"""
+        where, params = self._where(account_id, kind, **filters)
+        order = "DESC" if desc else "ASC"
+        columns = "body" if raw else (
+            "paging_token, ledger, created_at, type, counterparty, asset, amount, successful, "
+            "COALESCE(json_extract(body, '$.transaction_hash'), json_extract(body, '$.hash'))"
+        )
+        with self._lock:
+            rows = self._conn.execute(
+                f"SELECT {columns} FROM records WHERE {where} ORDER BY toid {order}, idx {order} LIMIT ? OFFSET ?",
+                [*params, limit, offset],
+            ).fetchall()
+        if raw:
+            return [json.loads(body) for (body,) in rows]
+        return [_listed(row) for row in rows]
+
+    def clear(self) -> None:
+        """Forget every indexed record and checkpoint (the next sync starts from scratch)"""
+        with self._lock:
+            self._conn.execute("DELETE FROM records")
+            self._conn.execute("DELETE FROM checkpoints")
+            self._conn.commit()
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def scan_history(
+    account_id: str,
+    kind: str,
+    limit: int = 20,
+    offset: int = 0,
+    max_records: int = 10_000,
+    since: DateLike = None,
+    until: DateLike = None,
+    record_type: Optional[str] = None,
+    counterparty: Optional[str] = None,
+    asset: Optional[str] = None,
+) -> dict:
+    """
+    ``summarize`` and ``query`` answered straight from Horizon, newest first,
+    for a history the index doesn't hold in full yet. At most
+    ``max_records`` records are read ("truncated" tells when that cut the
+    scan short, making the count a lower bound).
+    """
+    builder = getattr(get_server(), kind)().for_account(account_id)
+    records: List[dict] = []
+    count = scanned = 0
+    first_at = last_at = None
+    for record in iter_records(builder, max_records=max_records, since=since, until=until):
+        scanned += 1
+        row = _index_row(account_id, kind, record)
+        if (record_type and row[7] != record_type) or (counterparty and row[8] != counterparty) or (
+            asset and row[9] != asset
+        ):
+            continue
+        if offset <= count < offset + limit:
+            records.append(_listed((*row[4:12], record.get("transaction_hash") or record.get("hash"))))
+        count += 1
+        last_at = last_at or row[6]
+        first_at = row[6]
+    return {
+        "count": count,
+        "first_at": first_at,
+        "last_at": last_at,
+        "records": records,
+        "truncated": scanned >= max_records,
+    }
+
+
+def get_history_index() -> Optional[AccountHistoryIndex]:
+    """Return the process-wide account-history index, or None when it is disabled"""
+    global _index
+    if _index is None:
+        with _index_lock:
+            if _index is None:
+                config = get_history_config()
+                if not config["enabled"]:
+                    return None
+                _index = AccountHistoryIndex(config["path"], config["max_pages_per_sync"], config["max_bytes"])
+    return _index
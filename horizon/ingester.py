@@ -0,0 +1,230 @@
+import logging
+import random
+import threading
+import time
+from collections import deque
+from typing import Optional
+
+from config.horizon_config import get_ingester_config
+from horizon.cache import get_response_cache
+from horizon.client import get_server
+from horizon.pager import PAGE_SIZE, parse_time
+from horizon.scheduler import Priority, request_priority
+from horizon.store import remember_immutable
+
+logger = logging.getLogger(__name__)
+
+_ingester: Optional["LedgerIngester"] = None
+_ingester_lock = threading.Lock()
+
+# Reconnect backoff bounds (seconds)
+_MIN_BACKOFF = 1.0
+_MAX_BACKOFF = 60.0
+
+
+class LedgerIngester:
+    """
+    Background follower of Horizon's ledger SSE stream.
+
+    Keeps the most recent ledgers in a fixed-size ring buffer together with
+    fee statistics, refreshed on a ledger close at most every
+    ``fee_refresh_interval`` seconds, so network questions are answered from
+    memory. Fee stats older than ``fee_max_age`` seconds don't count as
+    current (``fees_fresh``); callers fetch new ones and ``record_fee_stats``
+    them. The stream is resumed from the last ``paging_token`` after any
+    disconnect, with jittered exponential backoff.
+    """
+
+    def __init__(self, buffer_size: int = 720, max_staleness: float = 30, trend_window: int = 60,
+                 fee_refresh_interval: float = 60, fee_max_age: float = 15):
+        self.max_staleness = max_staleness
+        self.trend_window = trend_window
+        self.fee_refresh_interval = fee_refresh_interval
+        self.fee_max_age = fee_max_age
+        self._ledgers: deque = deque(maxlen=buffer_size)
+        # (ledger sequence, fee_charged p50, fee_charged p95, ledger_capacity_usage)
+        self._fees: deque = deque(maxlen=buffer_size)
+        self._fee_stats: Optional[dict] = None
+        self._fees_refreshed_at: Optional[float] = None
+        self._cursor: Optional[str] = None
+        self._received_at = 0.0
+        self._reconnects = 0
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="ledger-ingester", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Ask the worker to exit (it notices on the next ledger close)"""
+        self._stop.set()
+
+    def _seed(self) -> None:
+        """Fill the buffer with the latest ledgers so trends are available right away"""
+        server = get_server()
+        page = server.ledgers().order(desc=True).limit(min(self._ledgers.maxlen, PAGE_SIZE)).call()
+        records = list(reversed(page["_embedded"]["records"]))
+        with self._lock:
+            self._ledgers.extend(records)
+            if records:
+                self._cursor = records[-1]["paging_token"]
+                self._received_at = time.monotonic()
+        if records:
+            _observe_ledger(records[-1]["sequence"])
+            self._refresh_fees(records[-1]["sequence"])
+
+    def _run(self) -> None:
+        # Stream reconnects, seeding and fee refreshes must not delay interactive tool calls
+        with request_priority(Priority.BACKGROUND):
+            backoff = _MIN_BACKOFF
+            while not self._stop.is_set():
+                try:
+                    if self._cursor is None:
+                        self._seed()
+                    builder = get_server().ledgers().cursor(self._cursor or "now")
+                    for ledger in builder.stream():
+                        self._on_ledger(ledger)
+                        backoff = _MIN_BACKOFF
+                        if self._stop.is_set():
+                            return
+                except Exception as e:
+                    with self._lock:
+                        self._reconnects += 1
+                    delay = backoff * random.uniform(0.5, 1.5)
+                    logger.warning(f"Ledger stream interrupted ({e!r}), reconnecting in {delay:.1f}s from cursor {self._cursor}")
+                    self._stop.wait(delay)
+                    backoff = min(backoff * 2, _MAX_BACKOFF)
+
+    def _on_ledger(self, ledger: dict) -> None:
+        with self._lock:
+            if self._ledgers and ledger["sequence"] <= self._ledgers[-1]["sequence"]:
+                return
+            self._ledgers.append(ledger)
+            self._cursor = ledger["paging_token"]
+            self._received_at = time.monotonic()
+        _observe_ledger(ledger["sequence"])
+        remember_immutable("ledger", {ledger["sequence"]: ledger})
+        if self._fees_refreshed_at is None or time.monotonic() - self._fees_refreshed_at >= self.fee_refresh_interval:
+            self._refresh_fees(ledger["sequence"])
+
+    def _refresh_fees(self, sequence: int) -> None:
+        try:
+            fee_stats = get_server().fee_stats().call()
+        except Exception as e:
+            logger.warning(f"Could not refresh fee stats: {e!r}")
+            return
+        self.record_fee_stats(fee_stats, sequence)
+
+    def record_fee_stats(self, fee_stats: dict, sequence: Optional[int] = None) -> None:
+        """Keep fee stats fetched after ledger ``sequence`` closed (default: the latest buffered one)"""
+        with self._lock:
+            if sequence is None:
+                if not self._ledgers:
+                    return
+                sequence = self._ledgers[-1]["sequence"]
+            self._fee_stats = fee_stats
+            self._fees_refreshed_at = time.monotonic()
+            self._fees.append((
+                sequence,
+                int(fee_stats["fee_charged"]["p50"]),
+                int(fee_stats["fee_charged"]["p95"]),
+                float(fee_stats.get("ledger_capacity_usage") or 0),
+            ))
+
+    def is_fresh(self) -> bool:
+        """True when the buffer holds a ledger received recently enough to trust"""
+        with self._lock:
+            return bool(self._ledgers) and self._fee_stats is not None and (
+                time.monotonic() - self._received_at <= self.max_staleness
+            )
+
+    def latest(self) -> Optional[dict]:
+        with self._lock:
+            return self._ledgers[-1] if self._ledgers else None
+
+    def fee_stats(self) -> Optional[dict]:
+        with self._lock:
+            return self._fee_stats
+
+    def fee_stats_age(self) -> Optional[float]:
+        """Seconds since the fee stats were fetched"""
+        with self._lock:
+            refreshed_at = self._fees_refreshed_at
+        return None if refreshed_at is None else time.monotonic() - refreshed_at
+
+    def fees_fresh(self) -> bool:
+        """True when the fee stats are recent enough to present as the current ones"""
+        age = self.fee_stats_age()
+        return age is not None and age <= self.fee_max_age
+
+    def trends(self, window: Optional[int] = None) -> dict:
+        """Short-window network activity computed from the buffered ledgers"""
+        window = window or self.trend_window
+        with self._lock:
+            ledgers = list(self._ledgers)[-window:]
+            fees = [fee for fee in self._fees if ledgers and fee[0] >= ledgers[0]["sequence"]]
+            reconnects = self._reconnects
+        if len(ledgers) < 2:
+            return {"ledgers": len(ledgers)}
+
+        span = (parse_time(ledgers[-1]["closed_at"]) - parse_time(ledgers[0]["closed_at"])).total_seconds()
+        # The first ledger only marks the start of the window
+        counted = ledgers[1:]
+        successful = sum(ledger.get("successful_transaction_count", 0) for ledger in counted)
+        failed = sum(ledger.get("failed_transaction_count", 0) for ledger in counted)
+        operations = sum(ledger.get("operation_count", 0) for ledger in counted)
+        total = successful + failed
+
+        trends = {
+            "ledgers": len(ledgers),
+            "from_ledger": ledgers[0]["sequence"],
+            "to_ledger": ledgers[-1]["sequence"],
+            "window_seconds": span,
+            "avg_close_time_seconds": round(span / len(counted), 2) if counted else None,
+            "tps": round(total / span, 2) if span else None,
+            "ops_per_second": round(operations / span, 2) if span else None,
+            "successful_transactions": successful,
+            "failed_transactions": failed,
+            "failed_transaction_rate": round(failed / total, 4) if total else 0.0,
+            "stream_reconnects": reconnects,
+        }
+        if fees:
+            p50 = [fee[1] for fee in fees]
+            p95 = [fee[2] for fee in fees]
+            usage = [fee[3] for fee in fees]
+            trends["fee_charged_p50"] = {"min": min(p50), "avg": round(sum(p50) / len(p50), 1), "max": max(p50)}
+            trends["fee_charged_p95"] = {"min": min(p95), "avg": round(sum(p95) / len(p95), 1), "max": max(p95)}
+            trends["avg_ledger_capacity_usage"] = round(sum(usage) / len(usage), 3)
+        return trends
+
+
+def _observe_ledger(sequence: int) -> None:
+    """Let the response cache know a ledger closed so ledger-scoped entries expire now"""
+    cache = get_response_cache()
+    if cache is not None:
+        cache.observe_ledger(int(sequence))
+
+
+def get_ledger_ingester() -> Optional[LedgerIngester]:
+    """Return the process-wide ledger ingester, starting it on first use (None when disabled)"""
+    global _ingester
+    if _ingester is None:
+        with _ingester_lock:
+            if _ingester is None:
+                config = get_ingester_config()
+                if not config["enabled"]:
+                    return None
+                _ingester = LedgerIngester(
+                    buffer_size=config["buffer_size"],
+                    max_staleness=config["max_staleness"],
+                    trend_window=config["trend_window"],
+                    fee_refresh_interval=config["fee_refresh_interval"],
+                    fee_max_age=config["fee_max_age"],
+                )
+                _ingester.start()
+    return _ingester
@@ -0,0 +1,233 @@
+from collections import Counter
+from datetime import datetime, timezone
+from decimal import Decimal, InvalidOperation
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Union
+
+from horizon.cache import bypass_cache
+
+# Horizon's maximum page size
+PAGE_SIZE = 200
+
+# Upper bound of records a single list tool may return to the model
+MAX_RECORDS_PER_CALL = 1000
+
+DateLike = Union[str, datetime, None]
+
+
+def parse_time(value: DateLike) -> Optional[datetime]:
+    """Parse an ISO-8601 date/time (Horizon format or user supplied) into an aware datetime"""
+    if value is None or value == "":
+        return None
+    if isinstance(value, datetime):
+        parsed = value
+    else:
+        parsed = datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+
+def record_time(record: Dict[str, Any]) -> Optional[datetime]:
+    """Close time of a Horizon record (``created_at``, or ``ledger_close_time`` for trades)"""
+    return parse_time(record.get("created_at") or record.get("ledger_close_time"))
+
+
+def record_ledger(record: Dict[str, Any]) -> Optional[int]:
+    """
+    Ledger sequence of a Horizon record. Transactions carry it explicitly; for
+    operations, payments, effects and trades it is encoded in the paging token
+    (a TOID whose upper 32 bits are the ledger sequence).
+    """
+    if "ledger" in record:
+        return int(record["ledger"])
+    token = str(record.get("paging_token", ""))
+    try:
+        return int(token.split("-")[0]) >> 32
+    except ValueError:
+        return None
+
+
+_YIELD, _SKIP, _STOP = "yield", "skip", "stop"
+
+
+def _classify(
+    record: Dict[str, Any],
+    desc: bool,
+    since: Optional[datetime],
+    until: Optional[datetime],
+    min_ledger: Optional[int],
+    max_ledger: Optional[int],
+) -> str:
+    """Decide whether a record is in range, outside it, or past the end of the walk"""
+    if since or until:
+        closed_at = record_time(record)
+        if closed_at is not None:
+            if (desc and since and closed_at < since) or (not desc and until and closed_at > until):
+                return _STOP
+            if (since and closed_at < since) or (until and closed_at > until):
+                return _SKIP
+    if min_ledger is not None or max_ledger is not None:
+        ledger = record_ledger(record)
+        if ledger is not None:
+            if (desc and min_ledger is not None and ledger < min_ledger) or (
+                not desc and max_ledger is not None and ledger > max_ledger
+            ):
+                return _STOP
+            if (min_ledger is not None and ledger < min_ledger) or (max_ledger is not None and ledger > max_ledger):
+                return _SKIP
+    return _YIELD
+
+
+def iter_records(
+    builder,
+    max_records: Optional[int] = None,
+    since: DateLike = None,
+    until: DateLike = None,
+    min_ledger: Optional[int] = None,
+    max_ledger: Optional[int] = None,
+    desc: bool = True,
+    page_size: int = PAGE_SIZE,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream every record of a Horizon collection by following ``paging_token`` cursors.
+
+    Only one page is held in memory at a time. When walking newest-first
+    (``desc=True``) the iteration stops as soon as a record falls before
+    ``since``/``min_ledger``; records newer than ``until``/``max_ledger`` are
+    skipped. Ascending walks do the opposite.
+
+    Args:
+        builder: A stellar_sdk call builder (e.g. ``server.payments().for_account(...)``)
+        max_records: Stop after yielding this many records
+        since / until: Optional date range (ISO-8601 strings or datetimes)
+        min_ledger / max_ledger: Optional ledger range
+        desc: Newest first (default) or oldest first
+        page_size: Records per request (max 200)
+    """
+    since, until = parse_time(since), parse_time(until)
+    # Don't download a full page when only a few records are wanted
+    page_size = min(page_size, PAGE_SIZE, max_records or PAGE_SIZE)
+    builder = builder.order(desc=desc).limit(page_size)
+    yielded = 0
+    first_page = True
+
+    while True:
+        if first_page:
+            page = builder.call()["_embedded"]["records"]
+        else:
+            # Deep pages are rarely re-read; keep them out of the response cache
+            with bypass_cache():
+                page = builder.call()["_embedded"]["records"]
+        first_page = False
+
+        for record in page:
+            action = _classify(record, desc, since, until, min_ledger, max_ledger)
+            if action == _STOP:
+                return
+            if action == _SKIP:
+                continue
+
+            yield record
+            yielded += 1
+            if max_records is not None and yielded >= max_records:
+                return
+
+        if len(page) < page_size:
+            return
+        builder.cursor(page[-1]["paging_token"])
+
+
+async def aiter_records(
+    builder,
+    max_records: Optional[int] = None,
+    since: DateLike = None,
+    until: DateLike = None,
+    min_ledger: Optional[int] = None,
+    max_ledger: Optional[int] = None,
+    desc: bool = True,
+    page_size: int = PAGE_SIZE,
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async counterpart of ``iter_records`` for call builders of ``ServerAsync``"""
+    since, until = parse_time(since), parse_time(until)
+    page_size = min(page_size, PAGE_SIZE, max_records or PAGE_SIZE)
+    builder = builder.order(desc=desc).limit(page_size)
+    yielded = 0
+    first_page = True
+
+    while True:
+        if first_page:
+            page = (await builder.call())["_embedded"]["records"]
+        else:
+            with bypass_cache():
+                page = (await builder.call())["_embedded"]["records"]
+        first_page = False
+
+        for record in page:
+            action = _classify(record, desc, since, until, min_ledger, max_ledger)
+            if action == _STOP:
+                return
+            if action == _SKIP:
+                continue
+
+            yield record
+            yielded += 1
+            if max_records is not None and yielded >= max_records:
+                return
+
+        if len(page) < page_size:
+            return
+        builder.cursor(page[-1]["paging_token"])
+
+
+def aggregate_records(
+    records: Iterator[Dict[str, Any]],
+    group_by: Optional[str] = None,
+    sum_field: Optional[str] = None,
+    top: int = 20,
+) -> dict:
+    """
+    Fold a record stream into totals without keeping the records.
+
+    Returns the count, the time and ledger span, optional per-group counts
+    (``group_by`` is a record field such as ``type`` or ``successful``) and an
+    optional sum of a numeric field (``amount``, ``fee_charged``...).
+    """
+    count = 0
+    total = Decimal(0)
+    groups: Counter = Counter()
+    first_at = last_at = None
+    min_ledger = max_ledger = None
+
+    for record in records:
+        count += 1
+        closed_at = record.get("created_at") or record.get("ledger_close_time")
+        if closed_at:
+            first_at = closed_at if first_at is None or closed_at < first_at else first_at
+            last_at = closed_at if last_at is None or closed_at > last_at else last_at
+        ledger = record_ledger(record)
+        if ledger is not None:
+            min_ledger = ledger if min_ledger is None else min(min_ledger, ledger)
+            max_ledger = ledger if max_ledger is None else max(max_ledger, ledger)
+        if group_by:
+            groups[str(record.get(group_by, "N/A"))] += 1
+        if sum_field and record.get(sum_field) is not None:
+            try:
+                total += Decimal(str(record[sum_field]))
+            except InvalidOperation:
+                pass
+
+    result = {
+        "count": count,
+        "first_at": first_at,
+        "last_at": last_at,
+        "min_ledger": min_ledger,
+        "max_ledger": max_ledger,
+    }
+    if group_by:
+        result["group_by"] = group_by
+        result["groups"] = dict(groups.most_common(top))
+        result["distinct_groups"] = len(groups)
+    if sum_field:
+        result["sum_field"] = sum_field
+        result["sum"] = str(total)
+    return result
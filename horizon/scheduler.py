@@ -0,0 +1,309 @@
+import asyncio
+import heapq
+import itertools
+import random
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from enum import IntEnum
+from typing import Dict, List, Optional
+
+from config.horizon_config import get_horizon_config
+
+_scheduler: Optional["RequestScheduler"] = None
+_scheduler_lock = threading.Lock()
+
+# Statuses worth retrying: rate limited, or a transient server / gateway failure
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+# Horizon refills its per-IP budget over an hour unless its headers say otherwise
+_DEFAULT_PERIOD = 3600.0
+
+# Longest single sleep while queued, so new arrivals and header updates are noticed
+_MAX_POLL = 0.25
+
+
+class Priority(IntEnum):
+    """Lower values are served first when requests have to queue"""
+
+    INTERACTIVE = 0
+    PREFETCH = 1
+    BACKGROUND = 2
+
+
+_priority: ContextVar[Priority] = ContextVar("horizon_request_priority", default=Priority.INTERACTIVE)
+
+
+@contextmanager
+def request_priority(priority: Priority):
+    """Run the enclosed Horizon requests at ``priority`` (default: INTERACTIVE)"""
+    token = _priority.set(priority)
+    try:
+        yield
+    finally:
+        _priority.reset(token)
+
+
+def current_priority() -> Priority:
+    """Priority the Horizon requests made from this context run at"""
+    return _priority.get()
+
+
+def _header(headers: dict, name: str) -> Optional[float]:
+    name = name.lower()
+    for key, value in (headers or {}).items():
+        if key.lower() == name:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+    return None
+
+
+class TokenBucket:
+    """
+    Client-side mirror of Horizon's per-IP rate limit.
+
+    Horizon reports ``X-Ratelimit-Limit`` (bucket size), ``X-Ratelimit-Remaining``
+    and ``X-Ratelimit-Reset`` (seconds until the bucket is full again) on every
+    response. The remaining count replaces the local token count, and the
+    refill rate is derived from how long the server needs to refill what was
+    used. Until a limit is seen the bucket only applies ``rate`` (0: unlimited),
+    which also caps the server-derived rate afterwards.
+    """
+
+    def __init__(self, rate: float = 0.0):
+        self.local_rate = rate
+        self.server_rate: Optional[float] = None
+        self.rate = rate
+        self.capacity = max(rate, 1.0) if rate else float("inf")
+        self.tokens = self.capacity
+        self.paused_until = 0.0
+        self._updated = time.monotonic()
+
+    @property
+    def limited(self) -> bool:
+        return self.capacity != float("inf")
+
+    def _refill(self, now: float) -> None:
+        if self.rate:
+            self.tokens = min(self.capacity, self.tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def observe(self, limit: float, remaining: float, reset: Optional[float]) -> None:
+        now = time.monotonic()
+        self._refill(now)
+        self.capacity = limit
+        self.tokens = min(remaining, limit)
+        if reset and limit > remaining:
+            self.server_rate = (limit - remaining) / reset
+        elif self.server_rate is None:
+            self.server_rate = limit / _DEFAULT_PERIOD
+        self.rate = min(self.server_rate, self.local_rate) if self.local_rate else self.server_rate
+
+    def pause(self, seconds: float) -> None:
+        """Stop handing out tokens for ``seconds`` (after a 429)"""
+        now = time.monotonic()
+        self._refill(now)
+        self.tokens = min(self.tokens, 0.0)
+        self.paused_until = max(self.paused_until, now + seconds)
+
+    def wait_time(self, reserve: float = 0.0, take: bool = True) -> float:
+        """
+        0 if a token (leaving ``reserve`` behind) is available, taking it when
+        ``take``; else seconds until one should be
+        """
+        now = time.monotonic()
+        if now < self.paused_until:
+            return self.paused_until - now
+        if not self.limited:
+            return 0.0
+        self._refill(now)
+        if self.tokens >= 1 + reserve:
+            if take:
+                self.tokens -= 1
+            return 0.0
+        return (1 + reserve - self.tokens) / self.rate if self.rate else _MAX_POLL
+
+
+class RequestScheduler:
+    """
+    Admission control and retries for every Horizon GET of the process.
+
+    Requests take a token from a ``TokenBucket`` tuned by Horizon's rate-limit
+    headers. When tokens run out they queue by priority (interactive tool
+    calls before prefetch before background jobs) and FIFO within a priority;
+    prefetch and background requests also leave ``background_reserve`` of the
+    bucket to interactive ones. 429 and 5xx responses and connection errors
+    are retried with jittered exponential backoff, honouring ``Retry-After``;
+    a 429 pauses the whole bucket so other requests back off too.
+    """
+
+    def __init__(
+        self,
+        rate: float = 0.0,
+        num_retries: int = 3,
+        backoff_factor: float = 0.5,
+        max_backoff: float = 30.0,
+        background_reserve: float = 0.2,
+    ):
+        self.bucket = TokenBucket(rate)
+        self.num_retries = num_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.background_reserve = background_reserve
+        self._lock = threading.Lock()
+        self._queue: List[tuple] = []
+        self._abandoned: set = set()
+        self._tickets = itertools.count()
+        self._depth: Dict[Priority, int] = {priority: 0 for priority in Priority}
+        self._counters = {
+            "requests": 0,
+            "queued": 0,
+            "queued_seconds": 0.0,
+            "peak_queue_depth": 0,
+            "retries": 0,
+            "rate_limited": 0,
+            "server_errors": 0,
+            "connection_errors": 0,
+            "gave_up": 0,
+        }
+
+    # -- admission --
+
+    def _enqueue(self, priority: Priority) -> Optional[tuple]:
+        """Take a token right away (None) or join the queue (returns the ticket)"""
+        with self._lock:
+            self._counters["requests"] += 1
+            if not self._queue and self.bucket.wait_time(self._reserve(priority)) == 0:
+                return None
+            ticket = (int(priority), next(self._tickets))
+            heapq.heappush(self._queue, ticket)
+            self._depth[priority] += 1
+            self._counters["queued"] += 1
+            self._counters["peak_queue_depth"] = max(self._counters["peak_queue_depth"], len(self._queue) - len(self._abandoned))
+            return ticket
+
+    def _reserve(self, priority: Priority) -> float:
+        if priority == Priority.INTERACTIVE or not self.bucket.limited:
+            return 0.0
+        return self.bucket.capacity * self.background_reserve
+
+    def _poll(self, ticket: tuple) -> float:
+        """0 once ``ticket`` got its token, else how long to sleep before asking again"""
+        with self._lock:
+            while self._queue and self._queue[0] in self._abandoned:
+                self._abandoned.discard(heapq.heappop(self._queue))
+            head = self._queue[0]
+            wait = self.bucket.wait_time(self._reserve(Priority(head[0])), take=head == ticket)
+            if wait == 0 and head == ticket:
+                heapq.heappop(self._queue)
+                self._depth[Priority(ticket[0])] -= 1
+                return 0.0
+            # Waiters behind the head sleep at least as long as the head
+            return min(max(wait, 0.005), _MAX_POLL)
+
+    def _leave(self, ticket: tuple, started: float, acquired: bool) -> None:
+        with self._lock:
+            self._counters["queued_seconds"] += time.monotonic() - started
+            if not acquired:
+                self._abandoned.add(ticket)
+                self._depth[Priority(ticket[0])] -= 1
+
+    def acquire(self) -> float:
+        """Block until this thread's request may go out; returns seconds spent queued"""
+        ticket = self._enqueue(current_priority())
+        if ticket is None:
+            return 0.0
+        started, acquired = time.monotonic(), False
+        try:
+            while (wait := self._poll(ticket)) > 0:
+                time.sleep(wait)
+            acquired = True
+        finally:
+            self._leave(ticket, started, acquired)
+        return time.monotonic() - started
+
+    async def aacquire(self) -> float:
+        """Async ``acquire``: queued coroutines sleep without blocking the event loop"""
+        ticket = self._enqueue(current_priority())
+        if ticket is None:
+            return 0.0
+        started, acquired = time.monotonic(), False
+        try:
+            while (wait := self._poll(ticket)) > 0:
+                await asyncio.sleep(wait)
+            acquired = True
+        finally:
+            self._leave(ticket, started, acquired)
+        return time.monotonic() - started
+
+    def queued(self) -> int:
+        """Requests currently waiting for a token"""
+        with self._lock:
+            return len(self._queue) - len(self._abandoned)
+
+    # -- responses and retries --
+
+    def backoff(self, attempt: int, status: Optional[int], headers: Optional[dict]) -> Optional[float]:
+        """
+        Feed a finished attempt (``status`` None for a connection error) to the
+        scheduler; returns the delay before retrying it, or None to give up.
+        """
+        limit = _header(headers, "X-Ratelimit-Limit")
+        remaining = _header(headers, "X-Ratelimit-Remaining")
+        retry_after = _header(headers, "Retry-After")
+        with self._lock:
+            if limit is not None and remaining is not None:
+                self.bucket.observe(limit, remaining, _header(headers, "X-Ratelimit-Reset"))
+            if status is not None and status not in RETRY_STATUSES:
+                return None
+            self._counters["rate_limited" if status == 429 else "server_errors" if status else "connection_errors"] += 1
+            if attempt >= self.num_retries:
+                self._counters["gave_up"] += 1
+                return None
+            self._counters["retries"] += 1
+            delay = min(self.backoff_factor * 2 ** attempt, self.max_backoff) * random.uniform(0.5, 1.5)
+            if status == 429:
+                # Without Retry-After, wait at least until the bucket should hold a token again
+                delay = max(delay, retry_after or (1 / self.bucket.rate if self.bucket.rate else 0.0))
+                self.bucket.pause(min(delay, self.max_backoff))
+            elif retry_after:
+                delay = max(delay, retry_after)
+            return min(delay, self.max_backoff)
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            depth = {priority.name.lower(): count for priority, count in self._depth.items()}
+            bucket = self.bucket
+            limited = bucket.limited
+            return {
+                **counters,
+                "queued_seconds": round(counters["queued_seconds"], 3),
+                "queue_depth": depth,
+                "rate_limit": {
+                    "capacity": bucket.capacity if limited else None,
+                    "tokens": round(bucket.tokens, 1) if limited else None,
+                    "refill_per_second": round(bucket.rate, 3),
+                    "paused_for": round(max(bucket.paused_until - time.monotonic(), 0.0), 2),
+                },
+            }
+
+
+def get_scheduler() -> RequestScheduler:
+    """Return the process-wide request scheduler shared by the sync and async clients"""
+    global _scheduler
+    if _scheduler is None:
+        with _scheduler_lock:
+            if _scheduler is None:
+                config = get_horizon_config()
+                _scheduler = RequestScheduler(
+                    rate=config["rate_limit_rps"],
+                    num_retries=config["num_retries"],
+                    backoff_factor=config["backoff_factor"],
+                    max_backoff=config["max_backoff"],
+                    background_reserve=config["background_reserve"],
+                )
+    return _scheduler
@@ -0,0 +1,145 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple
+
+from config.horizon_config import get_horizon_config
+from horizon.scheduler import Priority, current_priority, get_scheduler
+
+_flights: Optional["SingleFlight"] = None
+_flights_lock = threading.Lock()
+
+# Result handed to waiters when the leader was interrupted (cancelled task,
+# KeyboardInterrupt) rather than failing: each waiter then makes its own call
+_RETRY = object()
+
+
+class _Call:
+    __slots__ = ("future", "loop", "priority")
+
+    def __init__(self, loop: Optional[asyncio.AbstractEventLoop], priority: Priority):
+        self.future: Future = Future()
+        # Event loop of an async leader, so a sync caller on that loop never blocks on it
+        self.loop = loop
+        # Scheduler priority the leader's request queues at
+        self.priority = priority
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one.
+
+    The first caller for a key (the leader) runs the call; callers arriving
+    while it is in flight wait for and share its result or exception. Works
+    across threads and event loops: sync and async callers of the same key
+    share one call, whichever kind leads. While the scheduler is queueing
+    requests, a caller doesn't wait on a leader of lower priority (an
+    interactive tool call behind a prefetch waiting for a token): it leads
+    a call of its own, which later callers of the key join instead.
+    Nothing is kept once the call
+    finishes, so this only removes duplicate in-flight work; caching
+    finished results is the response cache's job.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self._counters = {"calls": 0, "coalesced": 0, "overtaken": 0}
+
+    def _join(self, key: Hashable, loop: Optional[asyncio.AbstractEventLoop],
+              running_loop: Optional[asyncio.AbstractEventLoop] = None) -> Tuple[Optional[_Call], bool]:
+        """(call to wait for, False), (new call to lead, True), or (None, False) if waiting would deadlock"""
+        priority = current_priority()
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                # A sync caller blocking on an async leader of its own event loop would deadlock it
+                if call.loop is not None and call.loop is running_loop:
+                    return None, False
+                if call.priority <= priority or not get_scheduler().queued():
+                    self._counters["coalesced"] += 1
+                    return call, False
+                # The lower-priority leader keeps running; it just stops taking waiters
+                self._counters["overtaken"] += 1
+            call = self._calls[key] = _Call(loop, priority)
+            self._counters["calls"] += 1
+            return call, True
+
+    def _finish(self, key: Hashable, call: _Call, result: Any = None, error: Optional[BaseException] = None) -> None:
+        with self._lock:
+            if self._calls.get(key) is call:
+                del self._calls[key]
+        if error is not None:
+            call.future.set_exception(error)
+        else:
+            call.future.set_result(result)
+
+    def do(self, key: Hashable, func: Callable[[], Any]) -> Tuple[Any, bool]:
+        """Run ``func`` once for concurrent callers of ``key``; returns (result, shared)"""
+        while True:
+            try:
+                running_loop = asyncio.get_running_loop()
+            except RuntimeError:
+                running_loop = None
+            call, leader = self._join(key, None, running_loop)
+            if call is None:
+                return func(), False
+            if not leader:
+                result = call.future.result()
+                if result is _RETRY:
+                    continue
+                return result, True
+            try:
+                result = func()
+            except Exception as e:
+                self._finish(key, call, error=e)
+                raise
+            except BaseException:
+                self._finish(key, call, result=_RETRY)
+                raise
+            self._finish(key, call, result=result)
+            return result, False
+
+    async def ado(self, key: Hashable, func: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """Await ``func()`` once for concurrent callers of ``key``; returns (result, shared)"""
+        while True:
+            call, leader = self._join(key, asyncio.get_running_loop())
+            if not leader:
+                # shield: a cancelled waiter must not cancel the shared future
+                result = await asyncio.shield(asyncio.wrap_future(call.future))
+                if result is _RETRY:
+                    continue
+                return result, True
+            try:
+                result = await func()
+            except Exception as e:
+                self._finish(key, call, error=e)
+                raise
+            except BaseException:
+                self._finish(key, call, result=_RETRY)
+                raise
+            self._finish(key, call, result=result)
+            return result, False
+
+    def stats(self) -> dict:
+        with self._lock:
+            counters = dict(self._counters)
+            in_flight = len(self._calls)
+        total = counters["calls"] + counters["coalesced"]
+        return {
+            **counters,
+            "in_flight": in_flight,
+            "coalesced_ratio": round(counters["coalesced"] / total, 3) if total else 0.0,
+        }
+
+
+def get_single_flight() -> Optional[SingleFlight]:
+    """Return the process-wide request coalescer, or None when disabled"""
+    global _flights
+    if _flights is None:
+        with _flights_lock:
+            if _flights is None:
+                if not get_horizon_config()["single_flight"]:
+                    return None
+                _flights = SingleFlight()
+    return _flights
@@ -0,0 +1,212 @@
+import asyncio
+import json
+import sqlite3
+import threading
+import time
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from config.horizon_config import get_store_config
+
+_store: Optional["ImmutableStore"] = None
+_store_lock = threading.Lock()
+
+# Fraction of max_bytes kept after an eviction pass, so we don't evict on every write
+_EVICT_TARGET = 0.9
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS objects (
+    kind TEXT NOT NULL,
+    key TEXT NOT NULL,
+    body TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    last_access REAL NOT NULL,
+    PRIMARY KEY (kind, key)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS idx_objects_last_access ON objects (last_access);
+"""
+
+
+class ImmutableStore:
+    """
+    Persistent SQLite store for chain data that never changes once written:
+    transactions by hash, closed ledgers by sequence and historical operations
+    by id. Objects are kept as raw Horizon JSON (without ``_links``) and the
+    least recently read ones are evicted when the file grows past ``max_bytes``.
+    A read records its access time only when the stored one is more than
+    ``touch_interval`` seconds old, so repeated reads don't turn into writes.
+    The file lives outside the process, so it survives restarts and is shared
+    by the CLI and the Streamlit app.
+    """
+
+    def __init__(self, path: str, max_bytes: int, touch_interval: float = 600):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.touch_interval = touch_interval
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, timeout=10)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(_SCHEMA)
+        self._size = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM objects").fetchone()[0]
+        self._stats = {"hits": 0, "misses": 0, "writes": 0, "evictions": 0}
+
+    @staticmethod
+    def normalize_key(kind: str, key) -> str:
+        key = str(key)
+        return key.lower() if kind == "transaction" else key
+
+    def get(self, kind: str, key) -> Optional[dict]:
+        return self.get_many(kind, [key]).get(self.normalize_key(kind, key))
+
+    def get_many(self, kind: str, keys: Iterable) -> Dict[str, dict]:
+        """Bulk read; returns only the keys that are present"""
+        keys = list(dict.fromkeys(self.normalize_key(kind, key) for key in keys))
+        if not keys:
+            return {}
+        found = {}
+        touched = []
+        now = time.time()
+        with self._lock:
+            # Stay below SQLite's bound-parameter limit
+            for start in range(0, len(keys), 500):
+                chunk = keys[start:start + 500]
+                placeholders = ",".join("?" * len(chunk))
+                rows = self._conn.execute(
+                    f"SELECT key, body, last_access FROM objects WHERE kind = ? AND key IN ({placeholders})",
+                    [kind, *chunk],
+                ).fetchall()
+                for row_key, body, last_access in rows:
+                    found[row_key] = json.loads(body)
+                    if now - last_access > self.touch_interval:
+                        touched.append((now, kind, row_key))
+            # Eviction order only needs coarse access times
+            if touched:
+                self._conn.executemany("UPDATE objects SET last_access = ? WHERE kind = ? AND key = ?", touched)
+                self._conn.commit()
+            self._stats["hits"] += len(found)
+            self._stats["misses"] += len(keys) - len(found)
+        return found
+
+    def put(self, kind: str, key, obj: dict) -> None:
+        self.put_many(kind, {key: obj})
+
+    def put_many(self, kind: str, objects: Dict[str, dict]) -> None:
+        rows = []
+        now = time.time()
+        for key, obj in objects.items():
+            body = json.dumps({k: v for k, v in obj.items() if k != "_links"}, separators=(",", ":"))
+            rows.append((kind, self.normalize_key(kind, key), body, len(body), now))
+        if not rows:
+            return
+        with self._lock:
+            replaced = 0
+            for start in range(0, len(rows), 500):
+                chunk = [row[1] for row in rows[start:start + 500]]
+                placeholders = ",".join("?" * len(chunk))
+                replaced += self._conn.execute(
+                    f"SELECT COALESCE(SUM(size), 0) FROM objects WHERE kind = ? AND key IN ({placeholders})",
+                    [kind, *chunk],
+                ).fetchone()[0]
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO objects (kind, key, body, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                rows,
+            )
+            self._size += sum(row[3] for row in rows) - replaced
+            self._stats["writes"] += len(rows)
+            if self._size > self.max_bytes:
+                self._evict()
+            self._conn.commit()
+
+    def _evict(self) -> None:
+        target = self.max_bytes * _EVICT_TARGET
+        while self._size > target:
+            victims = self._conn.execute(
+                "SELECT kind, key, size FROM objects ORDER BY last_access LIMIT 500"
+            ).fetchall()
+            if not victims:
+                self._size = 0
+                break
+            evicted = []
+            for kind, key, size in victims:
+                if self._size <= target:
+                    break
+                evicted.append((kind, key))
+                self._size -= size
+            self._conn.executemany("DELETE FROM objects WHERE kind = ? AND key = ?", evicted)
+            self._stats["evictions"] += len(evicted)
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update(
+                objects=self._conn.execute("SELECT COUNT(*) FROM objects").fetchone()[0],
+                bytes=self._size,
+                max_bytes=self.max_bytes,
+                path=self.path,
+            )
+        return stats
+
+    def clear(self) -> None:
+        with self._lock:
+            self._conn.execute("DELETE FROM objects")
+            self._conn.commit()
+            self._size = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._conn.close()
+
+
+def get_immutable_store() -> Optional[ImmutableStore]:
+    """Return the process-wide immutable store, or None when it is disabled"""
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                config = get_store_config()
+                if not config["enabled"]:
+                    return None
+                _store = ImmutableStore(config["path"], config["max_bytes"], config["touch_interval"])
+    return _store
+
+
+def fetch_immutable(kind: str, key, fetch: Callable[[], dict]) -> dict:
+    """Read an immutable object from the store, falling back to ``fetch()`` and keeping the result"""
+    store = get_immutable_store()
+    if store is None:
+        return fetch()
+    obj = store.get(kind, key)
+    if obj is None:
+        obj = fetch()
+        store.put(kind, key, obj)
+    return obj
+
+
+async def afetch_immutable(kind: str, key, fetch: Callable[[], Awaitable[dict]]) -> dict:
+    """Async counterpart of ``fetch_immutable``; the SQLite reads and writes run in a worker thread"""
+    store = get_immutable_store()
+    if store is None:
+        return await fetch()
+    obj = await asyncio.to_thread(store.get, kind, key)
+    if obj is None:
+        obj = await fetch()
+        await asyncio.to_thread(store.put, kind, key, obj)
+    return obj
+
+
+def remember_immutable(kind: str, objects: Dict[str, dict]) -> None:
+    """Write-through for immutable records seen in list responses (best effort)"""
+    store = get_immutable_store()
+    if store is None or not objects:
+        return
+    try:
+        store.put_many(kind, objects)
+    except sqlite3.Error:
+        pass
+
+
+async def aremember_immutable(kind: str, objects: Dict[str, dict]) -> None:
+    """Async ``remember_immutable``: the SQLite write runs in a worker thread"""
+    if get_immutable_store() is None or not objects:
+        return
+    await asyncio.to_thread(remember_immutable, kind, objects)
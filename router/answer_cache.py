@@ -0,0 +1,190 @@
+import re
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Optional, Tuple
+
+from config.router_config import get_answer_cache_config
+from router.fast_path import ACCOUNT_PATTERN, TX_HASH_PATTERN, match, normalize
+from telemetry.spans import current_span
+
+_cache: Optional["AnswerCache"] = None
+_cache_lock = threading.Lock()
+
+_WORD = re.compile(r"\w+")
+# Questions leaning on the conversation ("e dessa conta?") or on who is asking ("meu saldo")
+_CONTEXT_REFERENCE = re.compile(
+    r"\b(dess[ae]s?|nest[ae]s?|ess[ae]s?|aquel[ae]s?|del[ae]s?|el[ae]s?|mesm[ao]s?|anterior\w*|acima|de novo"
+    r"|meus?|minhas?|nosso|nossa|this|that|these|those|it|its|they|them|their|same|previous|above|again|my|mine|our)\b"
+)
+
+
+def current_ledger() -> Optional[int]:
+    """
+    Latest ledger sequence this process has seen, from the Latest-Ledger
+    header of Horizon responses or the ledger stream (started here, so
+    closes are noticed without any traffic)
+    """
+    from horizon.cache import get_response_cache
+    from horizon.ingester import get_ledger_ingester
+
+    get_ledger_ingester()
+    cache = get_response_cache()
+    return cache.latest_ledger if cache is not None else None
+
+
+@dataclass
+class CachedAnswer:
+    """An answer-cache lookup; on a miss, ``store()`` keeps the answer the turn produced"""
+
+    cache: Optional["AnswerCache"] = None
+    key: Optional[Tuple] = None
+    # Ledger when the question came in: the tool data behind the answer is at least this recent
+    ledger: Optional[int] = None
+    answer: Optional[str] = None
+
+    @property
+    def storable(self) -> bool:
+        """A miss whose answer can be cached"""
+        return self.cache is not None and self.key is not None and self.ledger is not None and self.answer is None
+
+    def store(self, answer: Optional[str]) -> None:
+        if self.storable and answer:
+            self.cache.put(self.key, answer, self.ledger)
+
+    def store_run(self, run) -> None:
+        """``store()`` the answer of an agent run (a RunOutput) unless it failed or was cancelled"""
+        from agno.run.base import RunStatus
+
+        if run is not None and run.status == RunStatus.completed and isinstance(run.content, str):
+            self.store(run.content)
+
+
+class _Entry:
+    __slots__ = ("answer", "ledger", "stored_at")
+
+    def __init__(self, answer: str, ledger: int, stored_at: float):
+        self.answer = answer
+        self.ledger = ledger
+        self.stored_at = stored_at
+
+
+class AnswerCache:
+    """
+    Whole answers to repeated questions, shared by every conversation.
+
+    A question is keyed by its normalized wording (lowercase, no accents or
+    punctuation) with the addresses and hashes it mentions kept apart, so
+    "Saldo de GABC…?" and "saldo de gabc…" share an entry. Only questions
+    about chain data are cached, since their answers don't depend on who
+    asks: short (``max_words``), naming an address or hash or else asking a
+    fast-path lookup (network stats, a ledger), and without references to
+    the conversation or the asker ("dessa conta", "meu saldo"). Small talk
+    and questions about the assistant ("oi", "quem é você?") are never
+    cached.
+
+    An answer is stamped with the ledger observed when its question came
+    in; every Horizon response it used is at least that recent. It is
+    served until a newer ledger is observed, which makes its data stale, or
+    for ``max_age`` seconds at most. Answers are never stored before a
+    ledger has been observed. At most ``max_entries`` are kept, least
+    recently used evicted first.
+    """
+
+    def __init__(self, max_entries: int = 1024, max_age: float = 30, max_words: int = 20):
+        self.max_entries = max_entries
+        self.max_age = max_age
+        self.max_words = max_words
+        self._entries: "OrderedDict[Tuple, _Entry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "stale": 0, "uncacheable": 0, "stores": 0, "evictions": 0}
+
+    def key(self, question: str) -> Optional[Tuple]:
+        """Cache key of a self-contained question about chain data, or None"""
+        accounts = tuple(sorted(set(ACCOUNT_PATTERN.findall(question))))
+        hashes = tuple(sorted({tx_hash.lower() for tx_hash in TX_HASH_PATTERN.findall(question)}))
+        words = _WORD.findall(normalize(TX_HASH_PATTERN.sub(" ", ACCOUNT_PATTERN.sub(" ", question))))
+        text = " ".join(words)
+        if not words or len(words) > self.max_words or _CONTEXT_REFERENCE.search(text):
+            return None
+        if not accounts and not hashes and match(question, self.max_words) is None:
+            return None
+        return text, accounts, hashes
+
+    def lookup(self, question: str) -> CachedAnswer:
+        """The cached answer to ``question`` if it is still valid; the result stores the new one otherwise"""
+        key = self.key(question)
+        if key is None:
+            self._count("uncacheable")
+            return CachedAnswer()
+        ledger = current_ledger()
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and (
+                now - entry.stored_at > self.max_age or ledger is None or entry.ledger < ledger
+            ):
+                del self._entries[key]
+                self._stats["stale"] += 1
+                entry = None
+            if entry is None:
+                self._stats["misses"] += 1
+            else:
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+        turn = current_span()
+        if turn is not None:
+            turn.set(answer_cache="hit" if entry is not None else "miss")
+        return CachedAnswer(self, key, ledger, entry.answer if entry is not None else None)
+
+    def put(self, key: Tuple, answer: str, ledger: int) -> None:
+        with self._lock:
+            self._entries[key] = _Entry(answer, ledger, time.monotonic())
+            self._entries.move_to_end(key)
+            self._stats["stores"] += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self._stats["evictions"] += 1
+
+    def _count(self, name: str) -> None:
+        with self._lock:
+            self._stats[name] += 1
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._entries)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
+
+
+def get_answer_cache() -> Optional[AnswerCache]:
+    """Return the process-wide answer cache, or None when disabled"""
+    global _cache
+    if _cache is None:
+        with _cache_lock:
+            if _cache is None:
+                config = get_answer_cache_config()
+                if not config["enabled"]:
+                    return None
+                _cache = AnswerCache(
+                    max_entries=config["max_entries"], max_age=config["max_age"], max_words=config["max_words"]
+                )
+    return _cache
+
+
+def lookup_answer(question: str) -> CachedAnswer:
+    """Look ``question`` up in the answer cache (a lookup that never hits nor stores when disabled)"""
+    cache = get_answer_cache()
+    return cache.lookup(question) if cache is not None else CachedAnswer()
+
+
+def get_answer_cache_stats() -> dict:
+    cache = get_answer_cache()
+    return cache.stats() if cache is not None else {}
@@ -0,0 +1,185 @@
+import re
+import unicodedata
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Optional, Pattern
+
+from config.router_config import get_router_config
+from router import templates
+from telemetry.hooks import atrace_tool_call, trace_tool_call
+from telemetry.spans import current_span
+
+ACCOUNT_PATTERN = re.compile(r"\bG[A-Z2-7]{55}\b")
+TX_HASH_PATTERN = re.compile(r"\b[0-9a-fA-F]{64}\b")
+_NUMBER = re.compile(r"\b\d+\b")
+_LATEST = re.compile(r"\b(mais recente|ultimo|atual|latest|last|current|newest)\b")
+
+# Anything beyond a single lookup (comparisons, counts, history, other tools' topics) needs the LLM
+_NEEDS_LLM = re.compile(
+    r"\b(compar\w*|analis\w*|analy\w*|por ?que|why|explic\w*|explain\w*|historico|history|desde|since|entre|between"
+    r"|quant[ao]s|how many|count\w*|contar|media|average|soma|sum|operac\w*|operations?|efeitos?|effects?|trades?"
+    r"|negociac\w*|visao geral|overview|transacoes|transactions|ultim[ao]s \d+|last \d+|ativos?|assets?|emissor"
+    r"|issuer|anomali\w*|grafico|chart|e tambem|and also)\b"
+)
+
+# Answers kept for the LLM context are cut to this length
+_CONTEXT_CHARS = 1500
+
+
+@dataclass(frozen=True)
+class Intent:
+    name: str
+    tool: str
+    # Entity the lookup needs: "account" (G-address), "transaction" (64-hex hash), "ledger" (sequence) or None
+    entity: Optional[str]
+    keywords: Pattern
+    render: Callable[[dict], str]
+
+
+@dataclass(frozen=True)
+class Route:
+    intent: str
+    tool: str
+    arguments: dict
+    render: Callable[[dict], str]
+
+
+INTENTS = [
+    Intent(
+        "account_balance", "get_account_info", "account",
+        re.compile(r"\b(saldos?|balances?|balanco|quanto (de )?xlm|(info\w*|detalhes|dados) da conta|account (info\w*|details))\b"),
+        templates.render_account,
+    ),
+    Intent("account_payments", "get_account_payments", "account", re.compile(r"\b(pagamentos?|payments?)\b"),
+           templates.render_payments),
+    Intent("account_offers", "get_account_offers", "account",
+           re.compile(r"\b(ofertas?|offers?|ordens abertas|open orders)\b"), templates.render_offers),
+    # A bare hash is a transaction lookup too
+    Intent("transaction", "get_transaction_info", "transaction",
+           re.compile(r"\b(transacao|transaction|tx|hash|detalhes|details)\b|^\W*$"), templates.render_transaction),
+    Intent("ledger", "get_ledger_info", "ledger", re.compile(r"\bledger\b"), templates.render_ledger),
+    Intent(
+        "network_stats", "get_network_stats", None,
+        re.compile(r"\b(estatisticas|status|situacao|estado|stats|statistics|taxas) (atuais |atual )?(da|de|of the|of)? ?(rede|network)\b"
+                   r"|\b(network|fee) (stats|statistics|status)\b"),
+        templates.render_network_stats,
+    ),
+]
+
+
+def normalize(text: str) -> str:
+    """Lowercase without accents, so "estatísticas" and "estatisticas" match alike"""
+    decomposed = unicodedata.normalize("NFKD", text.lower())
+    return "".join(char for char in decomposed if not unicodedata.combining(char))
+
+
+def _arguments(intent: Intent, accounts: set, hashes: set, numbers: list, text: str) -> Optional[dict]:
+    """Tool arguments when the question holds exactly what ``intent`` needs, else None"""
+    if intent.entity == "ledger":
+        if accounts or hashes or len(numbers) > 1:
+            return None
+        if numbers:
+            return {"ledger_sequence": int(numbers[0])}
+        return {} if _LATEST.search(text) else None
+    if numbers:
+        return None
+    if intent.entity == "account":
+        return {"account_id": next(iter(accounts))} if len(accounts) == 1 and not hashes else None
+    if intent.entity == "transaction":
+        return {"transaction_hash": next(iter(hashes))} if len(hashes) == 1 and not accounts else None
+    return {} if not accounts and not hashes else None
+
+
+def match(question: str, max_words: int) -> Optional[Route]:
+    """
+    The single tool call that answers ``question``, or None when it is not a
+    plain lookup: too long, outside the known intents, more than one intent
+    or entity, or asking for analysis.
+    """
+    accounts = set(ACCOUNT_PATTERN.findall(question))
+    hashes = {tx_hash.lower() for tx_hash in TX_HASH_PATTERN.findall(question)}
+    text = normalize(TX_HASH_PATTERN.sub(" ", ACCOUNT_PATTERN.sub(" ", question))).strip()
+    if len(text.split()) > max_words or _NEEDS_LLM.search(text):
+        return None
+    numbers = _NUMBER.findall(text)
+
+    routes = []
+    for intent in INTENTS:
+        if not intent.keywords.search(text):
+            continue
+        arguments = _arguments(intent, accounts, hashes, numbers, text)
+        if arguments is not None:
+            routes.append(Route(intent.name, intent.tool, arguments, intent.render))
+    return routes[0] if len(routes) == 1 else None
+
+
+class FastPathRouter:
+    """
+    Per-conversation front of the agent that answers simple lookups without the LLM.
+
+    ``answer()`` runs the one tool a recognized question needs and renders its
+    result with a template; None means the question (or a failed lookup) goes
+    to the agent. Routed exchanges never reach the agent's history, so the
+    next LLM question carries them as context (``llm_context()``) and
+    follow-ups like "e os pagamentos dessa conta?" still resolve.
+    """
+
+    def __init__(self, config: Optional[dict] = None):
+        config = config or get_router_config()
+        self.enabled = config["enabled"]
+        self.max_words = config["max_words"]
+        self._unseen = deque(maxlen=max(config["context_turns"], 1))
+        self.routed = 0
+
+    def route(self, question: str) -> Optional[Route]:
+        return match(question, self.max_words) if self.enabled else None
+
+    def answer(self, question: str) -> Optional[str]:
+        """Templated answer for a plain lookup (tool run in this thread), or None for the LLM"""
+        route = self.route(question)
+        if route is None:
+            return None
+        from tools.registry import load_tool
+
+        result = trace_tool_call(route.tool, load_tool(route.tool).entrypoint, dict(route.arguments))
+        return self._finish(question, route, result)
+
+    async def aanswer(self, question: str) -> Optional[str]:
+        """``answer`` with the tool's async variant"""
+        route = self.route(question)
+        if route is None:
+            return None
+        from tools.registry import load_tool
+
+        result = await atrace_tool_call(route.tool, load_tool(route.tool, asynchronous=True).entrypoint, dict(route.arguments))
+        return self._finish(question, route, result)
+
+    def _finish(self, question: str, route: Route, result) -> Optional[str]:
+        # Errors (unknown account, bad hash) are left to the LLM to explain
+        if not isinstance(result, dict) or result.get("error"):
+            return None
+        try:
+            text = route.render(result)
+        except (KeyError, IndexError, TypeError, ValueError):
+            return None
+        turn = current_span()
+        if turn is not None:
+            turn.set(route=route.intent)
+        self.remember(question, text)
+        self.routed += 1
+        return text
+
+    def remember(self, question: str, answer: str) -> None:
+        """Pass an exchange answered outside the agent (here or from the answer cache) to its next question"""
+        self._unseen.append({"question": question, "answer": answer[:_CONTEXT_CHARS]})
+
+    def llm_context(self) -> dict:
+        """
+        Run arguments for the next agent question: the routed exchanges since
+        the last one, appended to the user message as additional context
+        """
+        if not self._unseen:
+            return {}
+        answered = list(self._unseen)
+        self._unseen.clear()
+        return {"dependencies": {"answered_without_llm": answered}, "add_dependencies_to_context": True}
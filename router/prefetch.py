@@ -0,0 +1,150 @@
+import asyncio
+import contextvars
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from contextlib import asynccontextmanager, contextmanager
+from typing import List, Optional, Tuple
+
+from config.router_config import get_prefetch_config
+from horizon.scheduler import Priority, request_priority
+from router.fast_path import ACCOUNT_PATTERN, TX_HASH_PATTERN
+from telemetry.spans import span
+
+_prefetcher: Optional["Prefetcher"] = None
+_prefetcher_lock = threading.Lock()
+
+# Lookups a model usually starts with for each entity, run with the tools' default arguments
+ACCOUNT_TOOLS = ("get_account_info", "get_account_payments", "get_account_offers")
+TRANSACTION_TOOLS = ("get_transaction_info",)
+
+
+def plan(question: str, max_accounts: int) -> List[Tuple[str, dict]]:
+    """(tool, arguments) worth fetching ahead of the model for the addresses and hashes in ``question``"""
+    calls = []
+    for tx_hash in dict.fromkeys(match.lower() for match in TX_HASH_PATTERN.findall(question)):
+        calls += [(tool, {"transaction_hash": tx_hash}) for tool in TRANSACTION_TOOLS]
+    for account_id in list(dict.fromkeys(ACCOUNT_PATTERN.findall(question)))[:max_accounts]:
+        calls += [(tool, {"account_id": account_id}) for tool in ACCOUNT_TOOLS]
+    return calls
+
+
+class Prefetcher:
+    """
+    Speculative Horizon lookups for a question, started before the model runs.
+
+    The tools a model is likely to call for the question's addresses and
+    hashes run in the background with their default arguments, so their
+    responses land in the response cache and immutable store (or are still
+    in flight, and coalesced with the model's own call) by the time the
+    model asks. Results are thrown away; only the caches are warmed.
+    Requests run at PREFETCH priority, behind interactive ones, and are
+    cancelled when the turn ends: queued thread jobs are dropped and async
+    tasks are cancelled mid-request. A thread already inside a request runs
+    it to completion.
+    """
+
+    def __init__(self, max_accounts: int = 2, workers: int = 4):
+        self.max_accounts = max_accounts
+        self.workers = workers
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._lock = threading.Lock()
+        self._counters = {"questions": 0, "started": 0, "completed": 0, "failed": 0, "cancelled": 0}
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def _planned(self, question: str) -> List[Tuple[str, dict]]:
+        calls = plan(question, self.max_accounts)
+        if calls:
+            self._count("questions")
+            self._count("started", len(calls))
+        return calls
+
+    def _done(self, result) -> None:
+        failed = not isinstance(result, dict) or bool(result.get("error"))
+        self._count("failed" if failed else "completed")
+
+    def _run(self, tool_name: str, arguments: dict) -> None:
+        from tools.registry import load_tool
+
+        with request_priority(Priority.PREFETCH), span("prefetch", tool_name):
+            self._done(load_tool(tool_name).entrypoint(**arguments))
+
+    async def _arun(self, tool_name: str, arguments: dict) -> None:
+        from tools.registry import load_tool
+
+        with request_priority(Priority.PREFETCH), span("prefetch", tool_name):
+            self._done(await load_tool(tool_name, asynchronous=True).entrypoint(**arguments))
+
+    def start(self, question: str) -> List[Future]:
+        """Submit the question's lookups to the worker threads"""
+        calls = self._planned(question)
+        if not calls:
+            return []
+        with self._lock:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="prefetch")
+        # Each job runs in a copy of this context, so its spans nest under the current turn
+        return [
+            self._executor.submit(contextvars.copy_context().run, self._run, tool_name, arguments)
+            for tool_name, arguments in calls
+        ]
+
+    def astart(self, question: str) -> List[asyncio.Task]:
+        """Start the question's lookups as tasks on the running event loop"""
+        return [asyncio.create_task(self._arun(tool_name, arguments)) for tool_name, arguments in self._planned(question)]
+
+    def cancel(self, pending: list) -> None:
+        """Cancel lookups (futures or tasks) that have not finished"""
+        cancelled = sum(1 for job in pending if not job.done() and job.cancel())
+        if cancelled:
+            self._count("cancelled", cancelled)
+
+    def stats(self) -> dict:
+        with self._lock:
+            return dict(self._counters)
+
+
+def get_prefetcher() -> Optional[Prefetcher]:
+    """Return the process-wide prefetcher, or None when disabled"""
+    global _prefetcher
+    if _prefetcher is None:
+        with _prefetcher_lock:
+            if _prefetcher is None:
+                config = get_prefetch_config()
+                if not config["enabled"]:
+                    return None
+                _prefetcher = Prefetcher(max_accounts=config["max_accounts"], workers=config["workers"])
+    return _prefetcher
+
+
+@contextmanager
+def prefetching(question: str):
+    """Prefetch for ``question`` on worker threads while the enclosed (sync) agent run goes on"""
+    prefetcher = get_prefetcher()
+    pending = prefetcher.start(question) if prefetcher is not None else []
+    try:
+        yield
+    finally:
+        if pending:
+            prefetcher.cancel(pending)
+
+
+@asynccontextmanager
+async def aprefetching(question: str):
+    """Prefetch for ``question`` as tasks while the enclosed async agent run goes on"""
+    prefetcher = get_prefetcher()
+    pending = prefetcher.astart(question) if prefetcher is not None else []
+    try:
+        yield
+    finally:
+        if pending:
+            prefetcher.cancel(pending)
+            # Let cancelled tasks unwind (close their requests) before the turn is over
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def get_prefetch_stats() -> dict:
+    prefetcher = get_prefetcher()
+    return prefetcher.stats() if prefetcher is not None else {}
@@ -0,0 +1,109 @@
+from typing import Iterable, List
+
+# Table rows shown in a templated answer; the full result stays one LLM question away
+MAX_ROWS = 10
+
+
+def _table(headers: List[str], rows: Iterable[list]) -> str:
+    lines = ["| " + " | ".join(headers) + " |", "|" + "---|" * len(headers)]
+    lines += ["| " + " | ".join("-" if value is None else str(value) for value in row) + " |" for row in rows]
+    return "\n".join(lines)
+
+
+def _columns(table: dict, *names: str) -> List[list]:
+    """Selected columns of a tool's {"columns", "rows"} table, at most MAX_ROWS rows"""
+    index = [table["columns"].index(name) for name in names]
+    return [[row[i] for i in index] for row in table["rows"][:MAX_ROWS]]
+
+
+def _more(table: dict) -> str:
+    hidden = len(table["rows"]) - MAX_ROWS
+    return f"\n\n_… e mais {hidden}._" if hidden > 0 else ""
+
+
+def _stroops(value) -> str:
+    return f"{value} stroops ({int(value) / 10_000_000:.7f} XLM)"
+
+
+def render_account(result: dict) -> str:
+    balances = result["balances"]
+    return (
+        f"**Conta** `{result['account_id']}`\n\n"
+        + _table(["Ativo", "Saldo"], _columns(balances, "asset", "balance")) + _more(balances)
+        + f"\n\nSequência: {result['sequence']} · Subentradas: {result['subentry_count']}"
+        + f" · Signatários: {result['num_signers']}"
+        + (f" · Domínio: {result['home_domain']}" if result.get("home_domain") else "")
+    )
+
+
+def render_payments(result: dict) -> str:
+    payments = result["payments"]
+    if not payments["rows"]:
+        return f"A conta `{result['account_id']}` não tem pagamentos."
+    rows = [
+        [created_at, kind, sender[:8] + "…", recipient[:8] + "…", asset, amount]
+        for created_at, kind, sender, recipient, asset, amount in _columns(
+            payments, "created_at", "type", "from_account", "to_account", "asset", "amount"
+        )
+    ]
+    return (
+        f"**Últimos pagamentos** da conta `{result['account_id']}`\n\n"
+        + _table(["Data", "Tipo", "De", "Para", "Ativo", "Valor"], rows) + _more(payments)
+    )
+
+
+def render_offers(result: dict) -> str:
+    offers = result["offers"]
+    if not offers["rows"]:
+        return f"A conta `{result['account_id']}` não tem ofertas ativas no DEX."
+    return (
+        f"**{result['total_offers']} ofertas ativas** da conta `{result['account_id']}`\n\n"
+        + _table(["Vende", "Compra", "Quantidade", "Preço"], _columns(offers, "selling", "buying", "amount", "price"))
+        + _more(offers)
+    )
+
+
+def render_transaction(result: dict) -> str:
+    status = "✅ bem-sucedida" if result["successful"] else "❌ falhou"
+    memo = f"{result['memo']} ({result['memo_type']})" if result.get("memo") else "nenhum"
+    return (
+        f"**Transação** `{result['hash']}` — {status}\n\n"
+        f"- Ledger: {result['ledger']} ({result['created_at']})\n"
+        f"- Conta de origem: `{result['source_account']}`\n"
+        f"- Operações: {result['operation_count']} · Assinaturas: {result['signatures']}\n"
+        f"- Taxa cobrada: {_stroops(result['fee_charged'])} (máxima: {result['max_fee']})\n"
+        f"- Memo: {memo}"
+    )
+
+
+def render_ledger(result: dict) -> str:
+    return (
+        f"**Ledger {result['sequence']}** — fechado em {result['closed_at']}\n\n"
+        f"- Transações: {result['successful_transaction_count']} bem-sucedidas, "
+        f"{result['failed_transaction_count']} com falha\n"
+        f"- Operações: {result['operation_count']}\n"
+        f"- Taxa base: {result['base_fee_in_stroops']} stroops · Reserva base: {_stroops(result['base_reserve_in_stroops'])}\n"
+        f"- Total de XLM: {result['total_coins']} · Fee pool: {result['fee_pool']}\n"
+        f"- Protocolo: {result['protocol_version']}\n"
+        f"- Hash: `{result['hash']}`"
+    )
+
+
+def render_network_stats(result: dict) -> str:
+    ledger, fees = result["latest_ledger"], result["fee_stats"]
+    text = (
+        f"**Rede Stellar** — ledger {ledger['sequence']} ({ledger['closed_at']}), protocolo {ledger['protocol_version']}\n\n"
+        f"- Último ledger: {ledger['successful_transactions']} transações bem-sucedidas, "
+        f"{ledger['failed_transactions']} com falha, {ledger['operations']} operações\n"
+        f"- Taxa base: {fees['last_ledger_base_fee']} stroops · Uso da capacidade: {fees['ledger_capacity_usage']}\n"
+        f"- Taxas cobradas (stroops): mín {fees['fee_charged_min']}, moda {fees['fee_charged_mode']}, "
+        f"p50 {fees['fee_charged_p50']}, p95 {fees['fee_charged_p95']}, p99 {fees['fee_charged_p99']}"
+    )
+    trends = result.get("recent_trends") or {}
+    if trends.get("tps") is not None:
+        text += (
+            f"\n- Últimos {trends['ledgers']} ledgers: {trends['tps']} TPS, {trends['ops_per_second']} ops/s, "
+            f"{trends['failed_transaction_rate'] * 100:.1f}% de transações com falha, "
+            f"fechamento médio de {trends['avg_close_time_seconds']} s"
+        )
+    return text
@@ -0,0 +1,55 @@
+import logging
+import os
+import threading
+from typing import List, Optional
+
+from config.storage_config import get_storage_config
+
+logger = logging.getLogger(__name__)
+
+_chat_db = None
+_chat_db_lock = threading.Lock()
+
+
+def shard_paths(path: str, shards: int) -> List[str]:
+    """Database files for ``shards`` shards: ``path`` itself for one, <stem>.shardN<ext> otherwise"""
+    if shards <= 1:
+        return [path]
+    stem, ext = os.path.splitext(path)
+    return [f"{stem}.shard{index}{ext or '.db'}" for index in range(shards)]
+
+
+def build_chat_db(config: Optional[dict] = None):
+    """Sessions-and-memories database for the agents: one tuned SQLite file, or several shards"""
+    from storage.sharded_db import ShardedSqliteDb
+    from storage.sqlite_db import SharedSqliteDb, create_chat_engine
+
+    config = config or get_storage_config()
+    shards = [
+        SharedSqliteDb(
+            db_engine=create_chat_engine(path, config["busy_timeout_ms"], config["cache_size_mb"]),
+            max_runs=config["max_runs_per_session"],
+        )
+        for path in shard_paths(config["path"], config["shards"])
+    ]
+    return shards[0] if len(shards) == 1 else ShardedSqliteDb(shards)
+
+
+def get_chat_db():
+    """
+    Return the process-wide chat database, pruned when first opened if
+    CHAT_RETENTION_DAYS or CHAT_MAX_RUNS_PER_SESSION is set (both off by default)
+    """
+    global _chat_db
+    if _chat_db is None:
+        with _chat_db_lock:
+            if _chat_db is None:
+                config = get_storage_config()
+                db = build_chat_db(config)
+                if config["retention_days"] > 0 or config["max_runs_per_session"] > 0:
+                    try:
+                        db.prune(config["retention_days"], config["max_runs_per_session"])
+                    except Exception as e:
+                        logger.warning(f"Could not prune the chat database: {e!r}")
+                _chat_db = db
+    return _chat_db
@@ -0,0 +1,96 @@
+import argparse
+import json
+import os
+import sys
+from typing import List, Optional
+
+from config.storage_config import get_storage_config
+from storage.chat_db import build_chat_db, shard_paths
+
+
+def _pages(fetch, batch: int):
+    page = 1
+    while True:
+        rows = fetch(limit=batch, page=page)
+        yield rows
+        if len(rows) < batch:
+            return
+        page += 1
+
+
+def copy_chat_db(source: str, target, batch: int = 200) -> dict:
+    """Copy every session and memory of the SQLite chat database at ``source`` into ``target``"""
+    from agno.db.base import SessionType
+    from agno.db.sqlite import SqliteDb
+
+    source_db = SqliteDb(db_file=source)
+    copied = {"sessions": 0, "memories": 0}
+    for session_type in SessionType:
+        fetch = lambda limit, page: source_db.get_sessions(
+            session_type=session_type, limit=limit, page=page, sort_by="created_at", sort_order="asc"
+        )
+        for sessions in _pages(fetch, batch):
+            if sessions:
+                # Runs beyond the target's max_runs are dropped on the way in
+                target.upsert_sessions(sessions, preserve_updated_at=True)
+                copied["sessions"] += len(sessions)
+    fetch = lambda limit, page: source_db.get_user_memories(limit=limit, page=page, sort_by="updated_at", sort_order="asc")
+    for memories in _pages(fetch, batch):
+        if memories:
+            target.upsert_memories(memories, preserve_updated_at=True)
+            copied["memories"] += len(memories)
+    source_db.db_engine.dispose()
+    return copied
+
+
+def compact(db) -> None:
+    """Rewrite each file so existing databases get incremental auto-vacuum too"""
+    for shard in getattr(db, "shards", [db]):
+        with shard.db_engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.exec_driver_sql("VACUUM")
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    config = get_storage_config()
+    parser = argparse.ArgumentParser(
+        description="Move chat sessions and memories into the tuned (optionally sharded) chat database. "
+                    "With the source as the single target file, the file is upgraded in place."
+    )
+    parser.add_argument("--source", nargs="+", default=[config["path"]],
+                        help="Existing database file(s), e.g. every shard of an old layout (default: CHAT_DB_PATH)")
+    parser.add_argument("--target", default=config["path"], help="Target database path (default: CHAT_DB_PATH)")
+    parser.add_argument("--shards", type=int, default=config["shards"], help="Target shard count (default: CHAT_DB_SHARDS)")
+    parser.add_argument("--batch", type=int, default=200, help="Sessions / memories copied per write")
+    parser.add_argument("--no-prune", action="store_true", help="Keep sessions and runs beyond the retention settings")
+    args = parser.parse_args(argv)
+
+    sources = [os.path.abspath(source) for source in args.source]
+    targets = [os.path.abspath(path) for path in shard_paths(args.target, args.shards)]
+    missing = [source for source in sources if not os.path.exists(source)]
+    if missing:
+        print(f"No database at {', '.join(missing)}", file=sys.stderr)
+        return 1
+    in_place = sources == targets
+    if not in_place and set(sources) & set(targets):
+        print("Sources overlap the target files; migrate to a new --target path", file=sys.stderr)
+        return 1
+
+    target = build_chat_db({**config, "path": args.target, "shards": args.shards})
+    report = {"sources": sources, "targets": targets, "copied": {"sessions": 0, "memories": 0}}
+    if not in_place:
+        for source in sources:
+            for name, count in copy_chat_db(source, target, args.batch).items():
+                report["copied"][name] += count
+    # Pruning with zeros deletes nothing but still creates the session indexes
+    retention = (0, 0) if args.no_prune else (config["retention_days"], config["max_runs_per_session"])
+    report["pruned"] = target.prune(*retention)
+    compact(target)
+    report["bytes"] = {path: os.path.getsize(path) for path in targets}
+    print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
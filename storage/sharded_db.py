@@ -0,0 +1,230 @@
+import zlib
+from collections import defaultdict
+from typing import Any, Iterable, List, Optional
+
+from agno.db.base import BaseDb, SessionType
+from agno.utils.string import generate_id
+
+from storage.sqlite_db import SharedSqliteDb
+
+# agno files memories written without a user id under this one
+DEFAULT_USER = "default"
+
+
+def _field(row, name: str):
+    return row.get(name) if hasattr(row, "get") else getattr(row, name, None)
+
+
+def _merged(results: List, deserialize: bool, sort_by: str, sort_order: Optional[str], limit: Optional[int], page: Optional[int]):
+    """One result from the per-shard results of a list query, re-sorted and re-paged"""
+    if deserialize:
+        rows, total = [row for rows in results for row in rows], None
+    else:
+        rows, total = [row for rows, _ in results for row in rows], sum(count for _, count in results)
+    rows.sort(
+        key=lambda row: (_field(row, sort_by) is not None, _field(row, sort_by) or 0),
+        reverse=sort_order != "asc",
+    )
+    if limit is not None:
+        start = ((page or 1) - 1) * limit
+        rows = rows[start:start + limit]
+    return rows if deserialize else (rows, total)
+
+
+class ShardedSqliteDb(BaseDb):
+    """
+    Chat database split over several SQLite files, so concurrent
+    conversations don't queue behind one writer lock.
+
+    SQLite lets one writer into a file at a time however it is tuned. Here
+    each shard is a SharedSqliteDb with its own file and lock: a session
+    lives on the shard its session id hashes to (agno reads sessions by id
+    alone) and a user's memories on the shard their user id hashes to.
+    Queries without that key ask every shard and merge the answers.
+    Metrics, evals, knowledge and culture, unused by the agents, stay on
+    the first shard. The hash is stable across processes, but changing the
+    shard count moves keys: re-shard with ``python -m storage.migrate``.
+    """
+
+    def __init__(self, shards: List[SharedSqliteDb], id: Optional[str] = None):
+        super().__init__(id=id or generate_id("|".join(shard.id for shard in shards)))
+        self.shards = shards
+
+    @property
+    def primary(self) -> SharedSqliteDb:
+        return self.shards[0]
+
+    def shard_for(self, key: Optional[str]) -> SharedSqliteDb:
+        return self.shards[zlib.crc32((key or DEFAULT_USER).encode()) % len(self.shards)]
+
+    def _grouped(self, items: Iterable, key) -> dict:
+        groups = defaultdict(list)
+        for item in items:
+            groups[self.shard_for(key(item))].append(item)
+        return groups
+
+    # -- Sessions: by session id --
+
+    def delete_session(self, session_id: str) -> bool:
+        return self.shard_for(session_id).delete_session(session_id)
+
+    def delete_sessions(self, session_ids: List[str]) -> None:
+        for shard, ids in self._grouped(session_ids, lambda session_id: session_id).items():
+            shard.delete_sessions(ids)
+
+    def get_session(self, session_id: str, session_type: SessionType, user_id: Optional[str] = None,
+                    deserialize: Optional[bool] = True):
+        return self.shard_for(session_id).get_session(session_id, session_type, user_id=user_id, deserialize=deserialize)
+
+    def get_sessions(self, session_type: Optional[SessionType] = None, user_id: Optional[str] = None,
+                     component_id: Optional[str] = None, session_name: Optional[str] = None,
+                     start_timestamp: Optional[int] = None, end_timestamp: Optional[int] = None,
+                     limit: Optional[int] = None, page: Optional[int] = None, sort_by: Optional[str] = None,
+                     sort_order: Optional[str] = None, deserialize: Optional[bool] = True):
+        sort_by = sort_by or "created_at"
+        results = [
+            shard.get_sessions(
+                session_type=session_type, user_id=user_id, component_id=component_id, session_name=session_name,
+                start_timestamp=start_timestamp, end_timestamp=end_timestamp,
+                # The first ``page`` pages of every shard hold the merged page
+                limit=limit * (page or 1) if limit is not None else None, page=None,
+                sort_by=sort_by, sort_order=sort_order, deserialize=deserialize,
+            )
+            for shard in self.shards
+        ]
+        return _merged(results, deserialize, sort_by, sort_order, limit, page)
+
+    def rename_session(self, session_id: str, session_type: SessionType, session_name: str,
+                       deserialize: Optional[bool] = True):
+        return self.shard_for(session_id).rename_session(session_id, session_type, session_name, deserialize=deserialize)
+
+    def upsert_session(self, session, deserialize: Optional[bool] = True):
+        return self.shard_for(session.session_id).upsert_session(session, deserialize=deserialize)
+
+    def upsert_sessions(self, sessions: List, deserialize: Optional[bool] = True, preserve_updated_at: bool = False):
+        return [
+            upserted
+            for shard, group in self._grouped(sessions, lambda session: session.session_id).items()
+            for upserted in shard.upsert_sessions(group, deserialize=deserialize, preserve_updated_at=preserve_updated_at)
+        ]
+
+    # -- Memories: by user id --
+
+    def clear_memories(self) -> None:
+        for shard in self.shards:
+            shard.clear_memories()
+
+    def delete_user_memory(self, memory_id: str, user_id: Optional[str] = None) -> None:
+        for shard in [self.shard_for(user_id)] if user_id is not None else self.shards:
+            shard.delete_user_memory(memory_id, user_id=user_id)
+
+    def delete_user_memories(self, memory_ids: List[str], user_id: Optional[str] = None) -> None:
+        for shard in [self.shard_for(user_id)] if user_id is not None else self.shards:
+            shard.delete_user_memories(memory_ids, user_id=user_id)
+
+    def get_all_memory_topics(self, user_id: Optional[str] = None) -> List[str]:
+        return sorted({topic for shard in self.shards for topic in shard.get_all_memory_topics()})
+
+    def get_user_memory(self, memory_id: str, deserialize: Optional[bool] = True, user_id: Optional[str] = None):
+        for shard in [self.shard_for(user_id)] if user_id is not None else self.shards:
+            memory = shard.get_user_memory(memory_id, deserialize=deserialize, user_id=user_id)
+            if memory is not None:
+                return memory
+        return None
+
+    def get_user_memories(self, user_id: Optional[str] = None, agent_id: Optional[str] = None,
+                          team_id: Optional[str] = None, topics: Optional[List[str]] = None,
+                          search_content: Optional[str] = None, limit: Optional[int] = None,
+                          page: Optional[int] = None, sort_by: Optional[str] = None,
+                          sort_order: Optional[str] = None, deserialize: Optional[bool] = True):
+        filters = dict(agent_id=agent_id, team_id=team_id, topics=topics, search_content=search_content)
+        if user_id is not None:
+            return self.shard_for(user_id).get_user_memories(
+                user_id=user_id, limit=limit, page=page, sort_by=sort_by, sort_order=sort_order,
+                deserialize=deserialize, **filters,
+            )
+        sort_by = sort_by or "updated_at"
+        results = [
+            shard.get_user_memories(
+                limit=limit * (page or 1) if limit is not None else None, page=None,
+                sort_by=sort_by, sort_order=sort_order, deserialize=deserialize, **filters,
+            )
+            for shard in self.shards
+        ]
+        return _merged(results, deserialize, sort_by, sort_order, limit, page)
+
+    def get_user_memory_stats(self, limit: Optional[int] = None, page: Optional[int] = None,
+                              user_id: Optional[str] = None):
+        if user_id is not None:
+            return self.shard_for(user_id).get_user_memory_stats(limit=limit, page=page, user_id=user_id)
+        results = [shard.get_user_memory_stats() for shard in self.shards]
+        return _merged(results, False, "last_memory_updated_at", "desc", limit, page)
+
+    def upsert_user_memory(self, memory, deserialize: Optional[bool] = True):
+        return self.shard_for(memory.user_id).upsert_user_memory(memory, deserialize=deserialize)
+
+    def upsert_memories(self, memories: List, deserialize: Optional[bool] = True, preserve_updated_at: bool = False):
+        return [
+            upserted
+            for shard, group in self._grouped(memories, lambda memory: memory.user_id).items()
+            for upserted in shard.upsert_memories(group, deserialize=deserialize, preserve_updated_at=preserve_updated_at)
+        ]
+
+    # -- Retention --
+
+    def prune(self, retention_days: float = 0, max_runs: int = 0) -> dict:
+        pruned = defaultdict(int)
+        for shard in self.shards:
+            for name, count in shard.prune(retention_days, max_runs).items():
+                pruned[name] += count
+        return dict(pruned)
+
+    # -- Everything else: first shard --
+
+    def get_metrics(self, *args, **kwargs) -> Any:
+        return self.primary.get_metrics(*args, **kwargs)
+
+    def calculate_metrics(self, *args, **kwargs) -> Any:
+        return self.primary.calculate_metrics(*args, **kwargs)
+
+    def delete_knowledge_content(self, *args, **kwargs) -> Any:
+        return self.primary.delete_knowledge_content(*args, **kwargs)
+
+    def get_knowledge_content(self, *args, **kwargs) -> Any:
+        return self.primary.get_knowledge_content(*args, **kwargs)
+
+    def get_knowledge_contents(self, *args, **kwargs) -> Any:
+        return self.primary.get_knowledge_contents(*args, **kwargs)
+
+    def upsert_knowledge_content(self, *args, **kwargs) -> Any:
+        return self.primary.upsert_knowledge_content(*args, **kwargs)
+
+    def create_eval_run(self, *args, **kwargs) -> Any:
+        return self.primary.create_eval_run(*args, **kwargs)
+
+    def delete_eval_runs(self, *args, **kwargs) -> Any:
+        return self.primary.delete_eval_runs(*args, **kwargs)
+
+    def get_eval_run(self, *args, **kwargs) -> Any:
+        return self.primary.get_eval_run(*args, **kwargs)
+
+    def get_eval_runs(self, *args, **kwargs) -> Any:
+        return self.primary.get_eval_runs(*args, **kwargs)
+
+    def rename_eval_run(self, *args, **kwargs) -> Any:
+        return self.primary.rename_eval_run(*args, **kwargs)
+
+    def clear_cultural_knowledge(self, *args, **kwargs) -> Any:
+        return self.primary.clear_cultural_knowledge(*args, **kwargs)
+
+    def delete_cultural_knowledge(self, *args, **kwargs) -> Any:
+        return self.primary.delete_cultural_knowledge(*args, **kwargs)
+
+    def get_cultural_knowledge(self, *args, **kwargs) -> Any:
+        return self.primary.get_cultural_knowledge(*args, **kwargs)
+
+    def get_all_cultural_knowledge(self, *args, **kwargs) -> Any:
+        return self.primary.get_all_cultural_knowledge(*args, **kwargs)
+
+    def upsert_cultural_knowledge(self, *args, **kwargs) -> Any:
+        return self.primary.upsert_cultural_knowledge(*args, **kwargs)
@@ -0,0 +1,125 @@
+import dataclasses
+import json
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from agno.db.sqlite import SqliteDb
+from sqlalchemy import Table, create_engine, event, func, select, text
+from sqlalchemy.engine import Engine
+
+# Indexes agno's schema lacks: sessions by user, and by last update for retention
+EXTRA_INDEXES = {
+    "sessions": (("user_id", "updated_at"), ("updated_at",)),
+}
+
+
+def create_chat_engine(path: str, busy_timeout_ms: int = 5000, cache_size_mb: int = 16) -> Engine:
+    """
+    SQLAlchemy engine for a chat database file in write-ahead-log mode:
+    readers don't block the writer, and a commit appends to the log
+    instead of rewriting pages and syncing twice.
+    """
+    db_path = Path(path).resolve()
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    engine = create_engine(f"sqlite:///{db_path}")
+
+    @event.listens_for(engine, "connect")
+    def _tune(dbapi_connection, _record):
+        cursor = dbapi_connection.cursor()
+        # Only takes effect on a new file; lets prune() hand freed pages back
+        cursor.execute("PRAGMA auto_vacuum=INCREMENTAL")
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA busy_timeout={int(busy_timeout_ms)}")
+        cursor.execute(f"PRAGMA cache_size=-{int(cache_size_mb) * 1024}")
+        cursor.execute("PRAGMA temp_store=MEMORY")
+        cursor.close()
+
+    return engine
+
+
+class SharedSqliteDb(SqliteDb):
+    """
+    SqliteDb that can be shared by concurrent chat sessions.
+
+    SqliteDb re-checks and re-reflects a table into its single MetaData on
+    every read and write. Reflection into a shared MetaData from several
+    threads at once races (SQLAlchemy "Unconsumed column names" errors), and
+    repeating it on each call costs extra statements per turn. Each table is
+    resolved once, under a lock, and reused afterwards.
+
+    With ``max_runs`` a session is written with its last ``max_runs`` runs
+    only: agno rewrites a session's whole run list on every turn, so an
+    uncapped list makes each write larger than the last.
+    """
+
+    def __init__(self, *args, max_runs: int = 0, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.max_runs = max_runs
+        self._tables: Dict[str, Table] = {}
+        self._tables_lock = threading.Lock()
+
+    def _get_table(self, table_type: str, create_table_if_not_found: Optional[bool] = False) -> Optional[Table]:
+        table = self._tables.get(table_type)
+        if table is None:
+            with self._tables_lock:
+                table = self._tables.get(table_type)
+                if table is None:
+                    table = super()._get_table(table_type, create_table_if_not_found=create_table_if_not_found)
+                    if table is not None:
+                        self._create_extra_indexes(table_type, table)
+                        self._tables[table_type] = table
+        return table
+
+    def _create_extra_indexes(self, table_type: str, table: Table) -> None:
+        with self.db_engine.begin() as conn:
+            for columns in EXTRA_INDEXES.get(table_type, ()):
+                name = f"idx_{table.name}_{'_'.join(columns)}"
+                conn.execute(text(f'CREATE INDEX IF NOT EXISTS "{name}" ON "{table.name}" ({", ".join(columns)})'))
+
+    def _capped(self, session):
+        if self.max_runs and session.runs and len(session.runs) > self.max_runs:
+            return dataclasses.replace(session, runs=session.runs[-self.max_runs:])
+        return session
+
+    def upsert_session(self, session, deserialize: Optional[bool] = True):
+        return super().upsert_session(self._capped(session), deserialize=deserialize)
+
+    def upsert_sessions(self, sessions: List, deserialize: Optional[bool] = True, preserve_updated_at: bool = False):
+        return super().upsert_sessions(
+            [self._capped(session) for session in sessions], deserialize=deserialize, preserve_updated_at=preserve_updated_at
+        )
+
+    def prune(self, retention_days: float = 0, max_runs: int = 0) -> dict:
+        """
+        Delete sessions not updated for ``retention_days`` and cut the others
+        to their last ``max_runs`` runs (0 skips either), then hand the freed
+        pages back to the file system
+        """
+        pruned = {"sessions_deleted": 0, "sessions_trimmed": 0}
+        table = self._get_table("sessions")
+        if table is None:
+            return pruned
+        with self.Session() as sess, sess.begin():
+            if retention_days > 0:
+                cutoff = int(time.time() - retention_days * 86400)
+                last_update = func.coalesce(table.c.updated_at, table.c.created_at)
+                pruned["sessions_deleted"] = sess.execute(table.delete().where(last_update < cutoff)).rowcount
+            if max_runs > 0:
+                # agno writes the run list JSON-encoded into the JSON column, i.e. as a JSON string
+                run_count = func.json_array_length(func.json_extract(table.c.runs, "$"))
+                rows = sess.execute(select(table.c.session_id, table.c.runs).where(run_count > max_runs)).fetchall()
+                for session_id, runs in rows:
+                    encoded = isinstance(runs, str)
+                    kept = (json.loads(runs) if encoded else runs)[-max_runs:]
+                    sess.execute(
+                        table.update().where(table.c.session_id == session_id).values(runs=json.dumps(kept) if encoded else kept)
+                    )
+                pruned["sessions_trimmed"] = len(rows)
+        if any(pruned.values()):
+            with self.db_engine.connect() as conn:
+                conn.exec_driver_sql("PRAGMA incremental_vacuum")
+                conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        return pruned
@@ -0,0 +1,61 @@
+import json
+from inspect import isawaitable
+from typing import Any, Optional
+
+from telemetry.spans import Span, current_span, span
+
+
+def _shape(value: Any) -> str:
+    """Type and size of an argument, without its content (e.g. "str[56]", "list[12]")"""
+    if isinstance(value, (str, list, tuple, dict)):
+        return f"{type(value).__name__}[{len(value)}]"
+    return type(value).__name__
+
+
+def _record_count(result: Any) -> Optional[int]:
+    if not isinstance(result, dict):
+        return len(result) if isinstance(result, list) else None
+    if isinstance(result.get("total_returned"), int):
+        return result["total_returned"]
+    counts = [
+        len(value["rows"]) if isinstance(value, dict) and isinstance(value.get("rows"), list) else len(value)
+        for value in result.values()
+        if isinstance(value, list) or (isinstance(value, dict) and "rows" in value)
+    ]
+    return sum(counts) if counts else None
+
+
+def _start(function_name: str, arguments: dict, session_state: Optional[dict]):
+    run_id = (session_state or {}).get("current_run_id")
+    turn = current_span()
+    if turn is not None and turn.run_id is None and run_id:
+        turn.run_id = run_id
+    return span("tool", function_name, run_id=run_id, args={key: _shape(value) for key, value in arguments.items()})
+
+
+def _finish(tool_span: Span, result: Any) -> None:
+    try:
+        result_bytes = len(json.dumps(result, default=str))
+    except (TypeError, ValueError):
+        result_bytes = None
+    tool_span.set(records=_record_count(result), result_bytes=result_bytes)
+    if isinstance(result, dict) and result.get("error"):
+        tool_span.error = str(result["error"])[:500]
+
+
+def trace_tool_call(function_name: str, function_call, arguments: dict, session_state: Optional[dict] = None) -> Any:
+    """Agent tool hook (sync runs): record the call as a "tool" span"""
+    with _start(function_name, arguments, session_state) as tool_span:
+        result = function_call(**arguments)
+        _finish(tool_span, result)
+        return result
+
+
+async def atrace_tool_call(function_name: str, function_call, arguments: dict, session_state: Optional[dict] = None) -> Any:
+    """Agent tool hook (async runs): record the call as a "tool" span"""
+    with _start(function_name, arguments, session_state) as tool_span:
+        result = function_call(**arguments)
+        if isawaitable(result):
+            result = await result
+        _finish(tool_span, result)
+        return result
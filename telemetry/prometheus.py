@@ -0,0 +1,87 @@
+import os
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List
+
+from telemetry.spans import BUCKETS, Tracer
+
+
+def _escape(value) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _labels(**labels) -> str:
+    return "{" + ",".join(f'{key}="{_escape(value)}"' for key, value in labels.items()) + "}"
+
+
+def render_prometheus(tracer: Tracer) -> str:
+    """Prometheus text exposition of span latencies, errors and Horizon traffic"""
+    series, horizon, answers = tracer.metrics.snapshot()
+    lines: List[str] = [
+        "# HELP stellar_span_duration_seconds Duration of agent turns, tool calls and Horizon requests",
+        "# TYPE stellar_span_duration_seconds histogram",
+    ]
+    for (kind, name), values in sorted(series.items()):
+        count, _, seconds = values[:3]
+        for bound, bucket in zip(BUCKETS, values[3:]):
+            lines.append(f"stellar_span_duration_seconds_bucket{_labels(kind=kind, name=name, le=bound)} {bucket}")
+        lines.append(f"stellar_span_duration_seconds_bucket{_labels(kind=kind, name=name, le='+Inf')} {count}")
+        lines.append(f"stellar_span_duration_seconds_sum{_labels(kind=kind, name=name)} {seconds:.6f}")
+        lines.append(f"stellar_span_duration_seconds_count{_labels(kind=kind, name=name)} {count}")
+
+    lines += ["# HELP stellar_span_errors_total Spans that ended in an error", "# TYPE stellar_span_errors_total counter"]
+    for (kind, name), values in sorted(series.items()):
+        lines.append(f"stellar_span_errors_total{_labels(kind=kind, name=name)} {values[1]}")
+
+    lines += ["# HELP stellar_horizon_bytes_total Response bytes received from Horizon", "# TYPE stellar_horizon_bytes_total counter"]
+    for endpoint, (received, _, _, _) in sorted(horizon.items()):
+        lines.append(f"stellar_horizon_bytes_total{_labels(endpoint=endpoint)} {received}")
+
+    lines += [
+        "# HELP stellar_horizon_cache_total Horizon requests served from the response cache, missed in it, or coalesced into an identical in-flight request",
+        "# TYPE stellar_horizon_cache_total counter",
+    ]
+    for endpoint, (_, hits, misses, coalesced) in sorted(horizon.items()):
+        lines.append(f"stellar_horizon_cache_total{_labels(endpoint=endpoint, result='hit')} {hits}")
+        lines.append(f"stellar_horizon_cache_total{_labels(endpoint=endpoint, result='miss')} {misses}")
+        lines.append(f"stellar_horizon_cache_total{_labels(endpoint=endpoint, result='coalesced')} {coalesced}")
+
+    lines += [
+        "# HELP stellar_answer_cache_total Cacheable questions answered from the answer cache or missed in it",
+        "# TYPE stellar_answer_cache_total counter",
+    ]
+    for result, count in sorted(answers.items()):
+        lines.append(f"stellar_answer_cache_total{_labels(result=result)} {count}")
+    return "\n".join(lines) + "\n"
+
+
+def write_prometheus(path: str, tracer: Tracer) -> None:
+    """Atomically rewrite ``path`` (e.g. for node_exporter's textfile collector)"""
+    tmp = f"{path}.tmp"
+    with open(tmp, "w") as f:
+        f.write(render_prometheus(tracer))
+    os.replace(tmp, path)
+
+
+def serve_prometheus(port: int, tracer: Tracer, host: str = "127.0.0.1") -> ThreadingHTTPServer:
+    """Serve ``/metrics`` from a daemon thread"""
+
+    class Handler(BaseHTTPRequestHandler):
+        def log_message(self, *args):
+            pass
+
+        def do_GET(self):
+            if self.path.split("?")[0] != "/metrics":
+                self.send_error(404)
+                return
+            body = render_prometheus(tracer).encode()
+            self.send_response(200)
+            self.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+    server = ThreadingHTTPServer((host, port), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="prometheus-metrics", daemon=True).start()
+    return server
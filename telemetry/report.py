@@ -0,0 +1,178 @@
+import argparse
+import json
+import sqlite3
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime
+from typing import List, Optional
+
+import numpy as np
+
+from config.telemetry_config import get_telemetry_config
+
+
+def _percentile(values: List[float], q: float) -> float:
+    return round(float(np.percentile(values, q)), 1) if values else 0.0
+
+
+def slowest_turns(conn: sqlite3.Connection, since: float, limit: int) -> List[dict]:
+    """Slowest turns with the time spent in tools, in Horizon, and outside tools (model + framework)"""
+    turns = conn.execute(
+        "SELECT span_id, run_id, name, started_at, duration_ms, error FROM spans"
+        " WHERE kind = 'turn' AND started_at >= ? ORDER BY duration_ms DESC LIMIT ?",
+        (since, limit),
+    ).fetchall()
+    report = []
+    for span_id, run_id, name, started_at, duration_ms, error in turns:
+        tools = conn.execute(
+            "SELECT span_id, name, duration_ms, started_at FROM spans WHERE parent_id = ? AND kind = 'tool'",
+            (span_id,),
+        ).fetchall()
+        tool_ids = [tool[0] for tool in tools]
+        horizon_ms, horizon_requests = conn.execute(
+            f"SELECT COALESCE(SUM(duration_ms), 0), COUNT(*) FROM spans WHERE kind = 'horizon'"
+            f" AND parent_id IN ({','.join('?' * len(tool_ids))})",
+            tool_ids,
+        ).fetchone() if tool_ids else (0.0, 0)
+        # Tools may run in parallel: count wall time covered by at least one tool
+        intervals = sorted((tool[3], tool[3] + tool[2] / 1000) for tool in tools)
+        tool_wall, covered_until = 0.0, 0.0
+        for begin, end in intervals:
+            if end > covered_until:
+                tool_wall += end - max(begin, covered_until)
+                covered_until = end
+        report.append({
+            "started": datetime.fromtimestamp(started_at).strftime("%Y-%m-%d %H:%M:%S"),
+            "source": name,
+            "run_id": run_id,
+            "total_ms": round(duration_ms, 1),
+            "tool_ms": round(tool_wall * 1000, 1),
+            "horizon_ms": round(horizon_ms, 1),
+            "horizon_requests": horizon_requests,
+            "llm_and_overhead_ms": round(max(duration_ms - tool_wall * 1000, 0), 1),
+            "tools": [tool[1] for tool in sorted(tools, key=lambda tool: tool[3])],
+            "error": error,
+        })
+    return report
+
+
+def _by_name(conn: sqlite3.Connection, kind: str, since: float) -> dict:
+    groups = defaultdict(list)
+    for name, duration_ms, error, attrs in conn.execute(
+        "SELECT name, duration_ms, error, attrs FROM spans WHERE kind = ? AND started_at >= ?", (kind, since)
+    ):
+        groups[name].append((duration_ms, error, json.loads(attrs) if attrs else {}))
+    return groups
+
+
+def tool_latency(conn: sqlite3.Connection, since: float) -> List[dict]:
+    report = []
+    for name, calls in _by_name(conn, "tool", since).items():
+        durations = [call[0] for call in calls]
+        result_bytes = [call[2]["result_bytes"] for call in calls if call[2].get("result_bytes") is not None]
+        records = [call[2]["records"] for call in calls if call[2].get("records") is not None]
+        report.append({
+            "tool": name,
+            "calls": len(calls),
+            "errors": sum(1 for call in calls if call[1]),
+            "p50_ms": _percentile(durations, 50),
+            "p95_ms": _percentile(durations, 95),
+            "max_ms": round(max(durations), 1),
+            "avg_records": round(sum(records) / len(records), 1) if records else None,
+            "avg_kb": round(sum(result_bytes) / len(result_bytes) / 1024, 1) if result_bytes else None,
+        })
+    return sorted(report, key=lambda row: row["p95_ms"], reverse=True)
+
+
+def horizon_latency(conn: sqlite3.Connection, since: float) -> List[dict]:
+    report = []
+    for endpoint, requests_made in _by_name(conn, "horizon", since).items():
+        fetched = [request for request in requests_made if request[2].get("cache") not in ("hit", "coalesced")]
+        durations = [request[0] for request in fetched]
+        hits = sum(1 for request in requests_made if request[2].get("cache") == "hit")
+        coalesced = sum(1 for request in requests_made if request[2].get("cache") == "coalesced")
+        report.append({
+            "endpoint": endpoint,
+            "requests": len(requests_made),
+            "errors": sum(1 for request in requests_made if request[1]),
+            "p50_ms": _percentile(durations, 50),
+            "p95_ms": _percentile(durations, 95),
+            "cache_hit_rate": round(hits / len(requests_made), 3),
+            "coalesced": coalesced,
+            "kb_fetched": round(sum(request[2].get("bytes", 0) for request in fetched) / 1024, 1),
+        })
+    return sorted(report, key=lambda row: row["p95_ms"], reverse=True)
+
+
+def answer_cache(conn: sqlite3.Connection, since: float) -> dict:
+    """Hit rate of the answer cache over turns with a cacheable question, and latency of the hits"""
+    results = defaultdict(list)
+    for turns in _by_name(conn, "turn", since).values():
+        for duration_ms, _, attrs in turns:
+            if attrs.get("answer_cache"):
+                results[attrs["answer_cache"]].append(duration_ms)
+    lookups = len(results["hit"]) + len(results["miss"])
+    return {
+        "lookups": lookups,
+        "hits": len(results["hit"]),
+        "hit_rate": round(len(results["hit"]) / lookups, 3) if lookups else 0.0,
+        "hit_p50_ms": _percentile(results["hit"], 50),
+        "miss_p50_ms": _percentile(results["miss"], 50),
+    }
+
+
+def _print_table(title: str, rows: List[dict], columns: List[str]) -> None:
+    print(f"\n{title}")
+    if not rows:
+        print("  (no spans)")
+        return
+    widths = [max(len(column), *(len(str(row[column])) for row in rows)) for column in columns]
+    print("  " + "  ".join(column.ljust(width) for column, width in zip(columns, widths)))
+    for row in rows:
+        print("  " + "  ".join(str(row[column]).ljust(width) for column, width in zip(columns, widths)))
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description="Summarize recorded turn, tool and Horizon spans")
+    parser.add_argument("--db", default=get_telemetry_config()["db_path"], help="Trace database (default: TELEMETRY_DB_PATH)")
+    parser.add_argument("--limit", type=int, default=10, help="Number of slowest turns to show")
+    parser.add_argument("--hours", type=float, default=24, help="Only spans from the last N hours")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args(argv)
+
+    try:
+        conn = sqlite3.connect(f"file:{args.db}?mode=ro", uri=True)
+        since = time.time() - args.hours * 3600
+        report = {
+            "slowest_turns": slowest_turns(conn, since, args.limit),
+            "tools": tool_latency(conn, since),
+            "horizon": horizon_latency(conn, since),
+            "answer_cache": answer_cache(conn, since),
+        }
+    except sqlite3.Error as e:
+        print(f"Could not read traces from {args.db}: {e}", file=sys.stderr)
+        return 1
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return 0
+    turns = [{**turn, "tools": ",".join(turn["tools"]) or "-", "run_id": (turn["run_id"] or "-")[:8]} for turn in report["slowest_turns"]]
+    _print_table(
+        "Slowest turns (tool_ms is wall time with at least one tool running)", turns,
+        ["started", "source", "run_id", "total_ms", "llm_and_overhead_ms", "tool_ms", "horizon_ms", "horizon_requests", "tools"],
+    )
+    _print_table("Tools", report["tools"], ["tool", "calls", "errors", "p50_ms", "p95_ms", "max_ms", "avg_records", "avg_kb"])
+    _print_table(
+        "Horizon endpoints (latency excludes cache hits and coalesced requests)", report["horizon"],
+        ["endpoint", "requests", "errors", "p50_ms", "p95_ms", "cache_hit_rate", "coalesced", "kb_fetched"],
+    )
+    _print_table(
+        "Answer cache (turns with a cacheable question)", [report["answer_cache"]],
+        ["lookups", "hits", "hit_rate", "hit_p50_ms", "miss_p50_ms"],
+    )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
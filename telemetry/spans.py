@@ -0,0 +1,241 @@
+import atexit
+import json
+import logging
+import queue
+import re
+import sqlite3
+import threading
+import time
+import uuid
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, Iterator, List, Optional
+
+from config.telemetry_config import get_telemetry_config
+
+logger = logging.getLogger(__name__)
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS spans (
+    span_id TEXT PRIMARY KEY,
+    parent_id TEXT,
+    run_id TEXT,
+    kind TEXT NOT NULL,
+    name TEXT NOT NULL,
+    started_at REAL NOT NULL,
+    duration_ms REAL NOT NULL,
+    error TEXT,
+    attrs TEXT
+);
+CREATE INDEX IF NOT EXISTS spans_run ON spans (run_id);
+CREATE INDEX IF NOT EXISTS spans_parent ON spans (parent_id);
+CREATE INDEX IF NOT EXISTS spans_kind_name ON spans (kind, name, duration_ms);
+CREATE INDEX IF NOT EXISTS spans_started ON spans (started_at);
+"""
+
+# Histogram buckets (seconds) shared by every span kind
+BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Path segments that identify one object rather than an endpoint
+_IDENTIFIER_SEGMENT = re.compile(r"/(G[A-Z2-7]{55}|M[A-Z2-7]{68}|[0-9a-fA-F]{64}|\d+)(?=/|$)")
+
+_current_span: ContextVar[Optional["Span"]] = ContextVar("current_span", default=None)
+
+_tracer: Optional["Tracer"] = None
+_tracer_lock = threading.Lock()
+
+
+def endpoint_of(path: str) -> str:
+    """Horizon path with account ids, hashes and sequence numbers replaced by {id}"""
+    return _IDENTIFIER_SEGMENT.sub("/{id}", path.rstrip("/")) or "/"
+
+
+class Span:
+    """One timed unit of work: an agent turn, a tool call or a Horizon request"""
+
+    __slots__ = ("span_id", "parent_id", "run_id", "kind", "name", "started_at", "duration_ms", "error", "attrs")
+
+    def __init__(self, kind: str, name: str, parent: Optional["Span"] = None, **attrs):
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent.span_id if parent else None
+        self.run_id = parent.run_id if parent else None
+        self.kind = kind
+        self.name = name
+        self.started_at = time.time()
+        self.duration_ms = 0.0
+        self.error: Optional[str] = None
+        self.attrs: Dict[str, Any] = attrs
+
+    def set(self, **attrs) -> None:
+        self.attrs.update(attrs)
+
+    def row(self) -> tuple:
+        return (
+            self.span_id, self.parent_id, self.run_id, self.kind, self.name, self.started_at,
+            self.duration_ms, self.error, json.dumps(self.attrs, default=str) if self.attrs else None,
+        )
+
+
+class _Metrics:
+    """Aggregates finished spans into Prometheus-style counters and histograms"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (kind, name) -> [count, errors, seconds, bucket counts...]
+        self._series: Dict[tuple, List[float]] = {}
+        # endpoint -> [bytes, cache hits, cache misses, coalesced into another request]
+        self._horizon: Dict[str, List[int]] = {}
+        # Turns that looked their question up in the answer cache, by result
+        self._answers: Dict[str, int] = {"hit": 0, "miss": 0}
+
+    def observe(self, span: Span) -> None:
+        seconds = span.duration_ms / 1000
+        with self._lock:
+            series = self._series.setdefault((span.kind, span.name), [0, 0, 0.0] + [0] * len(BUCKETS))
+            series[0] += 1
+            series[1] += span.error is not None
+            series[2] += seconds
+            for i, bound in enumerate(BUCKETS):
+                if seconds <= bound:
+                    series[3 + i] += 1
+            if span.kind == "horizon":
+                horizon = self._horizon.setdefault(span.name, [0, 0, 0, 0])
+                cache = span.attrs.get("cache")
+                if cache not in ("hit", "coalesced"):
+                    horizon[0] += span.attrs.get("bytes", 0)
+                horizon[1] += cache == "hit"
+                horizon[2] += cache == "miss"
+                horizon[3] += cache == "coalesced"
+            if span.kind == "turn" and span.attrs.get("answer_cache") in self._answers:
+                self._answers[span.attrs["answer_cache"]] += 1
+
+    def snapshot(self) -> tuple:
+        with self._lock:
+            return (
+                {key: list(value) for key, value in self._series.items()},
+                {key: list(value) for key, value in self._horizon.items()},
+                dict(self._answers),
+            )
+
+
+class Tracer:
+    """
+    Collects finished spans.
+
+    Spans update in-memory metrics immediately and are queued for a
+    background writer that batches them into the SQLite ``spans`` table and
+    rewrites the Prometheus text file, so recording stays off the hot path.
+    """
+
+    def __init__(self, db_path: str = "", prometheus_file: str = "", flush_interval: float = 1.0, retention_days: float = 7):
+        self.db_path = db_path
+        self.prometheus_file = prometheus_file
+        self.flush_interval = flush_interval
+        self.metrics = _Metrics()
+        self._queue: "queue.SimpleQueue[Optional[Span]]" = queue.SimpleQueue()
+        self._conn: Optional[sqlite3.Connection] = None
+        if db_path:
+            self._conn = sqlite3.connect(db_path, check_same_thread=False)
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.executescript(_SCHEMA)
+            self._conn.execute("DELETE FROM spans WHERE started_at < ?", (time.time() - retention_days * 86400,))
+            self._conn.commit()
+        self._writer = threading.Thread(target=self._run, name="span-writer", daemon=True)
+        self._writer.start()
+
+    def record(self, span: Span) -> None:
+        self.metrics.observe(span)
+        self._queue.put(span)
+
+    def _run(self) -> None:
+        while True:
+            batch: List[Span] = []
+            deadline = time.monotonic() + self.flush_interval
+            stop = False
+            while len(batch) < 500:
+                try:
+                    span = self._queue.get(timeout=max(deadline - time.monotonic(), 0.001))
+                except queue.Empty:
+                    break
+                if span is None:
+                    stop = True
+                    break
+                batch.append(span)
+            self._flush(batch)
+            if stop:
+                return
+
+    def _flush(self, batch: List[Span]) -> None:
+        try:
+            if batch and self._conn is not None:
+                self._conn.executemany("INSERT OR REPLACE INTO spans VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", [s.row() for s in batch])
+                self._conn.commit()
+            if batch and self.prometheus_file:
+                from telemetry.prometheus import write_prometheus
+
+                write_prometheus(self.prometheus_file, self)
+        except (sqlite3.Error, OSError) as e:
+            logger.warning(f"Could not write spans: {e!r}")
+
+    def close(self) -> None:
+        """Flush queued spans and stop the writer"""
+        self._queue.put(None)
+        self._writer.join(timeout=5)
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
+
+
+def get_tracer() -> Optional[Tracer]:
+    """Return the process-wide tracer, or None when telemetry is disabled"""
+    global _tracer
+    if _tracer is None:
+        with _tracer_lock:
+            if _tracer is None:
+                config = get_telemetry_config()
+                if not config["enabled"]:
+                    return None
+                _tracer = Tracer(
+                    db_path=config["db_path"],
+                    prometheus_file=config["prometheus_file"],
+                    flush_interval=config["flush_interval"],
+                    retention_days=config["retention_days"],
+                )
+                atexit.register(_tracer.close)
+                if config["prometheus_port"]:
+                    from telemetry.prometheus import serve_prometheus
+
+                    serve_prometheus(config["prometheus_port"], _tracer)
+    return _tracer
+
+
+def current_span() -> Optional[Span]:
+    return _current_span.get()
+
+
+@contextmanager
+def span(kind: str, name: str, run_id: Optional[str] = None, **attrs) -> Iterator[Span]:
+    """
+    Time the enclosed block as a span of ``kind`` ("turn", "tool", "horizon").
+
+    The span becomes the parent of spans opened inside the block, including
+    those in worker threads and tasks that copy the context, and inherits its
+    parent's run id unless ``run_id`` is given. Exceptions are recorded as
+    the span's error and re-raised.
+    """
+    tracer = get_tracer()
+    current = Span(kind, name, parent=_current_span.get(), **attrs)
+    if run_id:
+        current.run_id = run_id
+    token = _current_span.set(current)
+    start = time.perf_counter()
+    try:
+        yield current
+    except BaseException as e:
+        current.error = repr(e)[:500]
+        raise
+    finally:
+        current.duration_ms = (time.perf_counter() - start) * 1000
+        _current_span.reset(token)
+        if tracer is not None:
+            tracer.record(current)
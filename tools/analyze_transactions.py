@@ -1,22 +1,74 @@
 from agno.tools.decorator import tool
+from analytics.transactions import analyze_transactions_records
+from horizon.client import get_server
+from horizon.history import get_history_index
+from horizon.pager import iter_records
+
+# Upper bound on transactions loaded from the local history index per analysis
+MAX_ANALYZED_TRANSACTIONS = 200_000
+# Upper bound on transactions streamed from Horizon while the index is still backfilling
+MAX_STREAMED_TRANSACTIONS = 10_000
 
 
 @tool()
-def analyze_transactions(transactions: list[dict]) -> str:
+def analyze_transactions(
+    transactions: list[dict] | dict = None,
+    account_id: str = None,
+    since: str = None,
+    until: str = None,
+    z_threshold: float = 3.0,
+) -> dict:
     """
     Analyse the transactions and identify potential anomalies.
+    Pass either the transactions returned by fetch_transactions / get_account_transactions,
+    or an account_id to analyse that account's most recent transactions (up to 200,000 from the
+    local index once it holds the full history, otherwise up to 10,000 streamed from Horizon).
+    
+    Args:
+        transactions: Transactions as a list of dicts (fee_charged, operation_count, source_account) or a tool result table (optional)
+        account_id: Public address of an account whose indexed history should be analysed (optional)
+        since: Only history at or after this ISO-8601 date/time, with account_id (optional)
+        until: Only history at or before this ISO-8601 date/time, with account_id (optional)
+        z_threshold: Z-score above which a fee or operation count is flagged (default: 3.0)
+    
+    Returns:
+        Dict with fee percentiles, operation-count distribution, success rate,
+        top source accounts and flagged anomalies. With account_id, "history_complete" tells
+        whether the local index held the full history and "truncated" whether older
+        transactions were left out of the analysis.
     """
-    if not transactions:
-        return "Nenhuma transação recente encontrada."
-
-    avg_fee = sum(int(tx["fee_charged"]) for tx in transactions) / len(transactions)
-    max_fee_tx = max(transactions, key=lambda t: int(t["fee_charged"]))
-
-    report = (
-        f"📊 Análise das últimas {len(transactions)} transações:\n"
-        f"• Média de fee: {avg_fee}\n"
-        f"• Maior fee: {max_fee_tx['fee_charged']} (tx {max_fee_tx['id'][:6]}...)\n"
-        f"• Transações totais: {len(transactions)}"
-    )
-
-    return report
+    try:
+        if isinstance(transactions, dict):
+            transactions = transactions.get("transactions", transactions)
+        if isinstance(transactions, dict) and "columns" in transactions:
+            # Tabular output of get_account_transactions
+            columns = transactions["columns"]
+            transactions = [dict(zip(columns, row)) for row in transactions["rows"]]
+        
+        coverage = {}
+        if account_id and not transactions:
+            index = get_history_index()
+            if index is None:
+                return {"error": "O índice local de histórico está desativado (STELLAR_HISTORY_INDEX_ENABLED=false)"}
+            complete = index.catch_up(account_id, "transactions")
+            if complete:
+                limit = MAX_ANALYZED_TRANSACTIONS
+                transactions = index.query(
+                    account_id, "transactions", limit=limit, desc=True, raw=True, since=since, until=until
+                )
+            else:
+                # The index only holds the oldest transactions so far (it backfills in the background);
+                # take the newest from Horizon
+                limit = MAX_STREAMED_TRANSACTIONS
+                builder = get_server().transactions().for_account(account_id)
+                transactions = list(iter_records(builder, max_records=limit, since=since, until=until))
+            # Newest window, analysed in chronological order
+            transactions.reverse()
+            coverage = {"history_complete": complete, "truncated": len(transactions) >= limit}
+        
+        if not transactions:
+            return {"error": "Nenhuma transação recente encontrada."}
+        
+        return {**analyze_transactions_records(transactions, z_threshold=z_threshold), **coverage}
+    except Exception as e:
+        return {"error": f"Erro ao analisar transações: {str(e)}"}
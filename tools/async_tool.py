@@ -0,0 +1,27 @@
+import asyncio
+
+from agno.tools.decorator import tool
+from agno.tools.function import Function
+
+
+def async_variant(sync_tool: Function):
+    """
+    Register an async implementation of a sync tool under the same name and
+    docstring, so the model sees one tool whichever variant the agent uses.
+    """
+
+    def decorator(func) -> Function:
+        func.__doc__ = sync_tool.entrypoint.__doc__
+        return tool(name=sync_tool.name)(func)
+
+    return decorator
+
+
+async def run_sync_tool(sync_tool: Function, **arguments):
+    """
+    Run a sync tool's implementation in a worker thread, for tools whose work
+    is blocking (SQLite, CPU). Arguments left as None fall back to the tool's
+    defaults, since the validated entrypoint rejects an explicit None.
+    """
+    arguments = {name: value for name, value in arguments.items() if value is not None}
+    return await asyncio.to_thread(sync_tool.entrypoint, **arguments)
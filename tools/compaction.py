@@ -0,0 +1,219 @@
+import json
+import re
+import threading
+import uuid
+from collections import Counter, OrderedDict
+from decimal import Decimal, InvalidOperation
+from inspect import isawaitable
+from typing import Any, Optional
+
+from agno.tools.decorator import tool
+from config.agent_config import get_compaction_config
+from tools.async_tool import async_variant, run_sync_tool
+
+# Rough size of one token in serialized JSON
+CHARS_PER_TOKEN = 4
+TOP_VALUES = 5
+MAX_PREVIEW_ROWS = 10
+MAX_PAGE_ROWS = 200
+
+_ISO_TIME = re.compile(r"^\d{4}-\d{2}-\d{2}T")
+# Columns whose values are unique references, not worth counting or summing
+_IDENTIFIER = re.compile(r"(^|_)(id|hash|paging_token|memo)$")
+
+_store: Optional["ResultStore"] = None
+_store_lock = threading.Lock()
+
+
+def estimate_tokens(value: Any) -> int:
+    return len(json.dumps(value, default=str)) // CHARS_PER_TOKEN
+
+
+class ResultStore:
+    """Bounded in-memory LRU of full tool results, addressed by handle"""
+
+    def __init__(self, max_results: int = 256):
+        self.max_results = max_results
+        self._results: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, result: dict) -> str:
+        handle = uuid.uuid4().hex[:12]
+        with self._lock:
+            self._results[handle] = result
+            while len(self._results) > self.max_results:
+                self._results.popitem(last=False)
+        return handle
+
+    def get(self, handle: str) -> Optional[dict]:
+        with self._lock:
+            result = self._results.get(handle)
+            if result is not None:
+                self._results.move_to_end(handle)
+            return result
+
+
+def get_result_store() -> ResultStore:
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                _store = ResultStore(get_compaction_config()["max_results"])
+    return _store
+
+
+def _as_table(value: Any) -> Optional[dict]:
+    """A tool-result table, or a list of dicts turned into one; None for anything else"""
+    if isinstance(value, dict) and "columns" in value and "rows" in value:
+        return value
+    if isinstance(value, list) and value and all(isinstance(item, dict) for item in value):
+        columns = list(dict.fromkeys(key for item in value for key in item))
+        return {"columns": columns, "rows": [[item.get(column) for column in columns] for item in value]}
+    return None
+
+
+def _decimal(value: Any) -> Optional[Decimal]:
+    if isinstance(value, bool) or value is None:
+        return None
+    try:
+        return Decimal(str(value))
+    except InvalidOperation:
+        return None
+
+
+def _summarize_column(values: list) -> Optional[dict]:
+    values = [value for value in values if value is not None]
+    if not values:
+        return None
+    if all(isinstance(value, str) and _ISO_TIME.match(value) for value in values):
+        return {"first": min(values), "last": max(values)}
+    numbers = [_decimal(value) for value in values]
+    if all(number is not None for number in numbers):
+        return {"sum": str(sum(numbers)), "min": str(min(numbers)), "max": str(max(numbers))}
+    counts = Counter(json.dumps(value, default=str) if isinstance(value, (dict, list)) else value for value in values)
+    return {"distinct": len(counts), "top": counts.most_common(TOP_VALUES)}
+
+
+def summarize_table(table: dict) -> dict:
+    """Counts, totals, time range and top values per column of a table"""
+    columns, rows = table["columns"], table["rows"]
+    summary = {}
+    for i, column in enumerate(columns):
+        if _IDENTIFIER.search(column):
+            continue
+        stats = _summarize_column([row[i] for row in rows])
+        if stats is not None:
+            summary[column] = stats
+    # Amounts only add up per asset
+    if "asset" in columns and "amount" in columns:
+        asset_i, amount_i = columns.index("asset"), columns.index("amount")
+        totals: dict = {}
+        for row in rows:
+            amount = _decimal(row[amount_i])
+            if amount is not None:
+                totals[row[asset_i]] = totals.get(row[asset_i], Decimal(0)) + amount
+        summary["amount_by_asset"] = {str(asset): str(total) for asset, total in totals.items()}
+        summary.pop("amount", None)
+    return summary
+
+
+def compact_result(result: Any, token_budget: int) -> Any:
+    """
+    Shrink a tool result to roughly ``token_budget`` tokens.
+
+    Results within budget pass through untouched. Otherwise the full result is
+    kept in the side store and every table in it is replaced by its row count,
+    a per-column summary and as many leading rows as fit the budget, together
+    with a ``result_handle`` for get_tool_result_page.
+    """
+    if not isinstance(result, dict) or estimate_tokens(result) <= token_budget:
+        return result
+    tables = {key: table for key, value in result.items() if (table := _as_table(value)) is not None}
+    if not tables:
+        return result
+
+    handle = get_result_store().put(result)
+    compacted = {key: value for key, value in result.items() if key not in tables}
+    compacted.update({
+        "compacted": True,
+        "result_handle": handle,
+        "note": "Large result summarized; use get_tool_result_page with result_handle to read more rows",
+    })
+    for key, table in tables.items():
+        compacted[key] = {
+            "total_rows": len(table["rows"]),
+            "summary": summarize_table(table),
+            "columns": table["columns"],
+            "rows": table["rows"][:MAX_PREVIEW_ROWS],
+        }
+
+    # Drop preview rows until the whole thing fits
+    preview = MAX_PREVIEW_ROWS
+    while preview > 0 and estimate_tokens(compacted) > token_budget:
+        preview //= 2
+        for key, table in tables.items():
+            compacted[key]["rows"] = table["rows"][:preview]
+    return compacted
+
+
+def _compact(function_name: str, result: Any) -> Any:
+    config = get_compaction_config()
+    if not config["enabled"] or function_name == get_tool_result_page.name:
+        return result
+    return compact_result(result, config["token_budget"])
+
+
+def compact_tool_output(function_name: str, function_call, arguments: dict) -> Any:
+    """Agent tool hook (sync runs): compact large tool results before they reach the model"""
+    return _compact(function_name, function_call(**arguments))
+
+
+async def acompact_tool_output(function_name: str, function_call, arguments: dict) -> Any:
+    """Agent tool hook (async runs): compact large tool results before they reach the model"""
+    result = function_call(**arguments)
+    if isawaitable(result):
+        result = await result
+    return _compact(function_name, result)
+
+
+@tool()
+def get_tool_result_page(result_handle: str, section: str = None, offset: int = 0, limit: int = 50) -> dict:
+    """
+    Reads rows of a large tool result that was compacted to a summary.
+    
+    Args:
+        result_handle: The result_handle returned with the compacted result
+        section: Which list to page through, e.g. "payments" or "effects" (optional if the result has only one)
+        offset: Index of the first row to return (default: 0)
+        limit: Maximum number of rows to return (default: 50, max: 200)
+    
+    Returns:
+        Dict with the requested rows as a table ("columns" header plus "rows")
+    """
+    result = get_result_store().get(result_handle)
+    if result is None:
+        return {"error": f"Resultado '{result_handle}' não encontrado ou expirado. Execute a consulta novamente."}
+    
+    tables = {key: table for key, value in result.items() if (table := _as_table(value)) is not None}
+    if section is None and len(tables) == 1:
+        section = next(iter(tables))
+    if section not in tables:
+        return {"error": f"Seção inválida '{section}'. Use uma de: {', '.join(tables)}"}
+    
+    table = tables[section]
+    rows = table["rows"][offset:offset + min(limit, MAX_PAGE_ROWS)]
+    return {
+        "result_handle": result_handle,
+        "section": section,
+        "total_rows": len(table["rows"]),
+        "offset": offset,
+        "total_returned": len(rows),
+        section: {"columns": table["columns"], "rows": rows},
+    }
+
+
+@async_variant(get_tool_result_page)
+async def aget_tool_result_page(result_handle: str, section: str = None, offset: int = 0, limit: int = 50) -> dict:
+    return await run_sync_tool(
+        get_tool_result_page, result_handle=result_handle, section=section, offset=offset, limit=limit
+    )
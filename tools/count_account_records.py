@@ -0,0 +1,87 @@
+from agno.tools.decorator import tool
+from horizon.client import get_server
+from horizon.history import RECORD_KINDS, get_history_index
+from horizon.pager import aggregate_records, iter_records
+from tools.async_tool import async_variant, run_sync_tool
+
+# Safety cap so a single question can't walk an exchange account forever
+MAX_COUNTED_RECORDS = 200_000
+
+
+@tool()
+def count_account_records(
+    account_id: str,
+    record_type: str = "transactions",
+    since: str = None,
+    until: str = None,
+    group_by: str = None,
+    sum_field: str = None,
+) -> dict:
+    """
+    Counts ALL records of a Stellar account over its full history (not limited to 200).
+    Use this to answer "how many transactions/payments/operations..." questions.
+    
+    Args:
+        account_id: Public address of the account
+        record_type: One of "transactions", "operations", "payments", "effects", "trades" (default: transactions)
+        since: Only count records at or after this ISO-8601 date/time (optional, e.g. "2024-01-01")
+        until: Only count records at or before this ISO-8601 date/time (optional)
+        group_by: Field to break the count down by, e.g. "type" or "successful" (optional)
+        sum_field: Numeric field to total, e.g. "amount" or "fee_charged" (optional)
+    
+    Returns:
+        Dict with the total count, first/last record time, ledger range and optional groups/sum.
+        "truncated" is true when the count stopped at the safety cap (the count is a lower bound).
+    """
+    try:
+        if record_type not in RECORD_KINDS:
+            return {"error": f"Invalid record_type '{record_type}'. Use one of: {', '.join(RECORD_KINDS)}"}
+        
+        index = get_history_index()
+        # A complete history only downloads records newer than its checkpoint. One still being
+        # backfilled (oldest first, in the background) is counted by streaming from Horizon
+        if index is not None and index.catch_up(account_id, record_type):
+            summary = index.summarize(
+                account_id, record_type, group_by=group_by, sum_field=sum_field, since=since, until=until
+            )
+            truncated = False
+        else:
+            builder = getattr(get_server(), record_type)().for_account(account_id)
+            summary = aggregate_records(
+                iter_records(builder, max_records=MAX_COUNTED_RECORDS, since=since, until=until),
+                group_by=group_by,
+                sum_field=sum_field,
+            )
+            truncated = summary["count"] >= MAX_COUNTED_RECORDS
+        
+        return {
+            "account_id": account_id,
+            "record_type": record_type,
+            "since": since,
+            "until": until,
+            "truncated": truncated,
+            **summary
+        }
+    except Exception as e:
+        return {"error": f"Error counting {record_type}: {str(e)}"}
+
+
+@async_variant(count_account_records)
+async def acount_account_records(
+    account_id: str,
+    record_type: str = "transactions",
+    since: str = None,
+    until: str = None,
+    group_by: str = None,
+    sum_field: str = None,
+) -> dict:
+    # The history index is SQLite-backed, keep it off the event loop
+    return await run_sync_tool(
+        count_account_records,
+        account_id=account_id,
+        record_type=record_type,
+        since=since,
+        until=until,
+        group_by=group_by,
+        sum_field=sum_field,
+    )
@@ -1,6 +1,5 @@
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.client import get_server
 
 
 @tool()
@@ -8,8 +7,7 @@ def fetch_transactions(limit: int = 10) -> dict:
     """
     Busca as transações mais recentes da rede Stellar.
     """
-    horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-    server = Server(horizon_url)
+    server = get_server()
     txs = server.transactions().order(desc=True).limit(limit).call()
 
     transactions = []
@@ -1,6 +1,21 @@
+from typing import Iterable
+
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from horizon.pager import MAX_RECORDS_PER_CALL, aiter_records, iter_records
+from tools.async_tool import async_variant
+from tools.records import EffectRecord, to_table
+
+
+def _format_effects(account_id: str, records: Iterable[dict]) -> dict:
+    rows = [EffectRecord.from_horizon(record) for record in records]
+    
+    return {
+        "account_id": account_id,
+        "total_returned": len(rows),
+        "effects": to_table(EffectRecord, rows)
+    }
 
 
 @tool()
@@ -11,48 +26,36 @@ def get_account_effects(account_id: str, limit: int = 10) -> dict:
     
     Args:
         account_id: Public address of the account
-        limit: Maximum number of effects to return (default: 10, max: 200)
+        limit: Maximum number of effects to return (default: 10, max: 1000)
     
     Returns:
-        Dict with list of effects
+        Dict with list of effects as a table ("columns" header plus "rows")
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
+        
+        # Follows paging_token cursors past Horizon's 200-records page cap
+        records = iter_records(
+            server.effects().for_account(account_id),
+            max_records=min(limit, MAX_RECORDS_PER_CALL),
+        )
         
-        effects = server.effects().for_account(account_id).limit(min(limit, 200)).order(desc=True).call()
+        return _format_effects(account_id, records)
+    except Exception as e:
+        return {"error": f"Error fetching effects: {str(e)}"}
+
+
+@async_variant(get_account_effects)
+async def aget_account_effects(account_id: str, limit: int = 10) -> dict:
+    try:
+        server = get_async_server()
         
-        effects_list = []
-        for effect in effects["_embedded"]["records"]:
-            effect_info = {
-                "type": effect["type"],
-                "created_at": effect["created_at"],
-            }
-            
-            # Add type-specific information
-            if effect["type"] in ["account_credited", "account_debited"]:
-                effect_info.update({
-                    "asset_type": effect.get("asset_type", "native"),
-                    "asset_code": effect.get("asset_code", "XLM"),
-                    "amount": effect.get("amount", "0")
-                })
-            elif effect["type"] == "account_created":
-                effect_info.update({
-                    "starting_balance": effect.get("starting_balance", "0")
-                })
-            elif effect["type"] in ["trustline_created", "trustline_removed", "trustline_updated"]:
-                effect_info.update({
-                    "asset_type": effect.get("asset_type"),
-                    "asset_code": effect.get("asset_code"),
-                    "limit": effect.get("limit", "N/A")
-                })
-            
-            effects_list.append(effect_info)
+        # Follows paging_token cursors past Horizon's 200-records page cap
+        records = [record async for record in aiter_records(
+            server.effects().for_account(account_id),
+            max_records=min(limit, MAX_RECORDS_PER_CALL),
+        )]
         
-        return {
-            "account_id": account_id,
-            "total_returned": len(effects_list),
-            "effects": effects_list
-        }
+        return _format_effects(account_id, records)
     except Exception as e:
         return {"error": f"Error fetching effects: {str(e)}"}
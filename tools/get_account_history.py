@@ -0,0 +1,109 @@
+from agno.tools.decorator import tool
+from horizon.history import RECORD_KINDS, get_history_index, scan_history
+from tools.async_tool import async_variant, run_sync_tool
+
+# Records read from Horizon per call while the local index is still backfilling
+MAX_SCANNED_RECORDS = 10_000
+
+
+@tool()
+def get_account_history(
+    account_id: str,
+    record_type: str = "payments",
+    since: str = None,
+    until: str = None,
+    operation_type: str = None,
+    counterparty: str = None,
+    asset: str = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> dict:
+    """
+    Searches the full history of a Stellar account with filters, using a local index that is
+    kept up to date incrementally. Use this for questions over a date range, a specific
+    counterparty, asset or operation type (e.g. "payments to GXXX... in March").
+    
+    Args:
+        account_id: Public address of the account
+        record_type: One of "transactions", "operations", "payments", "effects", "trades" (default: payments)
+        since: Only records at or after this ISO-8601 date/time (optional)
+        until: Only records at or before this ISO-8601 date/time (optional)
+        operation_type: Record type to filter by, e.g. "payment", "create_account", "account_credited" (optional)
+        counterparty: Other account involved (payment sender/receiver, trade counterparty) (optional)
+        asset: Asset code to filter by, e.g. "XLM" or "USDC" (optional)
+        limit: Maximum number of records to return, newest first (default: 20, max: 200)
+        offset: Number of matching records to skip, for paging through results (default: 0)
+    
+    Returns:
+        Dict with the number of matching records and the requested page of records. While the
+        local index is still downloading the account's history (history_complete false), the
+        newest 10,000 records are searched on Horizon instead; "truncated" is true when older
+        records were left out (the count is then a lower bound).
+    """
+    try:
+        if record_type not in RECORD_KINDS:
+            return {"error": f"Invalid record_type '{record_type}'. Use one of: {', '.join(RECORD_KINDS)}"}
+        
+        filters = {
+            "since": since,
+            "until": until,
+            "record_type": operation_type,
+            "counterparty": counterparty,
+            "asset": asset,
+        }
+        index = get_history_index()
+        complete = index is not None and index.catch_up(account_id, record_type)
+        if complete:
+            summary = index.summarize(account_id, record_type, **filters)
+            records = index.query(account_id, record_type, limit=min(limit, 200), offset=offset, **filters)
+            truncated = False
+        else:
+            # The index holds only the oldest records so far (it backfills in the background);
+            # read the newest ones from Horizon instead
+            summary = scan_history(
+                account_id, record_type, limit=min(limit, 200), offset=offset, max_records=MAX_SCANNED_RECORDS, **filters
+            )
+            records = summary["records"]
+            truncated = summary["truncated"]
+        
+        return {
+            "account_id": account_id,
+            "record_type": record_type,
+            "total_matching": summary["count"],
+            "first_at": summary["first_at"],
+            "last_at": summary["last_at"],
+            "history_complete": complete,
+            "truncated": truncated,
+            "offset": offset,
+            "total_returned": len(records),
+            "records": records
+        }
+    except Exception as e:
+        return {"error": f"Erro ao consultar o histórico da conta: {str(e)}"}
+
+
+@async_variant(get_account_history)
+async def aget_account_history(
+    account_id: str,
+    record_type: str = "payments",
+    since: str = None,
+    until: str = None,
+    operation_type: str = None,
+    counterparty: str = None,
+    asset: str = None,
+    limit: int = 20,
+    offset: int = 0,
+) -> dict:
+    # The history index is SQLite-backed, keep it off the event loop
+    return await run_sync_tool(
+        get_account_history,
+        account_id=account_id,
+        record_type=record_type,
+        since=since,
+        until=until,
+        operation_type=operation_type,
+        counterparty=counterparty,
+        asset=asset,
+        limit=limit,
+        offset=offset,
+    )
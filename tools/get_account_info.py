@@ -1,6 +1,25 @@
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from tools.async_tool import async_variant
+from tools.records import BalanceRecord, to_table
+
+
+def _format_account(account: dict) -> dict:
+    balances = [BalanceRecord.from_horizon(balance) for balance in account["balances"]]
+    
+    return {
+        "account_id": account["account_id"],
+        "sequence": account["sequence"],
+        "subentry_count": account["subentry_count"],
+        "home_domain": account.get("home_domain", ""),
+        "balances": to_table(BalanceRecord, balances),
+        "thresholds": account["thresholds"],
+        "flags": account["flags"],
+        "num_signers": len(account["signers"]),
+        "num_sponsoring": account.get("num_sponsoring", 0),
+        "num_sponsored": account.get("num_sponsored", 0)
+    }
 
 
 @tool()
@@ -12,48 +31,25 @@ def get_account_info(account_id: str) -> dict:
         account_id: Public address of the account (starts with G)
     
     Returns:
-        Dict with account information including balances, signers, thresholds, etc.
+        Dict with account information including balances (as a "columns" + "rows" table), signers, thresholds, etc.
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
         
         account = server.accounts().account_id(account_id).call()
         
-        balances_info = []
-        for balance in account["balances"]:
-            if balance["asset_type"] == "native":
-                balances_info.append({
-                    "asset": "XLM (Lumens)",
-                    "balance": balance["balance"],
-                    "buying_liabilities": balance.get("buying_liabilities", "0"),
-                    "selling_liabilities": balance.get("selling_liabilities", "0")
-                })
-            elif balance["asset_type"] == "liquidity_pool_shares":
-                balances_info.append({
-                    "type": "Liquidity Pool Share",
-                    "balance": balance["balance"],
-                    "liquidity_pool_id": balance.get("liquidity_pool_id", "")
-                })
-            else:
-                balances_info.append({
-                    "asset": f"{balance['asset_code']} (issuer: {balance['asset_issuer'][:8]}...)",
-                    "balance": balance["balance"],
-                    "limit": balance.get("limit", "N/A"),
-                    "is_authorized": balance.get("is_authorized", False)
-                })
+        return _format_account(account)
+    except Exception as e:
+        return {"error": f"Erro ao buscar informações da conta: {str(e)}"}
+
+
+@async_variant(get_account_info)
+async def aget_account_info(account_id: str) -> dict:
+    try:
+        server = get_async_server()
+        
+        account = await server.accounts().account_id(account_id).call()
         
-        return {
-            "account_id": account["account_id"],
-            "sequence": account["sequence"],
-            "subentry_count": account["subentry_count"],
-            "home_domain": account.get("home_domain", ""),
-            "balances": balances_info,
-            "thresholds": account["thresholds"],
-            "flags": account["flags"],
-            "num_signers": len(account["signers"]),
-            "num_sponsoring": account.get("num_sponsoring", 0),
-            "num_sponsored": account.get("num_sponsored", 0)
-        }
+        return _format_account(account)
     except Exception as e:
         return {"error": f"Erro ao buscar informações da conta: {str(e)}"}
@@ -1,6 +1,18 @@
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from tools.async_tool import async_variant
+from tools.records import OfferRecord, to_table
+
+
+def _format_offers(account_id: str, offers: dict) -> dict:
+    rows = [OfferRecord.from_horizon(offer) for offer in offers["_embedded"]["records"]]
+    
+    return {
+        "account_id": account_id,
+        "total_offers": len(rows),
+        "offers": to_table(OfferRecord, rows)
+    }
 
 
 @tool()
@@ -14,35 +26,25 @@ def get_account_offers(account_id: str, limit: int = 20) -> dict:
         limit: Maximum number of offers to return (default: 20, max: 200)
     
     Returns:
-        Dict with list of active offers
+        Dict with list of active offers as a table ("columns" header plus "rows")
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
         
         offers = server.offers().for_account(account_id).limit(min(limit, 200)).call()
         
-        offers_list = []
-        for offer in offers["_embedded"]["records"]:
-            selling = offer["selling"]
-            buying = offer["buying"]
-            
-            selling_asset = "XLM" if selling["asset_type"] == "native" else f"{selling['asset_code']}"
-            buying_asset = "XLM" if buying["asset_type"] == "native" else f"{buying['asset_code']}"
-            
-            offers_list.append({
-                "id": offer["id"],
-                "selling": selling_asset,
-                "buying": buying_asset,
-                "amount": offer["amount"],
-                "price": offer["price"],
-                "last_modified": offer.get("last_modified_time", "N/A")
-            })
+        return _format_offers(account_id, offers)
+    except Exception as e:
+        return {"error": f"Error fetching offers: {str(e)}"}
+
+
+@async_variant(get_account_offers)
+async def aget_account_offers(account_id: str, limit: int = 20) -> dict:
+    try:
+        server = get_async_server()
+        
+        offers = await server.offers().for_account(account_id).limit(min(limit, 200)).call()
         
-        return {
-            "account_id": account_id,
-            "total_offers": len(offers_list),
-            "offers": offers_list
-        }
+        return _format_offers(account_id, offers)
     except Exception as e:
         return {"error": f"Error fetching offers: {str(e)}"}
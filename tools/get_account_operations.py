@@ -1,6 +1,22 @@
+from typing import Iterable
+
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from horizon.pager import MAX_RECORDS_PER_CALL, aiter_records, iter_records
+from horizon.store import aremember_immutable, remember_immutable
+from tools.async_tool import async_variant
+from tools.records import OperationRecord, to_table
+
+
+def _format_operations(account_id: str, records: Iterable[dict]) -> dict:
+    rows = [OperationRecord.from_horizon(record) for record in records]
+    
+    return {
+        "account_id": account_id,
+        "total_returned": len(rows),
+        "operations": to_table(OperationRecord, rows)
+    }
 
 
 @tool()
@@ -10,33 +26,40 @@ def get_account_operations(account_id: str, limit: int = 10) -> dict:
     
     Args:
         account_id: Public address of the account
-        limit: Maximum number of operations to return (default: 10, max: 200)
+        limit: Maximum number of operations to return (default: 10, max: 1000)
     
     Returns:
-        Dict with list of recent operations
+        Dict with list of recent operations as a table ("columns" header plus "rows")
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
+        
+        # Follows paging_token cursors past Horizon's 200-records page cap
+        records = list(iter_records(
+            server.operations().for_account(account_id),
+            max_records=min(limit, MAX_RECORDS_PER_CALL),
+        ))
+        
+        remember_immutable("operation", {op["id"]: op for op in records})
+        
+        return _format_operations(account_id, records)
+    except Exception as e:
+        return {"error": f"Erro ao buscar operações: {str(e)}"}
+
+
+@async_variant(get_account_operations)
+async def aget_account_operations(account_id: str, limit: int = 10) -> dict:
+    try:
+        server = get_async_server()
         
-        operations = server.operations().for_account(account_id).limit(min(limit, 200)).order(desc=True).call()
+        # Follows paging_token cursors past Horizon's 200-records page cap
+        records = [record async for record in aiter_records(
+            server.operations().for_account(account_id),
+            max_records=min(limit, MAX_RECORDS_PER_CALL),
+        )]
         
-        operations_list = []
-        for op in operations["_embedded"]["records"]:
-            op_info = {
-                "id": op["id"],
-                "type": op["type"],
-                "created_at": op["created_at"],
-                "transaction_hash": op["transaction_hash"],
-                "source_account": op.get("source_account", "N/A")
-            }
-            
-            operations_list.append(op_info)
+        await aremember_immutable("operation", {op["id"]: op for op in records})
         
-        return {
-            "account_id": account_id,
-            "total_returned": len(operations_list),
-            "operations": operations_list
-        }
+        return _format_operations(account_id, records)
     except Exception as e:
         return {"error": f"Erro ao buscar operações: {str(e)}"}
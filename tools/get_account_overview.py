@@ -0,0 +1,52 @@
+from agno.tools.decorator import tool
+from horizon.concurrency import gather_limited, run_limited
+from tools.async_tool import async_variant
+from tools.get_account_info import aget_account_info, get_account_info
+from tools.get_account_offers import aget_account_offers, get_account_offers
+from tools.get_account_payments import aget_account_payments, get_account_payments
+from tools.get_account_trades import aget_account_trades, get_account_trades
+
+_SECTIONS = ("info", "offers", "trades", "payments")
+
+
+def _format_overview(account_id: str, results: list) -> dict:
+    overview = {"account_id": account_id}
+    for section, result in zip(_SECTIONS, results):
+        if isinstance(result, Exception):
+            result = {"error": str(result)}
+        overview[section] = result
+    return overview
+
+
+@tool()
+def get_account_overview(account_id: str, limit: int = 5) -> dict:
+    """
+    Retrieves a full picture of a Stellar account in one call: balances and account info,
+    active DEX offers, recent trades and recent payments. The requests run concurrently,
+    so prefer this over calling the four tools one after another.
+    
+    Args:
+        account_id: Public address of the account
+        limit: Maximum number of offers, trades and payments to include (default: 5)
+    
+    Returns:
+        Dict with "info", "offers", "trades" and "payments" sections
+    """
+    results = run_limited([
+        lambda: get_account_info.entrypoint(account_id),
+        lambda: get_account_offers.entrypoint(account_id, limit),
+        lambda: get_account_trades.entrypoint(account_id, limit),
+        lambda: get_account_payments.entrypoint(account_id, limit),
+    ])
+    return _format_overview(account_id, results)
+
+
+@async_variant(get_account_overview)
+async def aget_account_overview(account_id: str, limit: int = 5) -> dict:
+    results = await gather_limited(
+        aget_account_info.entrypoint(account_id),
+        aget_account_offers.entrypoint(account_id, limit),
+        aget_account_trades.entrypoint(account_id, limit),
+        aget_account_payments.entrypoint(account_id, limit),
+    )
+    return _format_overview(account_id, results)
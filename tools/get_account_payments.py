@@ -1,6 +1,21 @@
+from typing import Iterable
+
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from horizon.pager import MAX_RECORDS_PER_CALL, aiter_records, iter_records
+from tools.async_tool import async_variant
+from tools.records import PaymentRecord, to_table
+
+
+def _format_payments(account_id: str, records: Iterable[dict]) -> dict:
+    rows = [PaymentRecord.from_horizon(record) for record in records]
+    
+    return {
+        "account_id": account_id,
+        "total_returned": len(rows),
+        "payments": to_table(PaymentRecord, rows)
+    }
 
 
 @tool()
@@ -10,52 +25,36 @@ def get_account_payments(account_id: str, limit: int = 10) -> dict:
     
     Args:
         account_id: Public address of the account
-        limit: Maximum number of payments to return (default: 10, max: 200)
+        limit: Maximum number of payments to return (default: 10, max: 1000)
     
     Returns:
-        Dict with list of recent payments
+        Dict with list of recent payments as a table ("columns" header plus "rows")
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
+        
+        # Follows paging_token cursors past Horizon's 200-records page cap
+        records = iter_records(
+            server.payments().for_account(account_id),
+            max_records=min(limit, MAX_RECORDS_PER_CALL),
+        )
         
-        payments = server.payments().for_account(account_id).limit(min(limit, 200)).order(desc=True).call()
+        return _format_payments(account_id, records)
+    except Exception as e:
+        return {"error": f"Erro ao buscar pagamentos: {str(e)}"}
+
+
+@async_variant(get_account_payments)
+async def aget_account_payments(account_id: str, limit: int = 10) -> dict:
+    try:
+        server = get_async_server()
         
-        payments_list = []
-        for payment in payments["_embedded"]["records"]:
-            payment_info = {
-                "id": payment["id"],
-                "type": payment["type"],
-                "created_at": payment["created_at"],
-                "transaction_hash": payment["transaction_hash"]
-            }
-            
-            if payment["type"] == "payment":
-                payment_info.update({
-                    "from": payment.get("from", "N/A"),
-                    "to": payment.get("to", "N/A"),
-                    "asset_type": payment.get("asset_type", "native"),
-                    "asset_code": payment.get("asset_code", "XLM"),
-                    "amount": payment.get("amount", "0")
-                })
-            elif payment["type"] == "create_account":
-                payment_info.update({
-                    "funder": payment.get("funder", "N/A"),
-                    "account": payment.get("account", "N/A"),
-                    "starting_balance": payment.get("starting_balance", "0")
-                })
-            elif payment["type"] == "account_merge":
-                payment_info.update({
-                    "account": payment.get("account", "N/A"),
-                    "into": payment.get("into", "N/A")
-                })
-            
-            payments_list.append(payment_info)
+        # Follows paging_token cursors past Horizon's 200-records page cap
+        records = [record async for record in aiter_records(
+            server.payments().for_account(account_id),
+            max_records=min(limit, MAX_RECORDS_PER_CALL),
+        )]
         
-        return {
-            "account_id": account_id,
-            "total_returned": len(payments_list),
-            "payments": payments_list
-        }
+        return _format_payments(account_id, records)
     except Exception as e:
         return {"error": f"Erro ao buscar pagamentos: {str(e)}"}
@@ -1,6 +1,21 @@
+from typing import Iterable
+
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from horizon.pager import MAX_RECORDS_PER_CALL, aiter_records, iter_records
+from tools.async_tool import async_variant
+from tools.records import TradeRecord, to_table
+
+
+def _format_trades(account_id: str, records: Iterable[dict]) -> dict:
+    rows = [TradeRecord.from_horizon(record) for record in records]
+    
+    return {
+        "account_id": account_id,
+        "total_returned": len(rows),
+        "trades": to_table(TradeRecord, rows)
+    }
 
 
 @tool()
@@ -11,40 +26,36 @@ def get_account_trades(account_id: str, limit: int = 10) -> dict:
     
     Args:
         account_id: Public address of the account
-        limit: Maximum number of trades to return (default: 10, max: 200)
+        limit: Maximum number of trades to return (default: 10, max: 1000)
     
     Returns:
-        Dict with list of trades
+        Dict with list of trades as a table ("columns" header plus "rows")
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
+        
+        # Follows paging_token cursors past Horizon's 200-records page cap
+        records = iter_records(
+            server.trades().for_account(account_id),
+            max_records=min(limit, MAX_RECORDS_PER_CALL),
+        )
         
-        trades = server.trades().for_account(account_id).limit(min(limit, 200)).order(desc=True).call()
+        return _format_trades(account_id, records)
+    except Exception as e:
+        return {"error": f"Error fetching trades: {str(e)}"}
+
+
+@async_variant(get_account_trades)
+async def aget_account_trades(account_id: str, limit: int = 10) -> dict:
+    try:
+        server = get_async_server()
         
-        trades_list = []
-        for trade in trades["_embedded"]["records"]:
-            base_asset = trade["base_asset_type"]
-            counter_asset = trade["counter_asset_type"]
-            
-            base = "XLM" if base_asset == "native" else trade.get("base_asset_code", "Unknown")
-            counter = "XLM" if counter_asset == "native" else trade.get("counter_asset_code", "Unknown")
-            
-            trades_list.append({
-                "id": trade["id"],
-                "ledger_close_time": trade["ledger_close_time"],
-                "base_asset": base,
-                "counter_asset": counter,
-                "base_amount": trade["base_amount"],
-                "counter_amount": trade["counter_amount"],
-                "price": trade["price"]["n"] + "/" + trade["price"]["d"],
-                "trade_type": trade.get("trade_type", "orderbook")
-            })
+        # Follows paging_token cursors past Horizon's 200-records page cap
+        records = [record async for record in aiter_records(
+            server.trades().for_account(account_id),
+            max_records=min(limit, MAX_RECORDS_PER_CALL),
+        )]
         
-        return {
-            "account_id": account_id,
-            "total_returned": len(trades_list),
-            "trades": trades_list
-        }
+        return _format_trades(account_id, records)
     except Exception as e:
         return {"error": f"Error fetching trades: {str(e)}"}
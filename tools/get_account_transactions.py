@@ -1,6 +1,22 @@
+from typing import Iterable
+
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from horizon.pager import MAX_RECORDS_PER_CALL, aiter_records, iter_records
+from horizon.store import aremember_immutable, remember_immutable
+from tools.async_tool import async_variant
+from tools.records import TransactionRecord, to_table
+
+
+def _format_transactions(account_id: str, records: Iterable[dict]) -> dict:
+    rows = [TransactionRecord.from_horizon(record) for record in records]
+    
+    return {
+        "account_id": account_id,
+        "total_returned": len(rows),
+        "transactions": to_table(TransactionRecord, rows)
+    }
 
 
 @tool()
@@ -10,35 +26,40 @@ def get_account_transactions(account_id: str, limit: int = 10) -> dict:
     
     Args:
         account_id: Public address of the account
-        limit: Maximum number of transactions to return (default: 10, max: 200)
+        limit: Maximum number of transactions to return (default: 10, max: 1000)
     
     Returns:
-        Dict with list of transactions and metadata
+        Dict with list of transactions as a table ("columns" header plus "rows") and metadata
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
+        
+        # Follows paging_token cursors past Horizon's 200-records page cap
+        records = list(iter_records(
+            server.transactions().for_account(account_id),
+            max_records=min(limit, MAX_RECORDS_PER_CALL),
+        ))
+        
+        remember_immutable("transaction", {tx["hash"]: tx for tx in records})
+        
+        return _format_transactions(account_id, records)
+    except Exception as e:
+        return {"error": f"Error fetching transactions: {str(e)}"}
+
+
+@async_variant(get_account_transactions)
+async def aget_account_transactions(account_id: str, limit: int = 10) -> dict:
+    try:
+        server = get_async_server()
         
-        transactions = server.transactions().for_account(account_id).limit(min(limit, 200)).order(desc=True).call()
+        # Follows paging_token cursors past Horizon's 200-records page cap
+        records = [record async for record in aiter_records(
+            server.transactions().for_account(account_id),
+            max_records=min(limit, MAX_RECORDS_PER_CALL),
+        )]
         
-        tx_list = []
-        for tx in transactions["_embedded"]["records"]:
-            tx_list.append({
-                "hash": tx["hash"],
-                "ledger": tx["ledger"],
-                "created_at": tx["created_at"],
-                "source_account": tx["source_account"],
-                "fee_charged": tx["fee_charged"],
-                "operation_count": tx["operation_count"],
-                "successful": tx["successful"],
-                "memo_type": tx.get("memo_type", "none"),
-                "memo": tx.get("memo", "")
-            })
+        await aremember_immutable("transaction", {tx["hash"]: tx for tx in records})
         
-        return {
-            "account_id": account_id,
-            "total_returned": len(tx_list),
-            "transactions": tx_list
-        }
+        return _format_transactions(account_id, records)
     except Exception as e:
         return {"error": f"Error fetching transactions: {str(e)}"}
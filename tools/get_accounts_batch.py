@@ -0,0 +1,78 @@
+from agno.tools.decorator import tool
+from stellar_sdk.exceptions import NotFoundError
+
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from horizon.concurrency import gather_limited, run_limited
+from tools.async_tool import async_variant
+from tools.records import AccountSummaryRecord, to_table
+
+# Upper bound of addresses accepted in one call
+MAX_BATCH_ACCOUNTS = 200
+
+
+def _format_batch(account_ids: list, results: list) -> dict:
+    rows = []
+    errors = {}
+    for account_id, result in zip(account_ids, results):
+        if isinstance(result, NotFoundError):
+            errors[account_id] = "Conta não encontrada"
+        elif isinstance(result, Exception):
+            errors[account_id] = str(result)
+        else:
+            rows.append(AccountSummaryRecord.from_horizon(result))
+    
+    return {
+        "total_requested": len(account_ids),
+        "total_found": len(rows),
+        "accounts": to_table(AccountSummaryRecord, rows),
+        "errors": errors
+    }
+
+
+def _normalize_ids(account_ids: list) -> list:
+    return list(dict.fromkeys(a.strip() for a in account_ids if a and a.strip()))[:MAX_BATCH_ACCOUNTS]
+
+
+@tool()
+def get_accounts_batch(account_ids: list[str]) -> dict:
+    """
+    Retrieves balances and basic info for MANY Stellar accounts in a single call.
+    Use this instead of calling get_account_info repeatedly when comparing several wallets.
+    
+    Args:
+        account_ids: List of public addresses (starting with G), up to 200
+    
+    Returns:
+        Dict with one table row per account found (column names listed once)
+        and per-account errors (e.g. accounts that don't exist) that don't fail the batch
+    """
+    try:
+        account_ids = _normalize_ids(account_ids)
+        server = get_server()
+        
+        # Accounts are fetched concurrently through the shared (cached) client
+        results = run_limited([
+            lambda account_id=account_id: server.accounts().account_id(account_id).call()
+            for account_id in account_ids
+        ])
+        
+        return _format_batch(account_ids, results)
+    except Exception as e:
+        return {"error": f"Erro ao buscar contas em lote: {str(e)}"}
+
+
+@async_variant(get_accounts_batch)
+async def aget_accounts_batch(account_ids: list[str]) -> dict:
+    try:
+        account_ids = _normalize_ids(account_ids)
+        server = get_async_server()
+        
+        results = await gather_limited(*(
+            server.accounts().account_id(account_id).call()
+            for account_id in account_ids
+        ))
+        
+        return _format_batch(account_ids, results)
+    except Exception as e:
+        return {"error": f"Erro ao buscar contas em lote: {str(e)}"}
@@ -1,6 +1,36 @@
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from tools.async_tool import async_variant
+
+
+def _assets_builder(server, asset_code: str, asset_issuer: str, limit: int):
+    assets_builder = server.assets().for_code(asset_code)
+    
+    if asset_issuer:
+        assets_builder = assets_builder.for_issuer(asset_issuer)
+    
+    return assets_builder.limit(min(limit, 200))
+
+
+def _format_assets(asset_code: str, assets: dict) -> dict:
+    assets_list = []
+    for asset in assets["_embedded"]["records"]:
+        assets_list.append({
+            "asset_type": asset["asset_type"],
+            "asset_code": asset["asset_code"],
+            "asset_issuer": asset["asset_issuer"],
+            "accounts": asset["accounts"]["authorized"],
+            "num_claimable_balances": asset.get("num_claimable_balances", 0),
+            "amount": asset["amount"],
+            "flags": asset["flags"]
+        })
+    
+    return {
+        "asset_code": asset_code,
+        "total_found": len(assets_list),
+        "assets": assets_list
+    }
 
 
 @tool()
@@ -17,32 +47,22 @@ def get_asset_info(asset_code: str, asset_issuer: str = None, limit: int = 10) -
         Dict with information about the asset(s)
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
         
-        assets_builder = server.assets().for_code(asset_code)
+        assets = _assets_builder(server, asset_code, asset_issuer, limit).call()
         
-        if asset_issuer:
-            assets_builder = assets_builder.for_issuer(asset_issuer)
-        
-        assets = assets_builder.limit(min(limit, 200)).call()
+        return _format_assets(asset_code, assets)
+    except Exception as e:
+        return {"error": f"Erro ao buscar informações do ativo: {str(e)}"}
+
+
+@async_variant(get_asset_info)
+async def aget_asset_info(asset_code: str, asset_issuer: str = None, limit: int = 10) -> dict:
+    try:
+        server = get_async_server()
         
-        assets_list = []
-        for asset in assets["_embedded"]["records"]:
-            assets_list.append({
-                "asset_type": asset["asset_type"],
-                "asset_code": asset["asset_code"],
-                "asset_issuer": asset["asset_issuer"],
-                "accounts": asset["accounts"]["authorized"],
-                "num_claimable_balances": asset.get("num_claimable_balances", 0),
-                "amount": asset["amount"],
-                "flags": asset["flags"]
-            })
+        assets = await _assets_builder(server, asset_code, asset_issuer, limit).call()
         
-        return {
-            "asset_code": asset_code,
-            "total_found": len(assets_list),
-            "assets": assets_list
-        }
+        return _format_assets(asset_code, assets)
     except Exception as e:
         return {"error": f"Erro ao buscar informações do ativo: {str(e)}"}
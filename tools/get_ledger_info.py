@@ -1,6 +1,33 @@
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from horizon.ingester import get_ledger_ingester
+from horizon.store import afetch_immutable, aremember_immutable, fetch_immutable, remember_immutable
+from tools.async_tool import async_variant
+
+
+def _format_ledger(ledger: dict) -> dict:
+    return {
+        "sequence": ledger["sequence"],
+        "hash": ledger["hash"],
+        "closed_at": ledger["closed_at"],
+        "successful_transaction_count": ledger.get("successful_transaction_count", 0),
+        "failed_transaction_count": ledger.get("failed_transaction_count", 0),
+        "operation_count": ledger["operation_count"],
+        "total_coins": ledger["total_coins"],
+        "fee_pool": ledger["fee_pool"],
+        "base_fee_in_stroops": ledger["base_fee_in_stroops"],
+        "base_reserve_in_stroops": ledger["base_reserve_in_stroops"],
+        "protocol_version": ledger["protocol_version"]
+    }
+
+
+def _latest_from_ingester() -> dict:
+    """The newest ledger from the live stream, or None when it is not fresh"""
+    ingester = get_ledger_ingester()
+    if ingester is None or not ingester.is_fresh():
+        return None
+    return ingester.latest()
 
 
 @tool()
@@ -15,27 +42,35 @@ def get_ledger_info(ledger_sequence: int = None) -> dict:
         Dict with ledger information
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
         
         if ledger_sequence:
-            ledger = server.ledgers().ledger(ledger_sequence).call()
-        else:
+            # A ledger returned by sequence is already closed and immutable
+            ledger = fetch_immutable("ledger", ledger_sequence, lambda: server.ledgers().ledger(ledger_sequence).call())
+        elif (ledger := _latest_from_ingester()) is None:
             ledgers = server.ledgers().order(desc=True).limit(1).call()
             ledger = ledgers["_embedded"]["records"][0]
+            remember_immutable("ledger", {ledger["sequence"]: ledger})
+        
+        return _format_ledger(ledger)
+    except Exception as e:
+        return {"error": f"Erro ao buscar informações do ledger: {str(e)}"}
+
+
+@async_variant(get_ledger_info)
+async def aget_ledger_info(ledger_sequence: int = None) -> dict:
+    try:
+        server = get_async_server()
+        
+        if ledger_sequence:
+            ledger = await afetch_immutable(
+                "ledger", ledger_sequence, lambda: server.ledgers().ledger(ledger_sequence).call()
+            )
+        elif (ledger := _latest_from_ingester()) is None:
+            ledgers = await server.ledgers().order(desc=True).limit(1).call()
+            ledger = ledgers["_embedded"]["records"][0]
+            await aremember_immutable("ledger", {ledger["sequence"]: ledger})
         
-        return {
-            "sequence": ledger["sequence"],
-            "hash": ledger["hash"],
-            "closed_at": ledger["closed_at"],
-            "successful_transaction_count": ledger.get("successful_transaction_count", 0),
-            "failed_transaction_count": ledger.get("failed_transaction_count", 0),
-            "operation_count": ledger["operation_count"],
-            "total_coins": ledger["total_coins"],
-            "fee_pool": ledger["fee_pool"],
-            "base_fee_in_stroops": ledger["base_fee_in_stroops"],
-            "base_reserve_in_stroops": ledger["base_reserve_in_stroops"],
-            "protocol_version": ledger["protocol_version"]
-        }
+        return _format_ledger(ledger)
     except Exception as e:
         return {"error": f"Erro ao buscar informações do ledger: {str(e)}"}
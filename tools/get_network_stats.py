@@ -1,50 +1,98 @@
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from horizon.concurrency import gather_limited
+from horizon.ingester import get_ledger_ingester
+from tools.async_tool import async_variant
+
+
+def _format_network_stats(fee_stats: dict, latest_ledger: dict, trends: dict = None, fee_stats_age: float = None) -> dict:
+    stats = {
+        "latest_ledger": {
+            "sequence": latest_ledger["sequence"],
+            "closed_at": latest_ledger["closed_at"],
+            "successful_transactions": latest_ledger.get("successful_transaction_count", 0),
+            "failed_transactions": latest_ledger.get("failed_transaction_count", 0),
+            "operations": latest_ledger["operation_count"],
+            "total_coins": latest_ledger["total_coins"],
+            "protocol_version": latest_ledger["protocol_version"]
+        },
+        "fee_stats": {
+            "last_ledger_base_fee": fee_stats["last_ledger_base_fee"],
+            "ledger_capacity_usage": fee_stats.get("ledger_capacity_usage", "N/A"),
+            "fee_charged_min": fee_stats["fee_charged"]["min"],
+            "fee_charged_mode": fee_stats["fee_charged"]["mode"],
+            "fee_charged_p50": fee_stats["fee_charged"]["p50"],
+            "fee_charged_p95": fee_stats["fee_charged"]["p95"],
+            "fee_charged_p99": fee_stats["fee_charged"]["p99"],
+            "max_fee_p50": fee_stats["max_fee"]["p50"],
+            "max_fee_p95": fee_stats["max_fee"]["p95"]
+        },
+        "base_reserve": latest_ledger.get("base_reserve_in_stroops", "N/A")
+    }
+    if fee_stats_age is not None:
+        stats["fee_stats"]["age_seconds"] = round(fee_stats_age, 1)
+    if trends:
+        stats["recent_trends"] = trends
+    return stats
+
+
+def _fresh_ingester():
+    """The live ledger stream, or None when it is off or behind"""
+    ingester = get_ledger_ingester()
+    return ingester if ingester is not None and ingester.is_fresh() else None
+
+
+def _from_ingester(ingester, fee_stats: dict = None) -> dict:
+    """Network stats from the live ledger stream; ``fee_stats`` replaces its own when they were too old"""
+    if fee_stats is not None:
+        ingester.record_fee_stats(fee_stats)
+    return _format_network_stats(ingester.fee_stats(), ingester.latest(), ingester.trends(), ingester.fee_stats_age())
 
 
 @tool()
 def get_network_stats() -> dict:
     """
     Retrieves current Stellar network statistics and status.
-    Shows fee stats, recent ledger information, and network activity.
+    Shows fee stats, recent ledger information, and network activity
+    (TPS, failed transaction rate and fee trends over the last few minutes
+    when the live ledger stream is running).
     
     Returns:
         Dict with network statistics
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
+        ingester = _fresh_ingester()
+        if ingester is not None:
+            return _from_ingester(ingester, None if ingester.fees_fresh() else server.fee_stats().call())
         
         # Get fee stats
         fee_stats = server.fee_stats().call()
         
         # Get latest ledger
         ledgers = server.ledgers().order(desc=True).limit(1).call()
-        latest_ledger = ledgers["_embedded"]["records"][0]
         
-        return {
-            "latest_ledger": {
-                "sequence": latest_ledger["sequence"],
-                "closed_at": latest_ledger["closed_at"],
-                "successful_transactions": latest_ledger.get("successful_transaction_count", 0),
-                "failed_transactions": latest_ledger.get("failed_transaction_count", 0),
-                "operations": latest_ledger["operation_count"],
-                "total_coins": latest_ledger["total_coins"],
-                "protocol_version": latest_ledger["protocol_version"]
-            },
-            "fee_stats": {
-                "last_ledger_base_fee": fee_stats["last_ledger_base_fee"],
-                "ledger_capacity_usage": fee_stats.get("ledger_capacity_usage", "N/A"),
-                "fee_charged_min": fee_stats["fee_charged"]["min"],
-                "fee_charged_mode": fee_stats["fee_charged"]["mode"],
-                "fee_charged_p50": fee_stats["fee_charged"]["p50"],
-                "fee_charged_p95": fee_stats["fee_charged"]["p95"],
-                "fee_charged_p99": fee_stats["fee_charged"]["p99"],
-                "max_fee_p50": fee_stats["max_fee"]["p50"],
-                "max_fee_p95": fee_stats["max_fee"]["p95"]
-            },
-            "base_reserve": latest_ledger.get("base_reserve_in_stroops", "N/A")
-        }
+        return _format_network_stats(fee_stats, ledgers["_embedded"]["records"][0])
+    except Exception as e:
+        return {"error": f"Error fetching network stats: {str(e)}"}
+
+
+@async_variant(get_network_stats)
+async def aget_network_stats() -> dict:
+    try:
+        server = get_async_server()
+        ingester = _fresh_ingester()
+        if ingester is not None:
+            return _from_ingester(ingester, None if ingester.fees_fresh() else await server.fee_stats().call())
+        
+        # Fee stats and latest ledger are independent, fetch both at once
+        fee_stats, ledgers = await gather_limited(
+            server.fee_stats().call(),
+            server.ledgers().order(desc=True).limit(1).call(),
+            return_exceptions=False,
+        )
+        
+        return _format_network_stats(fee_stats, ledgers["_embedded"]["records"][0])
     except Exception as e:
         return {"error": f"Error fetching network stats: {str(e)}"}
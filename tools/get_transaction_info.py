@@ -1,6 +1,24 @@
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from horizon.store import afetch_immutable, fetch_immutable
+from tools.async_tool import async_variant
+
+
+def _format_transaction(tx: dict) -> dict:
+    return {
+        "hash": tx["hash"],
+        "ledger": tx["ledger"],
+        "created_at": tx["created_at"],
+        "source_account": tx["source_account"],
+        "fee_charged": tx["fee_charged"],
+        "max_fee": tx["max_fee"],
+        "operation_count": tx["operation_count"],
+        "successful": tx["successful"],
+        "memo_type": tx.get("memo_type", "none"),
+        "memo": tx.get("memo", ""),
+        "signatures": len(tx.get("signatures", []))
+    }
 
 
 @tool()
@@ -15,23 +33,31 @@ def get_transaction_info(transaction_hash: str) -> dict:
         Dict with detailed transaction information
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
+        
+        # Transactions never change once included in a ledger
+        tx = fetch_immutable(
+            "transaction",
+            transaction_hash,
+            lambda: server.transactions().transaction(transaction_hash).call(),
+        )
+        
+        return _format_transaction(tx)
+    except Exception as e:
+        return {"error": f"Erro ao buscar informações da transação: {str(e)}"}
+
+
+@async_variant(get_transaction_info)
+async def aget_transaction_info(transaction_hash: str) -> dict:
+    try:
+        server = get_async_server()
         
-        tx = server.transactions().transaction(transaction_hash).call()
+        tx = await afetch_immutable(
+            "transaction",
+            transaction_hash,
+            lambda: server.transactions().transaction(transaction_hash).call(),
+        )
         
-        return {
-            "hash": tx["hash"],
-            "ledger": tx["ledger"],
-            "created_at": tx["created_at"],
-            "source_account": tx["source_account"],
-            "fee_charged": tx["fee_charged"],
-            "max_fee": tx["max_fee"],
-            "operation_count": tx["operation_count"],
-            "successful": tx["successful"],
-            "memo_type": tx.get("memo_type", "none"),
-            "memo": tx.get("memo", ""),
-            "signatures": len(tx.get("signatures", []))
-        }
+        return _format_transaction(tx)
     except Exception as e:
         return {"error": f"Erro ao buscar informações da transação: {str(e)}"}
@@ -0,0 +1,174 @@
+import asyncio
+import contextvars
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from inspect import isawaitable
+from types import MethodType
+from typing import Any, List, Optional
+
+from agno.models.response import ModelResponse, ModelResponseEvent, ToolExecution
+from config.agent_config import get_tool_execution_config
+
+
+def _timeout_message(function_name: str, timeout: float) -> str:
+    return f"{function_name} did not finish within {timeout:g}s"
+
+
+def _runs_unattended(function_call) -> bool:
+    """False for calls agno pauses on (confirmation, user input, external execution)"""
+    function = function_call.function
+    return not (
+        function.requires_confirmation
+        or function.requires_user_input
+        or function.external_execution
+        or function.name == "get_user_input"
+    )
+
+
+def run_function_calls_concurrently(
+    model,
+    function_calls: List[Any],
+    function_call_results: List[Any],
+    additional_input: Optional[List[Any]] = None,
+    current_function_call_count: int = 0,
+    function_call_limit: Optional[int] = None,
+):
+    """
+    Drop-in for agno's ``Model.run_function_calls`` running the tool calls of
+    one model response concurrently in sync runs.
+
+    agno already gathers the calls of a response in async runs but runs them
+    one after another in sync runs. Here each call goes through agno's own
+    ``run_function_call`` on a bounded per-response thread pool. Every
+    call's started event goes out as soon as the calls are submitted; the
+    rest of the events and the result messages are replayed in the order
+    the model asked for them. A call that raises, or is still running
+    ``timeout`` seconds after its turn to be collected, becomes an error
+    result for that call alone. Responses with paused calls or calls over
+    the tool call limit take agno's sequential path.
+
+    agno's control flow (``StopAgentRun``, ``RetryAgentRun``) never raises
+    out of ``run_function_call``: it becomes extra messages, flagged
+    ``stop_after_tool_call`` to stop the run, which agno's loop reads from
+    ``function_call_results``. Each call collects its own messages, handed
+    on in call order after the results as the sequential path does. Once a
+    collected call stops the run, calls still running aren't waited for:
+    they get an error result, since agno ends the run after this response.
+    """
+    model_class = type(model)
+    config = get_tool_execution_config()
+    over_limit = function_call_limit is not None and current_function_call_count + len(function_calls) > function_call_limit
+    if not config["parallel"] or over_limit or not all(map(_runs_unattended, function_calls)):
+        yield from model_class.run_function_calls(
+            model, function_calls, function_call_results, additional_input, current_function_call_count, function_call_limit
+        )
+        return
+
+    if additional_input is None:
+        additional_input = []
+
+    def run_collected(function_call) -> tuple:
+        results: List[Any] = []
+        call_input: List[Any] = []
+        events = list(model_class.run_function_call(
+            model, function_call=function_call, function_call_results=results, additional_input=call_input
+        ))
+        # The started event was already sent when the call was submitted
+        if events and getattr(events[0], "event", None) == ModelResponseEvent.tool_call_started.value:
+            events = events[1:]
+        return events, results, call_input
+
+    pool = ThreadPoolExecutor(max_workers=max(min(len(function_calls), config["max_parallel"]), 1), thread_name_prefix="tool-call")
+    # Each call runs in a copy of this context, so its spans nest under the current turn
+    futures = [pool.submit(contextvars.copy_context().run, run_collected, function_call) for function_call in function_calls]
+    # Don't wait for calls that time out; their threads finish on their own
+    pool.shutdown(wait=False)
+    for function_call in function_calls:
+        yield _started_event(function_call)
+
+    stopped = False
+    for function_call, future in zip(function_calls, futures):
+        call_input: List[Any] = []
+        try:
+            if stopped and not future.done():
+                future.cancel()
+                message = f"{function_call.function.name} was not waited for: an earlier tool call stopped the run"
+                events, results = _failed_call(model, function_call, message)
+            else:
+                events, results, call_input = future.result(timeout=config["timeout"])
+        except FutureTimeoutError:
+            events, results = _failed_call(model, function_call, _timeout_message(function_call.function.name, config["timeout"]))
+        except Exception as e:
+            events, results = _failed_call(model, function_call, f"{function_call.function.name} failed: {e!r}")
+        yield from events
+        function_call_results.extend(results)
+        additional_input.extend(call_input)
+        stopped = stopped or _stops_run(events, results + call_input)
+
+    if additional_input:
+        function_call_results.extend(additional_input)
+
+
+def _stops_run(events: List[Any], messages: List[Any]) -> bool:
+    """Whether a call's events or messages end the run after this response, as agno's loop checks"""
+    if any(getattr(message, "stop_after_tool_call", False) for message in messages):
+        return True
+    return any(
+        execution.stop_after_tool_call
+        for event in events
+        if getattr(event, "event", None) == ModelResponseEvent.tool_call_completed.value
+        for execution in event.tool_executions or []
+    )
+
+
+def _execution(function_call, **fields) -> ToolExecution:
+    return ToolExecution(
+        tool_call_id=function_call.call_id, tool_name=function_call.function.name, tool_args=function_call.arguments, **fields
+    )
+
+
+def _started_event(function_call) -> ModelResponse:
+    """The tool_call_started event agno's ``run_function_call`` opens with"""
+    return ModelResponse(
+        content=function_call.get_call_str(),
+        tool_executions=[_execution(function_call)],
+        event=ModelResponseEvent.tool_call_started.value,
+    )
+
+
+def _failed_call(model, function_call, message: str) -> tuple:
+    """The completion event and result message agno would produce for a call that failed with ``message``"""
+    function_call.error = message
+    result = model.create_function_call_result(function_call, success=False)
+    events = [
+        ModelResponse(
+            content=f"{function_call.get_call_str()} failed: {message}. ",
+            tool_executions=[_execution(function_call, tool_call_error=True, result=message)],
+            event=ModelResponseEvent.tool_call_completed.value,
+        ),
+    ]
+    return events, [result]
+
+
+def with_parallel_tool_calls(model):
+    """Make ``model`` (in place) run the tool calls of one response concurrently; returns it"""
+    if "run_function_calls" not in vars(model):
+        model.run_function_calls = MethodType(run_function_calls_concurrently, model)
+    return model
+
+
+async def aguard_tool_call(function_name: str, function_call, arguments: dict) -> Any:
+    """
+    Agent tool hook (async runs): a call that raises or exceeds the timeout
+    returns an error result instead of failing the other calls gathered with it
+    """
+    timeout = get_tool_execution_config()["timeout"]
+    try:
+        result = function_call(**arguments)
+        if isawaitable(result):
+            result = await asyncio.wait_for(result, timeout)
+        return result
+    except asyncio.TimeoutError:
+        return {"error": _timeout_message(function_name, timeout)}
+    except Exception as e:
+        return {"error": f"{function_name} failed: {e!r}"}
@@ -0,0 +1,192 @@
+from typing import Iterable, Optional, Type
+
+
+def asset_label(asset_type: str, asset_code: Optional[str] = None, asset_issuer: Optional[str] = None) -> str:
+    """Short human-readable asset name: XLM, CODE or CODE (issuer: GABCDEFG...)"""
+    if asset_type == "native":
+        return "XLM"
+    if asset_issuer:
+        return f"{asset_code} (issuer: {asset_issuer[:8]}...)"
+    return asset_code or asset_type
+
+
+class Record:
+    """
+    Base for compact tool-result records.
+
+    Fields are declared in ``__slots__`` so instances carry no per-object dict,
+    and a list of records serializes to a single header row plus value rows
+    instead of repeating every key in every record.
+    """
+
+    __slots__ = ()
+
+    def __init__(self, *values):
+        for name, value in zip(self.__slots__, values):
+            setattr(self, name, value)
+
+    def row(self) -> list:
+        return [getattr(self, name) for name in self.__slots__]
+
+    @classmethod
+    def from_horizon(cls, record: dict) -> "Record":
+        raise NotImplementedError
+
+
+class TransactionRecord(Record):
+    __slots__ = ("hash", "ledger", "created_at", "source_account", "fee_charged",
+                 "operation_count", "successful", "memo_type", "memo")
+
+    @classmethod
+    def from_horizon(cls, tx: dict) -> "TransactionRecord":
+        return cls(
+            tx["hash"],
+            tx["ledger"],
+            tx["created_at"],
+            tx["source_account"],
+            tx["fee_charged"],
+            tx["operation_count"],
+            tx["successful"],
+            tx.get("memo_type", "none"),
+            tx.get("memo", ""),
+        )
+
+
+class OperationRecord(Record):
+    __slots__ = ("id", "type", "created_at", "transaction_hash", "source_account")
+
+    @classmethod
+    def from_horizon(cls, op: dict) -> "OperationRecord":
+        return cls(op["id"], op["type"], op["created_at"], op["transaction_hash"], op.get("source_account", "N/A"))
+
+
+class PaymentRecord(Record):
+    __slots__ = ("id", "type", "created_at", "transaction_hash", "from_account", "to_account", "asset", "amount")
+
+    @classmethod
+    def from_horizon(cls, payment: dict) -> "PaymentRecord":
+        kind = payment["type"]
+        if kind == "create_account":
+            parties = (payment.get("funder", "N/A"), payment.get("account", "N/A"))
+            asset, amount = "XLM", payment.get("starting_balance", "0")
+        elif kind == "account_merge":
+            parties = (payment.get("account", "N/A"), payment.get("into", "N/A"))
+            asset, amount = "XLM", None
+        else:
+            parties = (payment.get("from", "N/A"), payment.get("to", "N/A"))
+            asset = asset_label(payment.get("asset_type", "native"), payment.get("asset_code"))
+            amount = payment.get("amount", "0")
+        return cls(payment["id"], kind, payment["created_at"], payment["transaction_hash"], *parties, asset, amount)
+
+
+class EffectRecord(Record):
+    __slots__ = ("type", "created_at", "asset", "amount", "limit")
+
+    @classmethod
+    def from_horizon(cls, effect: dict) -> "EffectRecord":
+        kind = effect["type"]
+        asset = amount = limit = None
+        if kind in ("account_credited", "account_debited"):
+            asset = asset_label(effect.get("asset_type", "native"), effect.get("asset_code"))
+            amount = effect.get("amount", "0")
+        elif kind == "account_created":
+            asset, amount = "XLM", effect.get("starting_balance", "0")
+        elif kind in ("trustline_created", "trustline_removed", "trustline_updated"):
+            asset = asset_label(effect.get("asset_type"), effect.get("asset_code"))
+            limit = effect.get("limit", "N/A")
+        return cls(kind, effect["created_at"], asset, amount, limit)
+
+
+class TradeRecord(Record):
+    __slots__ = ("id", "ledger_close_time", "base_asset", "counter_asset", "base_amount",
+                 "counter_amount", "price", "trade_type")
+
+    @classmethod
+    def from_horizon(cls, trade: dict) -> "TradeRecord":
+        return cls(
+            trade["id"],
+            trade["ledger_close_time"],
+            asset_label(trade["base_asset_type"], trade.get("base_asset_code", "Unknown")),
+            asset_label(trade["counter_asset_type"], trade.get("counter_asset_code", "Unknown")),
+            trade["base_amount"],
+            trade["counter_amount"],
+            trade["price"]["n"] + "/" + trade["price"]["d"],
+            trade.get("trade_type", "orderbook"),
+        )
+
+
+class OfferRecord(Record):
+    __slots__ = ("id", "selling", "buying", "amount", "price", "last_modified")
+
+    @classmethod
+    def from_horizon(cls, offer: dict) -> "OfferRecord":
+        selling, buying = offer["selling"], offer["buying"]
+        return cls(
+            offer["id"],
+            asset_label(selling["asset_type"], selling.get("asset_code")),
+            asset_label(buying["asset_type"], buying.get("asset_code")),
+            offer["amount"],
+            offer["price"],
+            offer.get("last_modified_time", "N/A"),
+        )
+
+
+class BalanceRecord(Record):
+    __slots__ = ("asset", "balance", "limit", "buying_liabilities", "selling_liabilities", "is_authorized")
+
+    @classmethod
+    def from_horizon(cls, balance: dict) -> "BalanceRecord":
+        asset_type = balance["asset_type"]
+        # Limit and authorization only apply to trustlines (None for XLM and pool shares)
+        limit = is_authorized = None
+        if asset_type == "native":
+            asset = "XLM (Lumens)"
+        elif asset_type == "liquidity_pool_shares":
+            asset = f"Liquidity Pool Share ({balance.get('liquidity_pool_id', '')})"
+        else:
+            asset = asset_label(asset_type, balance["asset_code"], balance["asset_issuer"])
+            limit = balance.get("limit", "N/A")
+            is_authorized = balance.get("is_authorized", False)
+        return cls(
+            asset,
+            balance["balance"],
+            limit,
+            balance.get("buying_liabilities", "0"),
+            balance.get("selling_liabilities", "0"),
+            is_authorized,
+        )
+
+
+class AccountSummaryRecord(Record):
+    __slots__ = ("account_id", "xlm_balance", "other_balances", "num_trustlines", "subentry_count",
+                 "num_signers", "home_domain", "sequence")
+
+    @classmethod
+    def from_horizon(cls, account: dict) -> "AccountSummaryRecord":
+        xlm_balance = "0"
+        other_balances = []
+        for balance in account["balances"]:
+            if balance["asset_type"] == "native":
+                xlm_balance = balance["balance"]
+            elif balance["asset_type"] == "liquidity_pool_shares":
+                other_balances.append(f"LP:{balance.get('liquidity_pool_id', '')[:8]}={balance['balance']}")
+            else:
+                other_balances.append(f"{balance['asset_code']}={balance['balance']}")
+        return cls(
+            account["account_id"],
+            xlm_balance,
+            ", ".join(other_balances),
+            len(other_balances),
+            account["subentry_count"],
+            len(account["signers"]),
+            account.get("home_domain", ""),
+            account["sequence"],
+        )
+
+
+def to_table(record_type: Type[Record], records: Iterable[Record]) -> dict:
+    """Tabular form for the LLM: one header row of column names plus one value row per record"""
+    return {
+        "columns": list(record_type.__slots__),
+        "rows": [record.row() for record in records],
+    }
@@ -0,0 +1,79 @@
+import importlib
+import threading
+from typing import List
+
+# (module, tool) in the order the agents list them. Tool modules, and through
+# them stellar_sdk and the Horizon layer, are imported by load_tools(), not at
+# start-up. The async variant of every tool is its name prefixed with "a".
+AGENT_TOOLS = [
+    # Account queries
+    ("tools.get_account_info", "get_account_info"),
+    ("tools.get_account_transactions", "get_account_transactions"),
+    ("tools.get_account_payments", "get_account_payments"),
+    ("tools.get_account_operations", "get_account_operations"),
+    ("tools.get_account_effects", "get_account_effects"),
+    ("tools.get_account_offers", "get_account_offers"),
+    ("tools.get_account_trades", "get_account_trades"),
+    ("tools.get_account_overview", "get_account_overview"),
+    ("tools.get_accounts_batch", "get_accounts_batch"),
+    # Local history index
+    ("tools.count_account_records", "count_account_records"),
+    ("tools.get_account_history", "get_account_history"),
+    # Asset queries
+    ("tools.get_asset_info", "get_asset_info"),
+    ("tools.search_assets", "search_assets"),
+    # Transaction queries
+    ("tools.get_transaction_info", "get_transaction_info"),
+    # Ledger and network
+    ("tools.get_ledger_info", "get_ledger_info"),
+    ("tools.get_network_stats", "get_network_stats"),
+    # Paging through compacted results
+    ("tools.compaction", "get_tool_result_page"),
+]
+
+
+def load_tools(asynchronous: bool = False) -> list:
+    """Import the tool modules and return the agent's tools (async variants if ``asynchronous``)"""
+    return [
+        getattr(importlib.import_module(module_name), f"a{name}" if asynchronous else name)
+        for module_name, name in AGENT_TOOLS
+    ]
+
+
+def load_tool(name: str, asynchronous: bool = False):
+    """Import one agent tool by name (its async variant if ``asynchronous``)"""
+    module_name = next(module for module, tool_name in AGENT_TOOLS if tool_name == name)
+    return getattr(importlib.import_module(module_name), f"a{name}" if asynchronous else name)
+
+
+def load_tool_hooks(asynchronous: bool = False) -> List:
+    """
+    Tool hooks in registration order: large results are compacted before
+    reaching the model, and each call (before compaction) is traced. Async
+    calls are also guarded against timeouts and exceptions, as sync calls
+    are by ``with_parallel_tool_calls``.
+    """
+    from telemetry import hooks
+    from tools import compaction
+
+    if asynchronous:
+        from tools.parallel import aguard_tool_call
+
+        return [compaction.acompact_tool_output, hooks.atrace_tool_call, aguard_tool_call]
+    return [compaction.compact_tool_output, hooks.trace_tool_call]
+
+
+def _import_agent_modules() -> None:
+    importlib.import_module("agno.agent")
+    load_tools()
+    load_tool_hooks()
+
+
+def preload_tools() -> threading.Thread:
+    """
+    Import agno.agent and every tool module on a background thread, e.g.
+    while waiting for the first question, so building the agent finds them loaded
+    """
+    thread = threading.Thread(target=_import_agent_modules, name="tool-preload", daemon=True)
+    thread.start()
+    return thread
@@ -1,6 +1,43 @@
 from agno.tools.decorator import tool
-from stellar_sdk import Server
-import os
+from horizon.async_client import get_async_server
+from horizon.client import get_server
+from tools.async_tool import async_variant
+
+
+def _search_builder(server, asset_code: str, asset_issuer: str, limit: int):
+    builder = server.assets()
+    
+    if asset_code:
+        builder = builder.for_code(asset_code)
+    if asset_issuer:
+        builder = builder.for_issuer(asset_issuer)
+    
+    return builder.limit(min(limit, 200)).order(desc=False)
+
+
+def _format_search(asset_code: str, asset_issuer: str, assets: dict) -> dict:
+    assets_list = []
+    for asset in assets["_embedded"]["records"]:
+        assets_list.append({
+            "asset_code": asset["asset_code"],
+            "asset_issuer": asset["asset_issuer"],
+            "num_accounts": asset["num_accounts"],
+            "num_claimable_balances": asset.get("num_claimable_balances", 0),
+            "num_liquidity_pools": asset.get("num_liquidity_pools", 0),
+            "amount": asset["amount"],
+            "flags": {
+                "auth_required": asset["flags"]["auth_required"],
+                "auth_revocable": asset["flags"]["auth_revocable"],
+                "auth_immutable": asset["flags"]["auth_immutable"]
+            }
+        })
+    
+    return {
+        "search_code": asset_code,
+        "search_issuer": asset_issuer,
+        "total_found": len(assets_list),
+        "assets": assets_list
+    }
 
 
 @tool()
@@ -18,39 +55,22 @@ def search_assets(asset_code: str = None, asset_issuer: str = None, limit: int =
         Dict with list of matching assets and their statistics
     """
     try:
-        horizon_url = os.getenv("STELLAR_HORIZON_URL", "https://horizon.stellar.org")
-        server = Server(horizon_url)
+        server = get_server()
         
-        builder = server.assets()
+        assets = _search_builder(server, asset_code, asset_issuer, limit).call()
         
-        if asset_code:
-            builder = builder.for_code(asset_code)
-        if asset_issuer:
-            builder = builder.for_issuer(asset_issuer)
-        
-        assets = builder.limit(min(limit, 200)).order(desc=False).call()
+        return _format_search(asset_code, asset_issuer, assets)
+    except Exception as e:
+        return {"error": f"Error searching assets: {str(e)}"}
+
+
+@async_variant(search_assets)
+async def asearch_assets(asset_code: str = None, asset_issuer: str = None, limit: int = 20) -> dict:
+    try:
+        server = get_async_server()
         
-        assets_list = []
-        for asset in assets["_embedded"]["records"]:
-            assets_list.append({
-                "asset_code": asset["asset_code"],
-                "asset_issuer": asset["asset_issuer"],
-                "num_accounts": asset["num_accounts"],
-                "num_claimable_balances": asset.get("num_claimable_balances", 0),
-                "num_liquidity_pools": asset.get("num_liquidity_pools", 0),
-                "amount": asset["amount"],
-                "flags": {
-                    "auth_required": asset["flags"]["auth_required"],
-                    "auth_revocable": asset["flags"]["auth_revocable"],
-                    "auth_immutable": asset["flags"]["auth_immutable"]
-                }
-            })
+        assets = await _search_builder(server, asset_code, asset_issuer, limit).call()
         
-        return {
-            "search_code": asset_code,
-            "search_issuer": asset_issuer,
-            "total_found": len(assets_list),
-            "assets": assets_list
-        }
+        return _format_search(asset_code, asset_issuer, assets)
     except Exception as e:
         return {"error": f"Error searching assets: {str(e)}"}